@@ -353,13 +353,120 @@ def api_login(email, password):
     r = safe_post(f"{API}/auth/login", params={"email": email, "password": password})
     return r.json() if r and r.status_code == 200 else None
 
-def api_get_users():
-    r = safe_get(f"{API}/users")
+def api_get_users(**filters):
+    r = safe_get(f"{API}/users", params=filters)
     return r.json() if r and r.status_code == 200 else []
 
+def cached_get_json(url, params=None, timeout=6):
+    """GET revalidated against this session's copy (If-None-Match); a 304 reuses the cached JSON."""
+    key = (url, tuple(sorted((params or {}).items())))
+    entry = st.session_state.http_cache.get(key)
+    try:
+        r = requests.get(url, params=params, headers={"If-None-Match": entry[0]} if entry else {}, timeout=timeout)
+    except Exception:
+        return None
+    if r.status_code == 304 and entry:
+        return entry[1]
+    if r.status_code != 200:
+        return None
+    data = r.json()
+    if r.headers.get("ETag"):
+        st.session_state.http_cache[key] = (r.headers["ETag"], data)
+    return data
+
+def api_user_names():
+    names = cached_get_json(f"{API}/users/names")
+    return {int(k): v for k, v in names.items()} if names is not None else None
+
+def api_issues_page(path, params=None, cursor=None):
+    """One keyset page: returns (items, next_cursor); next_cursor is None on the last page."""
+    params = dict(params or {})
+    if cursor:
+        params["cursor"] = cursor
+    r = safe_get(f"{API}{path}", params=params)
+    if not r or r.status_code != 200:
+        return [], None
+    return r.json(), r.headers.get("X-Next-Cursor")
+
+def api_issues_all(path, params=None, page_size=500, max_rows=None):
+    """Follow X-Next-Cursor until the list is exhausted (or max_rows is reached)."""
+    items, cursor = [], None
+    while True:
+        page, cursor = api_issues_page(path, {**(params or {}), "limit": page_size}, cursor)
+        items.extend(page)
+        if not cursor or (max_rows and len(items) >= max_rows):
+            return items[:max_rows] if max_rows else items
+
+def api_issue_changes(uid, since=None):
+    r = safe_get(f"{API}/issues/for_user/{uid}/changes", params={"since": since} if since else None)
+    return r.json() if r and r.status_code == 200 else None
+
+NAME_FIELDS = (("student_id", "student_name"), ("assigned_to", "assignee_name"), ("verified_by", "verifier_name"))
+
+def sync_user_issues(uid):
+    """Merge what changed since the last call into this session's copy of the user's issues."""
+    cache = st.session_state.issue_cache.setdefault(uid, {"watermark": None, "issues": {}})
+    while True:
+        delta = api_issue_changes(uid, cache["watermark"])
+        if delta is None:
+            break
+        if delta["reset"]:
+            cache["issues"].clear()
+        for issue_id in delta["removed"]:  # before merging: ids of deleted issues can be reused
+            cache["issues"].pop(issue_id, None)
+        for issue in delta["issues"]:
+            prev = cache["issues"].get(issue["id"])
+            for id_field, name_field in NAME_FIELDS:  # deltas carry ids only; keep resolved names
+                if prev and prev.get(id_field) == issue.get(id_field):
+                    issue[name_field] = prev.get(name_field)
+            cache["issues"][issue["id"]] = issue
+        cache["watermark"] = delta["watermark"]
+        if not delta["has_more"]:
+            break
+    return cache["issues"]
+
 def api_issues_for_user(uid, show_resolved=False):
-    r = safe_get(f"{API}/issues/for_user/{uid}", params={"show_resolved": show_resolved})
-    return r.json() if r and r.status_code == 200 else []
+    issues = sorted(sync_user_issues(uid).values(), key=lambda i: (i.get("created_at") or "", i["id"]), reverse=True)
+    return issues if show_resolved else [i for i in issues if i.get("status") != "closed"]
+
+def api_dashboard(uid):
+    r = safe_get(f"{API}/dashboard/{uid}")
+    return r.json() if r and r.status_code == 200 else None
+
+def load_dashboard(uid):
+    """
+    GET /dashboard/{uid} on first render (issues with names, team, user meta, watermark);
+    later reruns only merge the delta since that watermark into the cached issues.
+    """
+    dash = st.session_state.dashboards.get(uid)
+    if dash is None:
+        dash = api_dashboard(uid)
+        if dash is None:
+            return {"user": {}, "active": [], "escalated": [], "resolved": [], "team": []}
+        st.session_state.dashboards[uid] = dash
+        st.session_state.issue_cache[uid] = {
+            "watermark": dash["watermark"],
+            "issues": {i["id"]: i for i in dash["active"] + dash["escalated"] + dash["resolved"]},
+        }
+        return dash
+    issues = sorted(sync_user_issues(uid).values(), key=lambda i: (i.get("created_at") or "", i["id"]), reverse=True)
+    open_issues = [i for i in issues if i.get("status") != "closed"]
+    return {
+        **dash,
+        "active": [i for i in open_issues if i.get("forwarded_by") != uid],
+        "escalated": [i for i in open_issues if i.get("forwarded_by") == uid],
+        "resolved": [i for i in issues if i.get("status") == "closed"],
+    }
+
+def issue_user_name(it, id_field, name_field, default):
+    """Name embedded by /dashboard, else the users cache, else the raw id."""
+    uid = it.get(id_field)
+    if not uid:
+        return default
+    if it.get(name_field):
+        return it[name_field]
+    u = get_user_by_id(uid)
+    return u["name"] if u else f"id:{uid}"
 
 def api_create_issue(student_id, title, desc):
     return safe_post(f"{API}/issues", json={"student_id": student_id, "title": title, "description": desc})
@@ -374,47 +481,55 @@ def api_reclassify(issue_id):
     return safe_post(f"{API}/issues/{issue_id}/classify")
 
 def api_admin_stats():
-    r = safe_get(f"{API}/admin/stats")
-    return r.json() if r and r.status_code == 200 else {}
+    return cached_get_json(f"{API}/admin/stats") or {}
 
-def api_admin_all_issues():
-    r = safe_get(f"{API}/admin/issues")
-    return r.json() if r and r.status_code == 200 else []
+def api_admin_all_issues(max_rows=1000):
+    return api_issues_all("/admin/issues", params={"expand": "student"}, max_rows=max_rows)
 
 def api_get_department(dept_id):
-    r = safe_get(f"{API}/departments/{dept_id}")
-    return r.json() if r and r.status_code == 200 else None
+    return cached_get_json(f"{API}/departments/{dept_id}")
 
 def api_get_section(section_id):
-    r = safe_get(f"{API}/sections/{section_id}")
-    return r.json() if r and r.status_code == 200 else None
+    return cached_get_json(f"{API}/sections/{section_id}")
 
 if "user" not in st.session_state:
     st.session_state.user = None
 if "users_cache" not in st.session_state:
     st.session_state.users_cache = None
+if "http_cache" not in st.session_state:
+    st.session_state.http_cache = {}
+if "issue_cache" not in st.session_state:
+    st.session_state.issue_cache = {}
+if "dashboards" not in st.session_state:
+    st.session_state.dashboards = {}
 
 def load_users_cache():
-    st.session_state.users_cache = api_get_users()
+    """Refresh the id -> name map (usually a 304 once it has been fetched)."""
+    st.session_state.users_cache = api_user_names() or {}
 
 def get_user_by_id(uid):
+    """Fallback for names the API did not embed."""
     if st.session_state.users_cache is None:
         load_users_cache()
-    for u in st.session_state.users_cache or []:
-        if u["id"] == uid:
-            return u
-    return None
+    name = st.session_state.users_cache.get(uid)
+    return {"id": uid, "name": name} if name is not None else None
 
-def user_meta_block(user):
+def user_meta_block(user, meta=None):
+    """`meta` is the /dashboard "user" block; it already carries department/section names."""
+    meta = meta or {}
     dept_id = user.get("department_id")
-    if dept_id:
+    if meta.get("department_name"):
+        dept_display = meta["department_name"]
+    elif dept_id:
         dept_info = api_get_department(dept_id)
         dept_display = dept_info.get("name", f"ID:{dept_id}") if dept_info else f"ID:{dept_id}"
     else:
         dept_display = "-"
     
     sect_id = user.get("section_id")
-    if sect_id:
+    if meta.get("section_name"):
+        sect_display = meta["section_name"]
+    elif sect_id:
         sect_info = api_get_section(sect_id)
         sect_display = sect_info.get("name", f"ID:{sect_id}") if sect_info else f"ID:{sect_id}"
     else:
@@ -471,7 +586,6 @@ def login_ui():
                 user = api_login(email, password)
                 if user:
                     st.session_state.user = user
-                    load_users_cache()
                     st.rerun()
                 else:
                     st.error("Invalid credentials or backend unreachable.")
@@ -505,13 +619,14 @@ def get_status_badge(status):
 def student_dashboard(user):
     st.markdown("<div class='dashboard-title'>Student Dashboard</div>", unsafe_allow_html=True)
     st.markdown("<div class='small'>Manage your complaints and track their status</div>", unsafe_allow_html=True)
-    user_meta_block(user)
-    proctor = get_user_by_id(user.get("reports_to")) if user.get("reports_to") else None
-    if proctor:
+    dash = load_dashboard(user["id"])
+    user_meta_block(user, dash["user"])
+    proctor_name = dash["user"].get("manager_name")
+    if proctor_name:
         st.markdown(
             f"""
             <div style="background: linear-gradient(135deg, #667eea15 0%, #764ba215 100%); padding: 16px; border-radius: 12px; margin: 20px 0;">
-                <strong>Proctor:</strong> {proctor['name']}
+                <strong>Proctor:</strong> {proctor_name}
             </div>
             """,
             unsafe_allow_html=True
@@ -529,7 +644,11 @@ def student_dashboard(user):
             else:
                 r = api_create_issue(user["id"], title, desc)
                 if r and r.status_code == 201:
-                    st.success("✅ Complaint submitted successfully!")
+                    dup = r.json().get("duplicate_of")
+                    if dup:
+                        st.success(f"✅ Complaint submitted and linked to a similar open complaint (#{dup}).")
+                    else:
+                        st.success("✅ Complaint submitted successfully!")
                     st.session_state.users_cache = None
                     st.rerun()
                 else:
@@ -537,16 +656,15 @@ def student_dashboard(user):
 
     st.markdown("---")
     st.markdown("<div class='section-header'>Your Complaints</div>", unsafe_allow_html=True)
-    active = api_issues_for_user(user["id"], show_resolved=False)
-    resolved = api_issues_for_user(user["id"], show_resolved=True)
-    resolved_only = [i for i in (resolved or []) if i.get("status") == "closed"]
+    active = dash["active"] + dash["escalated"]
+    resolved_only = dash["resolved"]
 
     # Build table safely: handle missing student_id by using current user id
     if active:
         rows = []
         for it in active:
             sid = it.get("student_id", user["id"])  # fallback to current student
-            raised_by = (get_user_by_id(sid)["name"] if get_user_by_id(sid) else f"id:{sid}")
+            raised_by = issue_user_name({**it, "student_id": sid}, "student_id", "student_name", "Unknown")
             rows.append({
                 "ID": it.get("id"),
                 "Title": it.get("title"),
@@ -554,7 +672,7 @@ def student_dashboard(user):
                 "Priority": it.get("priority") or "N/A",
                 "Status": it.get("status") or "open",
                 "Raised By": raised_by,
-                "Assigned To": get_user_by_id(it.get("assigned_to"))["name"] if it.get("assigned_to") and get_user_by_id(it.get("assigned_to")) else "Unassigned",
+                "Assigned To": issue_user_name(it, "assigned_to", "assignee_name", "Unassigned"),
                 "Created At": it.get("created_at")
             })
         df = pd.DataFrame(rows)
@@ -579,9 +697,8 @@ def student_dashboard(user):
             rows = []
             for it in resolved_only:
                 sid = it.get("student_id", user["id"])
-                raised_by = (get_user_by_id(sid)["name"] if get_user_by_id(sid) else f"id:{sid}")
-                vid = it.get("verified_by")
-                verified_by = (get_user_by_id(vid)["name"] if vid and get_user_by_id(vid) else (f"id:{vid}" if vid else "-"))
+                raised_by = issue_user_name({**it, "student_id": sid}, "student_id", "student_name", "Unknown")
+                verified_by = issue_user_name(it, "verified_by", "verifier_name", "-")
                 rows.append({
                     "ID": it.get("id"),
                     "Title": it.get("title"),
@@ -603,8 +720,9 @@ def student_dashboard(user):
 def proctor_dashboard(user):
     st.markdown("<div class='dashboard-title'>Proctor Dashboard</div>", unsafe_allow_html=True)
     st.markdown("<div class='small'>Manage student complaints and escalate when needed</div>", unsafe_allow_html=True)
-    user_meta_block(user)
-    students = [u for u in (st.session_state.users_cache or api_get_users()) if u.get("reports_to")==user["id"] and u.get("role")=="student"]
+    dash = load_dashboard(user["id"])
+    user_meta_block(user, dash["user"])
+    students = [u for u in dash["team"] if u.get("role")=="student"]
     st.markdown(
         f"""
         <div style="background: linear-gradient(135deg, #667eea15 0%, #764ba215 100%); padding: 16px; border-radius: 12px; margin: 20px 0;">
@@ -615,17 +733,14 @@ def proctor_dashboard(user):
     )
     st.markdown("---")
 
-    issues = api_issues_for_user(user["id"], show_resolved=False)
-    
-    active_issues = [i for i in (issues or []) if i.get("status") != "closed" and i.get("forwarded_by") != user["id"]]
-    escalated_issues = [i for i in (issues or []) if i.get("forwarded_by") == user["id"]]
+    active_issues = dash["active"]
+    escalated_issues = dash["escalated"]
     
     st.markdown("<div class='section-header'>Active Complaints</div>", unsafe_allow_html=True)
     if active_issues:
         rows=[]
         for it in active_issues:
-            sid = it.get("student_id")
-            raised_by = (get_user_by_id(sid)["name"] if sid and get_user_by_id(sid) else (f"id:{sid}" if sid else "Unknown"))
+            raised_by = issue_user_name(it, "student_id", "student_name", "Unknown")
             rows.append({
                 "ID": it.get("id"),
                 "Title": it.get("title"),
@@ -633,7 +748,7 @@ def proctor_dashboard(user):
                 "Priority": it.get("priority") or "N/A",
                 "Status": it.get("status") or "open",
                 "Raised By": raised_by,
-                "Assigned To": get_user_by_id(it.get("assigned_to"))["name"] if it.get("assigned_to") and get_user_by_id(it.get("assigned_to")) else "Unassigned",
+                "Assigned To": issue_user_name(it, "assigned_to", "assignee_name", "Unassigned"),
                 "Created At": it.get("created_at")
             })
         df = pd.DataFrame(rows)
@@ -679,8 +794,7 @@ def proctor_dashboard(user):
     if escalated_issues:
         rows=[]
         for it in escalated_issues:
-            sid = it.get("student_id")
-            raised_by = (get_user_by_id(sid)["name"] if sid and get_user_by_id(sid) else (f"id:{sid}" if sid else "Unknown"))
+            raised_by = issue_user_name(it, "student_id", "student_name", "Unknown")
             rows.append({
                 "ID": it.get("id"),
                 "Title": it.get("title"),
@@ -688,7 +802,7 @@ def proctor_dashboard(user):
                 "Priority": it.get("priority") or "N/A",
                 "Status": it.get("status") or "forwarded",
                 "Raised By": raised_by,
-                "Forwarded To": get_user_by_id(it.get("assigned_to"))["name"] if it.get("assigned_to") and get_user_by_id(it.get("assigned_to")) else "Unassigned",
+                "Forwarded To": issue_user_name(it, "assigned_to", "assignee_name", "Unassigned"),
                 "Created At": it.get("created_at")
             })
         df_esc = pd.DataFrame(rows)
@@ -700,15 +814,12 @@ def proctor_dashboard(user):
         st.info("No escalated complaints.")
     
     with st.expander("📊 Show Resolved Complaints", expanded=False):
-        all_with_resolved = api_issues_for_user(user["id"], show_resolved=True)
-        resolved_items = [i for i in (all_with_resolved or []) if i.get("status")=="closed"]
+        resolved_items = dash["resolved"]
         if resolved_items:
             rows=[]
             for it in resolved_items:
-                sid = it.get("student_id")
-                raised_by = (get_user_by_id(sid)["name"] if sid and get_user_by_id(sid) else (f"id:{sid}" if sid else "Unknown"))
-                vid = it.get("verified_by")
-                verified_by = (get_user_by_id(vid)["name"] if vid and get_user_by_id(vid) else (f"id:{vid}" if vid else "-"))
+                raised_by = issue_user_name(it, "student_id", "student_name", "Unknown")
+                verified_by = issue_user_name(it, "verified_by", "verifier_name", "-")
                 rows.append({
                     "ID": it.get("id"),
                     "Title": it.get("title"),
@@ -729,19 +840,17 @@ def proctor_dashboard(user):
 def hod_dashboard(user):
     st.markdown("<div class='dashboard-title'>HOD Dashboard</div>", unsafe_allow_html=True)
     st.markdown("<div class='small'>Oversee department-wide complaints and manage escalations</div>", unsafe_allow_html=True)
-    user_meta_block(user)
+    dash = load_dashboard(user["id"])
+    user_meta_block(user, dash["user"])
     st.markdown("---")
-    issues = api_issues_for_user(user["id"], show_resolved=False)
-    
-    active_issues = [i for i in (issues or []) if i.get("status") != "closed" and i.get("forwarded_by") != user["id"]]
-    escalated_issues = [i for i in (issues or []) if i.get("forwarded_by") == user["id"]]
+    active_issues = dash["active"]
+    escalated_issues = dash["escalated"]
     
     st.markdown("<div class='section-header'>Active Complaints</div>", unsafe_allow_html=True)
     if active_issues:
         rows=[]
         for it in active_issues:
-            sid = it.get("student_id")
-            raised_by = (get_user_by_id(sid)["name"] if sid and get_user_by_id(sid) else (f"id:{sid}" if sid else "Unknown"))
+            raised_by = issue_user_name(it, "student_id", "student_name", "Unknown")
             rows.append({
                 "ID": it.get("id"),
                 "Title": it.get("title"),
@@ -749,7 +858,7 @@ def hod_dashboard(user):
                 "Priority": it.get("priority") or "N/A",
                 "Status": it.get("status") or "open",
                 "Raised By": raised_by,
-                "Assigned To": get_user_by_id(it.get("assigned_to"))["name"] if it.get("assigned_to") and get_user_by_id(it.get("assigned_to")) else "Unassigned",
+                "Assigned To": issue_user_name(it, "assigned_to", "assignee_name", "Unassigned"),
                 "Created At": it.get("created_at")
             })
         df=pd.DataFrame(rows)
@@ -795,8 +904,7 @@ def hod_dashboard(user):
     if escalated_issues:
         rows=[]
         for it in escalated_issues:
-            sid = it.get("student_id")
-            raised_by = (get_user_by_id(sid)["name"] if sid and get_user_by_id(sid) else (f"id:{sid}" if sid else "Unknown"))
+            raised_by = issue_user_name(it, "student_id", "student_name", "Unknown")
             rows.append({
                 "ID": it.get("id"),
                 "Title": it.get("title"),
@@ -804,7 +912,7 @@ def hod_dashboard(user):
                 "Priority": it.get("priority") or "N/A",
                 "Status": it.get("status") or "forwarded",
                 "Raised By": raised_by,
-                "Forwarded To": get_user_by_id(it.get("assigned_to"))["name"] if it.get("assigned_to") and get_user_by_id(it.get("assigned_to")) else "Unassigned",
+                "Forwarded To": issue_user_name(it, "assigned_to", "assignee_name", "Unassigned"),
                 "Created At": it.get("created_at")
             })
         df_esc=pd.DataFrame(rows)
@@ -816,15 +924,12 @@ def hod_dashboard(user):
         st.info("No escalated complaints.")
     
     with st.expander("📊 Show Resolved Complaints", expanded=False):
-        all_with_resolved = api_issues_for_user(user["id"], show_resolved=True)
-        resolved_items = [i for i in (all_with_resolved or []) if i.get("status")=="closed"]
+        resolved_items = dash["resolved"]
         if resolved_items:
             rows=[]
             for it in resolved_items:
-                sid = it.get("student_id")
-                raised_by = (get_user_by_id(sid)["name"] if sid and get_user_by_id(sid) else (f"id:{sid}" if sid else "Unknown"))
-                vid = it.get("verified_by")
-                verified_by = (get_user_by_id(vid)["name"] if vid and get_user_by_id(vid) else (f"id:{vid}" if vid else "-"))
+                raised_by = issue_user_name(it, "student_id", "student_name", "Unknown")
+                verified_by = issue_user_name(it, "verified_by", "verifier_name", "-")
                 rows.append({
                     "ID": it.get("id"),
                     "Title": it.get("title"),
@@ -839,14 +944,14 @@ def hod_dashboard(user):
 def vc_dashboard(user):
     st.markdown("<div class='dashboard-title'>VC Dashboard</div>", unsafe_allow_html=True)
     st.markdown("<div class='small'>Review and resolve escalated complaints</div>", unsafe_allow_html=True)
-    user_meta_block(user)
+    dash = load_dashboard(user["id"])
+    user_meta_block(user, dash["user"])
     st.markdown("---")
-    issues = api_issues_for_user(user["id"], show_resolved=False)
+    issues = dash["active"] + dash["escalated"]
     if issues:
         rows=[]
         for it in issues:
-            sid = it.get("student_id")
-            raised_by = (get_user_by_id(sid)["name"] if sid and get_user_by_id(sid) else (f"id:{sid}" if sid else "Unknown"))
+            raised_by = issue_user_name(it, "student_id", "student_name", "Unknown")
             rows.append({
                 "ID": it.get("id"),
                 "Title": it.get("title"),
@@ -882,15 +987,12 @@ def vc_dashboard(user):
             unsafe_allow_html=True
         )
     with st.expander("📊 Show Resolved Complaints", expanded=False):
-        all_with_resolved = api_issues_for_user(user["id"], show_resolved=True)
-        resolved_items = [i for i in (all_with_resolved or []) if i.get("status")=="closed"]
+        resolved_items = dash["resolved"]
         if resolved_items:
             rows = []
             for it in resolved_items:
-                sid = it.get("student_id")
-                raised_by = (get_user_by_id(sid)["name"] if sid and get_user_by_id(sid) else (f"id:{sid}" if sid else "Unknown"))
-                vid = it.get("verified_by")
-                verified_by = (get_user_by_id(vid)["name"] if vid and get_user_by_id(vid) else (f"id:{vid}" if vid else "-"))
+                raised_by = issue_user_name(it, "student_id", "student_name", "Unknown")
+                verified_by = issue_user_name(it, "verified_by", "verifier_name", "-")
                 rows.append({
                     "ID": it.get("id"),
                     "Title": it.get("title"),
@@ -921,8 +1023,7 @@ def admin_dashboard(user):
     if issues:
         rows=[]
         for it in issues:
-            sid = it.get("student_id")
-            raised_by = (get_user_by_id(sid)["name"] if sid and get_user_by_id(sid) else (f"id:{sid}" if sid else "Unknown"))
+            raised_by = issue_user_name(it, "student_id", "student_name", "Unknown")
             rows.append({
                 "ID": it.get("id"),
                 "Title": it.get("title"),
@@ -951,11 +1052,13 @@ if st.session_state.user is None:
     login_ui()
 else:
     user = st.session_state.user
-    if st.session_state.users_cache is None:
-        load_users_cache()
     st.sidebar.markdown(f"**{user['name']}**  \n{user['role']}")
     if st.sidebar.button("Logout"):
         st.session_state.user = None
+        st.session_state.issue_cache = {}
+        st.session_state.dashboards = {}
+        st.session_state.users_cache = None
+        st.session_state.http_cache = {}
         st.rerun()
     role = user.get("role","").lower()
     if role=="student":
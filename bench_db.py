@@ -0,0 +1,136 @@
+"""
+Concurrent read/write benchmark for the SQLite storage profiles in storage.py.
+
+Usage: python bench_db.py [--issues 20000] [--readers 16] [--seconds 10]
+
+For each profile a scratch database (not data/issue_manager.db) is seeded with
+the demo org chart and --issues issues. Reader threads then run the proctor
+dashboard query while one writer inserts issues, one commit each, for --seconds.
+Reads/s and writes/s are printed per profile.
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy.orm import sessionmaker
+
+from migrate_db import migrate
+from models import Issue
+from queries import issues_for_user_query
+from storage import create_storage_engine
+
+SECTIONS = 14
+STUDENTS_PER_SECTION = 50
+
+
+def seed(engine, n_issues: int):
+    now = datetime.utcnow()
+    rows = []
+    for i in range(n_issues):
+        section = i % SECTIONS + 1
+        rows.append({
+            "title": f"Issue {i}",
+            "description": "Fan not working in the lab",
+            "student_id": 1000 + i % (SECTIONS * STUDENTS_PER_SECTION),
+            "department_id": (section + 1) // 2,
+            "section_id": section,
+            "category": "infrastructure",
+            "priority": "low",
+            "status": random.choice(["open", "forwarded", "closed"]),
+            "assigned_to": 100 + section,
+            "created_at": now - timedelta(minutes=i),
+        })
+    with engine.begin() as conn:
+        conn.execute(Issue.__table__.insert(), rows)
+
+
+def run(profile: str, n_issues: int, readers: int, seconds: float):
+    workdir = tempfile.mkdtemp(prefix="campusmind-bench-")
+    try:
+        engine = create_storage_engine(f"sqlite:///{os.path.join(workdir, 'bench.db')}", profile=profile,
+                                       pool_size=readers + 1)
+        migrate(engine)
+        seed(engine, n_issues)
+        Session = sessionmaker(bind=engine)
+        stop = threading.Event()
+        counts = {"reads": 0, "writes": 0, "errors": 0}
+        lock = threading.Lock()
+
+        def reader():
+            db = Session()
+            done = 0
+            try:
+                while not stop.is_set():
+                    section = random.randint(1, SECTIONS)
+                    proctor = SimpleNamespace(id=100 + section, role="proctor", section_id=section, department_id=None)
+                    db.execute(issues_for_user_query(proctor).limit(100)).scalars().all()
+                    db.rollback()
+                    done += 1
+            except Exception:
+                with lock:
+                    counts["errors"] += 1
+            finally:
+                db.close()
+            with lock:
+                counts["reads"] += done
+
+        def writer():
+            db = Session()
+            done = 0
+            try:
+                while not stop.is_set():
+                    section = random.randint(1, SECTIONS)
+                    db.add(Issue(
+                        title="Bench", description="Projector broken", student_id=1000, section_id=section,
+                        department_id=(section + 1) // 2, status="open", assigned_to=100 + section,
+                        created_at=datetime.utcnow(),
+                    ))
+                    db.commit()
+                    done += 1
+            except Exception:
+                with lock:
+                    counts["errors"] += 1
+            finally:
+                db.close()
+            with lock:
+                counts["writes"] += done
+
+        threads = [threading.Thread(target=reader) for _ in range(readers)] + [threading.Thread(target=writer)]
+        for t in threads:
+            t.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+        engine.dispose()
+        return SimpleNamespace(
+            reads=counts["reads"] / seconds, writes=counts["writes"] / seconds, errors=counts["errors"]
+        )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SQLite storage profile benchmark")
+    parser.add_argument("--issues", type=int, default=20000)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    results = {}
+    for profile in ("default", "performance"):
+        print(f"Running '{profile}' profile...")
+        results[profile] = run(profile, args.issues, args.readers, args.seconds)
+        r = results[profile]
+        print(f"  reads/s: {r.reads:.0f}  writes/s: {r.writes:.0f}  errors: {r.errors}")
+
+    base, tuned = results["default"], results["performance"]
+    if base.reads and base.writes:
+        print(f"\nperformance vs default: reads x{tuned.reads / base.reads:.1f}, writes x{tuned.writes / base.writes:.1f}")
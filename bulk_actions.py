@@ -0,0 +1,109 @@
+"""
+Batch resolve / forward / assign for POST /issues/bulk.
+
+One query loads every requested issue the acting user may see (the same
+visibility rule as GET /issues/for_user, so the permission check and the row
+fetch are the same statement). Accepted issues are then written with
+set-based UPDATEs, one per distinct target (a single UPDATE for resolve and
+assign, one per next assignee for forward), plus the matching issue_counters
+deltas, issue events and sync tombstones for reassigned issues, since core
+UPDATEs skip the ORM flush hooks. An UPDATE only applies to rows whose
+updated_at is still the one that was read, so an issue changed by someone else
+in between is reported as failed rather than counted under a stale status.
+The caller commits.
+"""
+
+import os
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, tuple_, update
+from sqlalchemy.orm import Session
+
+from events import VISIBILITY_FIELDS, issue_payload, record_issue_event
+from hierarchy import OrgSnapshot, OrgUser
+from models import Issue
+from queries import CLOSED, visibility_filter
+from stats import apply_deltas, bump_issue_version, make_key
+from sync import record_tombstones
+
+BULK_MAX_ISSUES = int(os.getenv("BULK_MAX_ISSUES", "500"))
+ACTIONS = ("resolve", "forward", "assign")
+EVENT_KINDS = {"resolve": "verified", "forward": "forwarded", "assign": "updated"}
+
+
+def _result(issue_id: int, ok: bool, status=None, assigned_to=None, error=None) -> Dict:
+    return {"id": issue_id, "ok": ok, "status": status, "assigned_to": assigned_to, "error": error}
+
+
+def apply_bulk_action(
+    db: Session,
+    org: OrgSnapshot,
+    actor: OrgUser,
+    action: str,
+    issue_ids: List[int],
+    assignee_id: Optional[int] = None,
+) -> List[Dict]:
+    """Apply `action` to `issue_ids` on behalf of `actor`. Returns one result per id, in request order."""
+    ids = list(dict.fromkeys(issue_ids))
+    t = Issue.__table__
+    rows = {
+        r.id: r
+        for r in db.execute(select(t).where(t.c.id.in_(ids), visibility_filter(actor)))
+    }
+
+    results: Dict[int, Dict] = {}
+    groups: Dict[Optional[int], List[int]] = defaultdict(list)  # target assignee -> issue ids
+    for issue_id in ids:
+        row = rows.get(issue_id)
+        if row is None:
+            results[issue_id] = _result(issue_id, False, error="Issue not found or not permitted")
+        elif row.status == CLOSED:
+            results[issue_id] = _result(issue_id, False, status=row.status, assigned_to=row.assigned_to,
+                                        error="Issue is already closed")
+        elif action == "resolve":
+            groups[None].append(issue_id)
+        elif action == "assign":
+            groups[assignee_id].append(issue_id)
+        else:
+            target = org.next_assignee(row.assigned_to or row.student_id)
+            if target is None:
+                results[issue_id] = _result(issue_id, False, status=row.status, assigned_to=row.assigned_to,
+                                            error="No higher authority found to escalate to")
+            else:
+                groups[target.id].append(issue_id)
+
+    new_status = {"resolve": CLOSED, "forward": "forwarded", "assign": "assigned"}[action]
+    now = datetime.utcnow()
+    deltas: Counter = Counter()
+    moved = []
+    for target, group in groups.items():
+        if action == "resolve":
+            values = {"status": new_status, "verified_by": actor.id, "verified_at": now, "updated_at": now}
+        else:
+            values = {"status": new_status, "assigned_to": target, "forwarded_by": actor.id, "updated_at": now}
+        unchanged = [(issue_id, rows[issue_id].updated_at) for issue_id in group]
+        applied = set(db.scalars(
+            update(t).where(tuple_(t.c.id, t.c.updated_at).in_(unchanged)).values(**values).returning(t.c.id)
+        ))
+        for issue_id in group:
+            row = rows[issue_id]
+            if issue_id not in applied:
+                results[issue_id] = _result(issue_id, False, error="Issue was changed meanwhile; reload and retry")
+                continue
+            deltas[make_key(row.department_id, row.section_id, row.category, row.priority, row.status)] -= 1
+            deltas[make_key(row.department_id, row.section_id, row.category, row.priority, new_status)] += 1
+            results[issue_id] = _result(issue_id, True, status=new_status,
+                                        assigned_to=row.assigned_to if target is None else target)
+            record_issue_event(
+                db, EVENT_KINDS[action], issue_payload({**row._mapping, **values}),
+                {name: row._mapping[name] for name in VISIBILITY_FIELDS},
+            )
+            if target is not None and row.assigned_to != target:
+                moved.append(row._mapping)
+    apply_deltas(db.connection(), deltas)
+    record_tombstones(db.connection(), moved)
+    if any(r["ok"] for r in results.values()):
+        bump_issue_version(db.connection())
+    return [results[issue_id] for issue_id in ids]
@@ -0,0 +1,91 @@
+"""
+Combined payload for GET /dashboard/{user_id}: everything a role dashboard shows,
+in one round trip.
+
+Two index-backed queries over the user's visible issues (queries.visibility_filter):
+the newest DASHBOARD_MAX_OPEN open ones, split here into "active" and "escalated"
+(forwarded by this user), and the newest DASHBOARD_RESOLVED_LIMIT closed ones.
+All counts come from window counts on the same statements, so they stay right
+when a list is cut at its limit; `truncated` is then true, and a client that
+wants every issue should fill its cache through delta sync instead. Names (student, assignee, verifier, the
+user's team and department/section) come from the org chart cache, not from
+joins. The returned watermark lets clients continue with delta sync
+(/issues/for_user/{id}/changes) or the live event stream from this snapshot.
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from events import issue_payload
+from hierarchy import OrgSnapshot, OrgUser
+from models import Issue
+from queries import CLOSED, newest_first, visibility_filter
+from sync import SYNC_OVERLAP_S, encode_watermark
+
+DASHBOARD_MAX_OPEN = int(os.getenv("DASHBOARD_MAX_OPEN", "500"))
+DASHBOARD_RESOLVED_LIMIT = int(os.getenv("DASHBOARD_RESOLVED_LIMIT", "500"))
+
+
+def _name(org: OrgSnapshot, user_id: Optional[int]) -> Optional[str]:
+    u = org.user(user_id)
+    return u.name if u else None
+
+
+def _issue(org: OrgSnapshot, issue: Issue) -> Dict:
+    return {
+        **issue_payload(issue),
+        "student_name": _name(org, issue.student_id),
+        "assignee_name": _name(org, issue.assigned_to),
+        "verifier_name": _name(org, issue.verified_by),
+    }
+
+
+async def build_dashboard(db: AsyncSession, org: OrgSnapshot, user: OrgUser,
+                          resolved_limit: int = DASHBOARD_RESOLVED_LIMIT) -> Dict:
+    watermark = encode_watermark(datetime.utcnow() - timedelta(seconds=SYNC_OVERLAP_S))
+    visible = visibility_filter(user)
+
+    escalated_by_user = case((Issue.forwarded_by == user.id, 1), else_=0)
+    open_rows = (await db.execute(
+        newest_first(select(Issue, func.count().over(), func.sum(escalated_by_user).over())
+                     .where(visible, Issue.status != CLOSED)).limit(DASHBOARD_MAX_OPEN)
+    )).all()
+    open_total, escalated_total = (open_rows[0][1], open_rows[0][2]) if open_rows else (0, 0)
+    resolved_rows = (await db.execute(
+        newest_first(select(Issue, func.count().over()).where(visible, Issue.status == CLOSED)).limit(resolved_limit)
+    )).all()
+    resolved_total = resolved_rows[0][1] if resolved_rows else 0
+
+    active = [_issue(org, i) for i, _, _ in open_rows if i.forwarded_by != user.id]
+    escalated = [_issue(org, i) for i, _, _ in open_rows if i.forwarded_by == user.id]
+    resolved = [_issue(org, i) for i, _ in resolved_rows]
+    team = [
+        {"id": u.id, "name": u.name, "role": u.role, "section_id": u.section_id}
+        for u in org.direct_reports(user.id)
+    ]
+    manager = org.next_assignee(user.id)
+
+    return {
+        "user": {
+            **user._asdict(),
+            "department_name": org.department_name(user.department_id),
+            "section_name": org.section_name(user.section_id),
+            "manager_name": manager.name if manager else None,
+        },
+        "counts": {
+            "active": open_total - escalated_total,
+            "escalated": escalated_total,
+            "resolved": resolved_total,
+            "team": len(team),
+        },
+        "truncated": len(open_rows) < open_total or len(resolved_rows) < resolved_total,
+        "active": active,
+        "escalated": escalated,
+        "resolved": resolved,
+        "team": team,
+        "watermark": watermark,
+    }
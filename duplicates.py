@@ -0,0 +1,186 @@
+"""
+Near-duplicate detection for POST /issues.
+
+Each (department, section) gets an in-memory index of its recent open issues
+(created within DUPLICATE_WINDOW_H hours, at most DUPLICATE_MAX_PER_SECTION).
+The index holds their title + description as L2-normalised TF-IDF rows from the
+classifier pipeline's own vectorizer, so checking a new complaint is one sparse
+transform plus one sparse matrix-vector product: cosine similarity against every
+candidate at once, well under a millisecond for a few hundred rows.
+
+A new issue whose best match scores at least DUPLICATE_THRESHOLD is stored
+with duplicate_of pointing at the original, and it reuses the original's
+category and priority instead of running the classifier. It is still created
+and routed as usual, so the student who raised it keeps seeing it.
+
+Like the org chart cache, a section's index is built lazily from the DB, and
+it is rebuilt after DUPLICATE_INDEX_TTL_S to catch writes from other
+processes. A match is re-checked against the DB before use, because the
+original may have been closed since it was indexed. When a new model version
+is activated (model_registry.py), `reset` drops every section index, because
+rows from different vectorizers can't be compared. The vectorizer itself is
+loaded on first use, in a worker thread (`load`) so the event loop never waits
+on the file. Without a loadable model file, detection is off.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from scipy import sparse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from model_store import load_model
+from models import Issue
+from queries import CLOSED
+
+DUPLICATE_THRESHOLD = float(os.getenv("DUPLICATE_THRESHOLD", "0.8"))
+DUPLICATE_WINDOW_H = float(os.getenv("DUPLICATE_WINDOW_H", "72"))
+DUPLICATE_MAX_PER_SECTION = int(os.getenv("DUPLICATE_MAX_PER_SECTION", "500"))
+DUPLICATE_INDEX_TTL_S = float(os.getenv("DUPLICATE_INDEX_TTL_S", "300"))
+
+SectionKey = Tuple[Optional[int], Optional[int]]
+
+
+def issue_text(title: str, description: str) -> str:
+    return f"{title}\n{description}"
+
+
+def load_vectorizer(model_path: str):
+    """
+    The fitted TF-IDF step of the classifier pipeline, or None if it can't be loaded. From a
+    registry snapshot its arrays are memory-mapped, shared with the classifier's copy.
+    """
+    if not os.path.exists(model_path):
+        return None
+    try:
+        pipe = load_model(model_path)
+        return pipe.steps[0][1]
+    except Exception:
+        return None
+
+
+class _SectionIndex:
+    def __init__(self, vectorizer, ids: List[int], created: List[datetime], rows):
+        self.vectorizer = vectorizer
+        self.ids = ids
+        self.created = created
+        self.rows = rows  # csr_matrix, one normalised TF-IDF row per id
+        self.loaded_at = time.monotonic()
+
+    def add(self, issue_id: int, created_at: datetime, row):
+        self.ids.append(issue_id)
+        self.created.append(created_at)
+        self.rows = sparse.vstack([self.rows, row], format="csr") if self.rows is not None else row
+        if len(self.ids) > DUPLICATE_MAX_PER_SECTION:
+            drop = len(self.ids) - DUPLICATE_MAX_PER_SECTION
+            self.ids, self.created, self.rows = self.ids[drop:], self.created[drop:], self.rows[drop:]
+
+    def discard(self, issue_id: int):
+        if issue_id in self.ids:
+            keep = [i for i, x in enumerate(self.ids) if x != issue_id]
+            self.ids = [self.ids[i] for i in keep]
+            self.created = [self.created[i] for i in keep]
+            self.rows = self.rows[keep] if keep else None
+
+    def ranked(self, row, since: datetime) -> List[Tuple[int, float]]:
+        """(issue id, cosine similarity) of candidates newer than `since`, best first."""
+        if self.rows is None:
+            return []
+        scores = (self.rows @ row.T).toarray().ravel()
+        order = scores.argsort()[::-1]
+        return [(self.ids[i], float(scores[i])) for i in order if self.created[i] >= since]
+
+
+class DuplicateIndex:
+    def __init__(self, vectorizer_loader: Callable[[], object], threshold: float = DUPLICATE_THRESHOLD):
+        self._load_vectorizer = vectorizer_loader
+        self._vectorizer = None
+        self._vectorizer_tried = False
+        self._load_lock = threading.Lock()
+        self.threshold = threshold
+        self._sections: Dict[SectionKey, _SectionIndex] = {}
+
+    @property
+    def vectorizer(self):
+        """The current vectorizer, loading it on first use (blocking; see `load`)."""
+        with self._load_lock:
+            if not self._vectorizer_tried:
+                self._vectorizer = self._load_vectorizer()
+                self._vectorizer_tried = True
+            return self._vectorizer
+
+    async def load(self):
+        """`vectorizer` for async callers: a first-use load runs in the threadpool."""
+        vectorizer = self._vectorizer
+        if vectorizer is not None:
+            return vectorizer
+        return await run_in_threadpool(lambda: self.vectorizer)
+
+    def reset(self, vectorizer_loader: Callable[[], object]):
+        """Switch to another model's vectorizer (loaded lazily) and drop every section index."""
+        with self._load_lock:
+            self._load_vectorizer = vectorizer_loader
+            self._vectorizer = None
+            self._vectorizer_tried = False
+        self._sections = {}
+
+    async def _section(self, db: AsyncSession, key: SectionKey, vectorizer) -> _SectionIndex:
+        index = self._sections.get(key)
+        if (index is not None and index.vectorizer is vectorizer
+                and time.monotonic() - index.loaded_at < DUPLICATE_INDEX_TTL_S):
+            return index
+        department_id, section_id = key
+        since = datetime.utcnow() - timedelta(hours=DUPLICATE_WINDOW_H)
+        stmt = (
+            select(Issue.id, Issue.created_at, Issue.title, Issue.description)
+            .where(Issue.department_id == department_id, Issue.section_id == section_id,
+                   Issue.status != CLOSED, Issue.created_at >= since, Issue.duplicate_of.is_(None))
+            .order_by(Issue.created_at.desc())
+            .limit(DUPLICATE_MAX_PER_SECTION)
+        )
+        rows = list(reversed((await db.execute(stmt)).all()))
+        matrix = None
+        if rows:
+            texts = [issue_text(r.title, r.description) for r in rows]
+            matrix = (await run_in_threadpool(vectorizer.transform, texts)).tocsr()
+        index = self._sections[key] = _SectionIndex(vectorizer, [r.id for r in rows], [r.created_at for r in rows], matrix)
+        return index
+
+    async def find(self, db: AsyncSession, department_id: Optional[int], section_id: Optional[int],
+                   title: str, description: str) -> Tuple[Optional[Issue], object]:
+        """
+        (open issue in the same section that this text near-duplicates, or None; the text's
+        vectorizer and TF-IDF row, to pass to `add` once the new issue is stored). Returns (None, None) when
+        detection is off.
+        """
+        vectorizer = await self.load()  # one model throughout, even if `reset` runs meanwhile
+        if vectorizer is None:
+            return None, None
+        row = vectorizer.transform([issue_text(title, description)]).tocsr()
+        index = await self._section(db, (department_id, section_id), vectorizer)
+        since = datetime.utcnow() - timedelta(hours=DUPLICATE_WINDOW_H)
+        for issue_id, score in index.ranked(row, since):
+            if score < self.threshold:
+                break
+            original = await db.get(Issue, issue_id)
+            if original is not None and original.status != CLOSED:
+                return original, (vectorizer, row)
+            index.discard(issue_id)
+        return None, (vectorizer, row)
+
+    def add(self, issue: Issue, text_row):
+        """
+        Index a newly stored original (if its section is loaded) so the next submission sees
+        it. Duplicates are not indexed: later copies should point at the original too.
+        """
+        if text_row is None:
+            return
+        vectorizer, row = text_row
+        index = self._sections.get((issue.department_id, issue.section_id))
+        if index is not None and index.vectorizer is vectorizer:
+            index.add(issue.id, issue.created_at, row)
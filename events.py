@@ -0,0 +1,175 @@
+"""
+In-process pub/sub for issue changes, served as Server-Sent Events by GET /events/issues.
+
+Committed ORM writes to `issues` are picked up by session hooks (see
+`install_event_publishing`): new issues publish "created", and changed issues
+publish "forwarded", "verified" (closed) or "updated". Writers that bypass the
+ORM flush (bulk_actions.py, pending classification) call `record_issue_event`
+themselves. Events are queued on the session and published only after the
+transaction commits, and dropped on rollback.
+
+Each subscriber sees only the issues it may list (queries.is_visible, the same
+rule as GET /issues/for_user). An issue that moves out of a subscriber's view
+(e.g. forwarded away from the VC) is sent to them as "removed". A subscriber
+that falls more than SSE_QUEUE_SIZE events behind gets a single "resync" event
+and should reload its lists.
+"""
+
+import asyncio
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import event, inspect
+
+from models import Issue
+from queries import CLOSED, is_visible
+from schemas import IssueOut
+
+SSE_QUEUE_SIZE = int(os.getenv("SSE_QUEUE_SIZE", "256"))
+SSE_KEEPALIVE_S = float(os.getenv("SSE_KEEPALIVE_S", "15"))
+
+ISSUE_FIELDS = list(IssueOut.__fields__)
+VISIBILITY_FIELDS = ("student_id", "assigned_to", "section_id", "department_id")
+RESYNC = "resync"
+
+
+def issue_payload(issue) -> Dict:
+    """IssueOut-shaped dict for an Issue instance or a mapping of its columns."""
+    get = issue.get if isinstance(issue, dict) else lambda name: getattr(issue, name, None)
+    return {name: get(name) for name in ISSUE_FIELDS}
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def format_sse(kind: str, data: Dict) -> str:
+    return f"event: {kind}\ndata: {json.dumps(data, default=_json_default)}\n\n"
+
+
+class Subscription:
+    def __init__(self, user, loop: asyncio.AbstractEventLoop):
+        self.user = user
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SSE_QUEUE_SIZE)
+        self.overflowed = False
+
+    def _put(self, message: str):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Drop the backlog and tell the client to reload instead of growing without bound.
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(format_sse(RESYNC, {}))
+
+    def offer(self, message: str):
+        """Thread-safe enqueue onto the subscriber's event loop."""
+        try:
+            self.loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:  # loop closed (shutdown); the stream is gone anyway
+            pass
+
+    async def next(self, timeout: float) -> Optional[str]:
+        try:
+            message = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if self.queue.empty():
+            self.overflowed = False
+        return message
+
+
+class IssueBroker:
+    def __init__(self):
+        self._subscribers: List[Subscription] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, user) -> Subscription:
+        sub = Subscription(user, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, kind: str, issue: Dict, previous: Optional[Dict] = None):
+        """Send `issue` to every subscriber that can see it (or could see it before the change)."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        if not subscribers:
+            return
+        message = removed = None
+        for sub in subscribers:
+            if is_visible(sub.user, issue):
+                message = message or format_sse(kind, issue)
+                sub.offer(message)
+            elif previous is not None and is_visible(sub.user, previous):
+                removed = removed or format_sse("removed", {"id": issue["id"]})
+                sub.offer(removed)
+
+
+def record_issue_event(session, kind: str, issue: Dict, previous: Optional[Dict] = None):
+    """Queue an event on `session`; it is published when the session commits."""
+    session.info.setdefault("issue_events", []).append((kind, issue, previous))
+
+
+def _event_kind(state, issue: Issue) -> Optional[str]:
+    changed = {name for name in ISSUE_FIELDS if name in state.attrs and state.attrs[name].history.has_changes()}
+    if not changed:
+        return None
+    if "status" in changed and issue.status == CLOSED:
+        return "verified"
+    if issue.status == "forwarded" and changed & {"status", "assigned_to"}:
+        return "forwarded"
+    return "updated"
+
+
+def _previous(state) -> Dict:
+    previous = {}
+    for name in VISIBILITY_FIELDS:
+        history = state.attrs[name].history
+        previous[name] = history.deleted[0] if history.deleted else state.attrs[name].value
+    return previous
+
+
+def install_event_publishing(session_class, broker: IssueBroker):
+    """Publish issue events from committed ORM writes on sessions of `session_class`."""
+
+    def _after_flush(session, flush_context):
+        for obj in session.new:
+            if isinstance(obj, Issue):
+                record_issue_event(session, "created", issue_payload(obj))
+        for obj in session.dirty:
+            if not isinstance(obj, Issue):
+                continue
+            state = inspect(obj)
+            kind = _event_kind(state, obj)
+            if kind:
+                record_issue_event(session, kind, issue_payload(obj), _previous(state))
+
+    def _after_commit(session):
+        for kind, issue, previous in session.info.pop("issue_events", []):
+            broker.publish(kind, issue, previous)
+
+    def _after_rollback(session):
+        session.info.pop("issue_events", None)
+
+    event.listen(session_class, "after_flush", _after_flush)
+    event.listen(session_class, "after_commit", _after_commit)
+    event.listen(session_class, "after_soft_rollback", lambda session, previous_transaction: _after_rollback(session))
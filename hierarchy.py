@@ -0,0 +1,193 @@
+"""
+In-memory cache of the org chart (VC -> HOD -> proctor -> students).
+
+Users, sections and departments are loaded once into id-indexed dicts of small
+named tuples, so escalation ("who is my manager?", "who is the VC?"), chain-to-root
+and role-visibility lookups are dictionary hits instead of DB round trips.
+
+Each snapshot also precomputes the full escalation path of every user (an
+ancestor array: manager, manager's manager, ..., ending at the VC), so escalating
+any number of levels is a single list lookup. It is rebuilt with the snapshot
+whenever the org chart changes.
+
+The snapshot is dropped after any committed write to users/sections/departments
+(see `install_invalidation`) and after HIERARCHY_TTL_S seconds as a safety net
+for writes made by other processes (e.g. seed_db.py). A lookup that misses the
+cache falls back to the DB and triggers a reload when the row exists.
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Department, Section, User
+
+HIERARCHY_TTL_S = float(os.getenv("HIERARCHY_TTL_S", "300"))
+
+
+class OrgUser(NamedTuple):
+    id: int
+    name: str
+    role: str
+    department_id: Optional[int]
+    section_id: Optional[int]
+    reports_to: Optional[int]
+
+
+class OrgSnapshot:
+    def __init__(self, users: List[OrgUser], sections: Dict[int, str], departments: Dict[int, str]):
+        self.users: Dict[int, OrgUser] = {u.id: u for u in users}
+        self.sections = sections
+        self.departments = departments
+        self.vc_id: Optional[int] = next((u.id for u in users if u.role == "vc"), None)
+        self.loaded_at = time.monotonic()
+        self._etag: Optional[str] = None
+        self._chains: Dict[int, List[int]] = {}
+        self.reports: Dict[int, List[int]] = {}
+        for u in users:
+            if u.reports_to:
+                self.reports.setdefault(u.reports_to, []).append(u.id)
+        self.paths: Dict[int, Tuple[int, ...]] = {u.id: self._build_path(u.id) for u in users}
+
+    def user(self, user_id: Optional[int]) -> Optional[OrgUser]:
+        return self.users.get(user_id) if user_id else None
+
+    def vc(self) -> Optional[OrgUser]:
+        return self.users.get(self.vc_id) if self.vc_id else None
+
+    def manager(self, user_id: Optional[int]) -> Optional[OrgUser]:
+        u = self.user(user_id)
+        return self.users.get(u.reports_to) if u and u.reports_to else None
+
+    def direct_reports(self, user_id: int) -> List[OrgUser]:
+        """Users whose reports_to is `user_id` (a proctor's students, an HOD's proctors, ...)."""
+        return [self.users[i] for i in self.reports.get(user_id, ())]
+
+    def next_assignee(self, user_id: Optional[int]) -> Optional[OrgUser]:
+        """Manager of `user_id` (reports_to) or the VC when they report to nobody."""
+        path = self.escalation_path(user_id)
+        return self.users[path[0]] if path else None
+
+    def chain_to_root(self, user_id: int) -> List[int]:
+        """[user_id, manager, manager's manager, ...] up to the top of the org chart."""
+        chain = self._chains.get(user_id)
+        if chain is None:
+            chain, seen = [], set()
+            cur = self.users.get(user_id)
+            while cur and cur.id not in seen:  # guard against reports_to cycles
+                seen.add(cur.id)
+                chain.append(cur.id)
+                cur = self.users.get(cur.reports_to) if cur.reports_to else None
+            self._chains[user_id] = chain
+        return chain
+
+    def _build_path(self, user_id: int) -> Tuple[int, ...]:
+        path = self.chain_to_root(user_id)[1:]
+        # Whoever reports to nobody escalates to the VC (same rule as next_assignee).
+        if self.vc_id and user_id != self.vc_id and (not path or path[-1] != self.vc_id):
+            path.append(self.vc_id)
+        return tuple(path)
+
+    def escalation_path(self, user_id: Optional[int]) -> Tuple[int, ...]:
+        """Precomputed ancestors of `user_id`, nearest first, ending at the VC."""
+        return self.paths.get(user_id, ()) if user_id else ()
+
+    def first_with_role(self, user_id: Optional[int], role: str) -> Optional[OrgUser]:
+        """Nearest user with `role` on the escalation path of `user_id`."""
+        for ancestor_id in self.escalation_path(user_id):
+            u = self.users[ancestor_id]
+            if u.role == role:
+                return u
+        return None
+
+    def etag(self) -> str:
+        """Content hash of the users, sections and departments; unchanged across reloads of an unchanged org chart."""
+        if self._etag is None:
+            content = (sorted(self.users.values()), sorted(self.sections.items()), sorted(self.departments.items()))
+            digest = hashlib.sha1(repr(content).encode()).hexdigest()[:16]
+            self._etag = f'"{digest}"'
+        return self._etag
+
+    def department_name(self, dept_id: Optional[int]) -> Optional[str]:
+        return self.departments.get(dept_id) if dept_id else None
+
+    def section_name(self, section_id: Optional[int]) -> Optional[str]:
+        return self.sections.get(section_id) if section_id else None
+
+
+_USER_COLUMNS = (User.id, User.name, User.role, User.department_id, User.section_id, User.reports_to)
+
+
+class OrgCache:
+    def __init__(self, ttl: float = HIERARCHY_TTL_S):
+        self.ttl = ttl
+        self._snapshot: Optional[OrgSnapshot] = None
+        self._lock = asyncio.Lock()
+
+    def invalidate(self):
+        self._snapshot = None
+
+    def _fresh(self) -> Optional[OrgSnapshot]:
+        snap = self._snapshot
+        if snap is not None and time.monotonic() - snap.loaded_at < self.ttl:
+            return snap
+        return None
+
+    async def get(self, db: AsyncSession) -> OrgSnapshot:
+        snap = self._fresh()
+        if snap is not None:
+            return snap
+        async with self._lock:
+            snap = self._fresh()
+            if snap is None:
+                users = [OrgUser(*row) for row in (await db.execute(select(*_USER_COLUMNS))).all()]
+                sections = dict((await db.execute(select(Section.id, Section.name))).all())
+                departments = dict((await db.execute(select(Department.id, Department.name))).all())
+                snap = self._snapshot = OrgSnapshot(users, sections, departments)
+            return snap
+
+    def get_sync(self, db) -> OrgSnapshot:
+        """Same as `get` for sync sessions (background threads, scripts)."""
+        snap = self._fresh()
+        if snap is None:
+            users = [OrgUser(*row) for row in db.execute(select(*_USER_COLUMNS)).all()]
+            sections = dict(db.execute(select(Section.id, Section.name)).all())
+            departments = dict(db.execute(select(Department.id, Department.name)).all())
+            snap = self._snapshot = OrgSnapshot(users, sections, departments)
+        return snap
+
+    async def user(self, db: AsyncSession, user_id: int) -> Optional[OrgUser]:
+        """Cached user lookup; on a miss, check the DB and reload if the user is new."""
+        snap = await self.get(db)
+        u = snap.user(user_id)
+        if u is None and await db.get(User, user_id) is not None:
+            self.invalidate()
+            u = (await self.get(db)).user(user_id)
+        return u
+
+
+_ORG_MODELS = (User, Section, Department)
+
+
+def install_invalidation(session_class, cache: OrgCache):
+    """Drop `cache` after any committed ORM write to users, sections or departments."""
+
+    def _after_flush(session, flush_context):
+        if any(isinstance(o, _ORG_MODELS) for o in (*session.new, *session.dirty, *session.deleted)):
+            session.info["org_changed"] = True
+
+    def _after_commit(session):
+        if session.info.pop("org_changed", False):
+            cache.invalidate()
+
+    def _after_rollback(session):
+        session.info.pop("org_changed", None)
+
+    event.listen(session_class, "after_flush", _after_flush)
+    event.listen(session_class, "after_commit", _after_commit)
+    event.listen(session_class, "after_soft_rollback", lambda session, previous_transaction: _after_rollback(session))
@@ -0,0 +1,168 @@
+"""
+Offline hotspot analytics: clusters of similar open complaints per department.
+
+Usage: python hotspots.py [--window-hours 168] [--chunk-size 1000]
+
+Open issues created in the last `window_hours` are read in id-ordered chunks
+(keyset pagination, as in reclassify_db.py). Each chunk is vectorized by the
+classifier pipeline's own TF-IDF step in one `transform` call. Only the newest
+HOTSPOT_MAX_PER_DEPARTMENT rows per department are kept between chunks, so memory
+is bounded by that cap times the number of departments, not by the window.
+Per department the rows are stacked into one sparse matrix X, and clustering
+is done in bulk:
+  - S = X @ X.T gives the cosine similarity of every pair (rows are L2-normalised)
+  - pairs at or above HOTSPOT_SIMILARITY become graph edges
+  - connected components are the clusters (scipy.sparse.csgraph), so there is no k to pick
+Components with at least HOTSPOT_MIN_SIZE issues are kept. For each one the job
+records its size, how many of its issues arrived in the last HOTSPOT_RECENT_H
+hours (the surge signal), the top TF-IDF terms as a label, and the dominant
+section and category. Each run replaces the contents of `issue_clusters`.
+GET /hotspots serves that table, so dashboards never pay for the clustering.
+The same routine backs POST /admin/hotspots/rebuild in main.py.
+"""
+
+import argparse
+import os
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from duplicates import issue_text, load_vectorizer
+from models import Issue, IssueCluster
+from queries import CLOSED
+
+DB_DIR = "data"
+DB_FILE = "issue_manager.db"
+DB_PATH = os.getenv("DATABASE_URL", f"sqlite:///{os.path.join(os.getcwd(), DB_DIR, DB_FILE)}")
+MODEL_PATH = os.path.join(os.getcwd(), "category_pipe.pkl")
+
+HOTSPOT_SIMILARITY = float(os.getenv("HOTSPOT_SIMILARITY", "0.5"))
+HOTSPOT_MIN_SIZE = int(os.getenv("HOTSPOT_MIN_SIZE", "3"))
+HOTSPOT_RECENT_H = float(os.getenv("HOTSPOT_RECENT_H", "24"))
+HOTSPOT_MAX_PER_DEPARTMENT = int(os.getenv("HOTSPOT_MAX_PER_DEPARTMENT", "3000"))
+HOTSPOT_TOP_TERMS = 5
+HOTSPOT_SAMPLE_IDS = 20
+
+
+def _most_common(values) -> object:
+    counts = Counter(v for v in values if v is not None)
+    return counts.most_common(1)[0][0] if counts else None
+
+
+def _clusters(matrix, threshold: float) -> List[np.ndarray]:
+    """Row indices of each connected component of the `similarity >= threshold` graph, largest first."""
+    similarity = (matrix @ matrix.T).tocsr()
+    similarity.data[similarity.data < threshold] = 0
+    similarity.eliminate_zeros()
+    _, labels = connected_components(similarity, directed=False)
+    order = np.argsort(labels, kind="stable")
+    members = np.split(order, np.cumsum(np.bincount(labels))[:-1])
+    return sorted(members, key=len, reverse=True)
+
+
+def compute_hotspots(db: Session, vectorizer, window_hours: float = 168, chunk_size: int = 1000) -> Dict:
+    """
+    Rebuild issue_clusters from the open issues of the last `window_hours`. Returns
+    {issues, clusters, seconds}.
+    """
+    started = time.perf_counter()
+    now = datetime.utcnow()
+    since = now - timedelta(hours=window_hours)
+    recent_since = now - timedelta(hours=HOTSPOT_RECENT_H)
+    terms = np.asarray(vectorizer.get_feature_names_out())
+
+    # department -> the newest HOTSPOT_MAX_PER_DEPARTMENT issues and their TF-IDF rows
+    departments: Dict[int, Dict[str, list]] = {}
+    last_id = 0
+    total = 0
+    while True:
+        rows = (
+            db.query(Issue.id, Issue.title, Issue.description, Issue.department_id, Issue.section_id,
+                     Issue.category, Issue.created_at)
+            .filter(Issue.id > last_id, Issue.status != CLOSED, Issue.created_at >= since)
+            .order_by(Issue.id)
+            .limit(max(1, chunk_size))
+            .all()
+        )
+        if not rows:
+            break
+        matrix = vectorizer.transform([issue_text(r.title, r.description) for r in rows]).tocsr()
+        by_department: Dict[int, List[int]] = {}
+        for i, r in enumerate(rows):
+            by_department.setdefault(r.department_id or 0, []).append(i)
+        for department_id, idx in by_department.items():
+            dept = departments.setdefault(department_id, {"rows": None, "issues": []})
+            stacked = matrix[idx] if dept["rows"] is None else sparse.vstack([dept["rows"], matrix[idx]], format="csr")
+            # The pairwise similarity matrix grows with n^2, so only the newest rows are clustered.
+            dept["rows"] = stacked[-HOTSPOT_MAX_PER_DEPARTMENT:]
+            dept["issues"] = (dept["issues"] + [rows[i] for i in idx])[-HOTSPOT_MAX_PER_DEPARTMENT:]
+        last_id = rows[-1].id
+        total += len(rows)
+
+    clusters = []
+    for department_id, dept in departments.items():
+        issues, matrix = dept["issues"], dept["rows"]
+        for members in _clusters(matrix, HOTSPOT_SIMILARITY):
+            if len(members) < HOTSPOT_MIN_SIZE:
+                break
+            weights = np.asarray(matrix[members].sum(axis=0)).ravel()
+            top = terms[np.argsort(weights)[::-1][:HOTSPOT_TOP_TERMS]]
+            group = sorted((issues[i] for i in members), key=lambda r: r.created_at, reverse=True)
+            clusters.append({
+                "computed_at": now,
+                "window_start": since,
+                "department_id": department_id or None,
+                "section_id": _most_common(r.section_id for r in group),
+                "category": _most_common(r.category for r in group),
+                "label": ", ".join(str(t) for t in top),
+                "size": len(group),
+                "recent": sum(1 for r in group if r.created_at >= recent_since),
+                "first_seen": group[-1].created_at,
+                "last_seen": group[0].created_at,
+                "issue_ids": ",".join(str(r.id) for r in group[:HOTSPOT_SAMPLE_IDS]),
+            })
+
+    db.execute(delete(IssueCluster))
+    if clusters:
+        db.execute(insert(IssueCluster), clusters)
+    db.commit()
+    return {"issues": total, "clusters": len(clusters), "seconds": round(time.perf_counter() - started, 3)}
+
+
+def main():
+    from sqlalchemy.orm import sessionmaker
+    from migrate_db import migrate
+    from storage import create_storage_engine
+
+    parser = argparse.ArgumentParser(description="Cluster recent open issues into hotspots")
+    parser.add_argument("--window-hours", type=float, default=168)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    vectorizer = load_vectorizer(MODEL_PATH)
+    if vectorizer is None:
+        print(f"Model not found or not loadable at: {MODEL_PATH}")
+        return
+
+    engine = create_storage_engine(DB_PATH, echo=False)
+    migrate(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        result = compute_hotspots(session, vectorizer, window_hours=args.window_hours, chunk_size=args.chunk_size)
+        print(f"✅ {result['clusters']} hotspots from {result['issues']} open issues in {result['seconds']}s")
+    except Exception as e:
+        print(f"❌ Error while computing hotspots: {e}")
+        session.rollback()
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Conditional GET for the read endpoints: weak ETags, If-None-Match -> 304, Cache-Control.
+
+ETags are derived from version markers that are cheap to read, so an unchanged
+resource is revalidated without running the query behind it:
+  - a single row: its own columns (issues use updated_at)
+  - issue lists, dashboards and /admin/stats: the issue_version row, which every
+    transaction that writes issues or issue_counters increments (stats.py), so a
+    late commit with an older updated_at still changes it; plus the newest
+    issues.updated_at, which tells a reseeded database apart from the old one
+  - anything showing names or visibility: the org chart snapshot's etag
+
+Issue data is "private, no-cache" (always revalidate); org reference data
+(departments, sections) may be reused for HTTP_CACHE_MAX_AGE_S without asking.
+"""
+
+import hashlib
+import os
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Issue, IssueVersion
+
+HTTP_CACHE_MAX_AGE_S = int(os.getenv("HTTP_CACHE_MAX_AGE_S", "300"))
+
+REVALIDATE = "private, no-cache"
+REFERENCE = f"public, max-age={HTTP_CACHE_MAX_AGE_S}"
+
+
+def weak_etag(*parts) -> str:
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:16]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check with weak comparison (W/ prefixes are ignored)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(","))
+
+
+def check_not_modified(response: Response, if_none_match: Optional[str], etag: str,
+                       cache_control: str = REVALIDATE):
+    """Set ETag/Cache-Control on `response`; raise a bodiless 304 if the client's copy is current."""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(if_none_match, etag):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+
+async def issues_version(db: AsyncSession) -> Tuple:
+    """
+    (issue_version, newest issues.updated_at) in one round trip. Read from the database
+    only, so every worker process computes the same ETag for the same data.
+    """
+    row = (await db.execute(select(
+        select(IssueVersion.version).where(IssueVersion.id == 1).scalar_subquery(),
+        select(func.max(Issue.updated_at)).scalar_subquery(),
+    ))).one()
+    return tuple(row)
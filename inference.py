@@ -0,0 +1,362 @@
+"""
+Micro-batching inference engine for the issue classifier.
+
+Concurrent callers (POST /issues, POST /issues/{id}/classify) hand their text to
+`InferenceEngine.submit`. A single worker thread drains the pending texts into
+batches of at most `max_batch_size`, waiting at most `max_wait_ms` for a batch to
+fill, and runs ONE `predict_proba` per batch. The label is the argmax over the
+pipeline's `classes_`, so the TF-IDF/pipeline runs once per text instead of twice.
+
+With `workers > 0` the batches run in a dedicated process pool; each worker
+process loads the pipeline once. `swap` switches to another model version
+(model_registry.py): a new pool is started and warmed before it takes traffic,
+and batches already sent to the old one finish there. Every prediction carries
+the `model_version` that produced it. If a pool worker dies (OOM, SIGKILL), the
+broken pool is replaced with a fresh one and the batch is retried once.
+
+Models are loaded lazily: an engine given only a model path (and a pool worker
+process, which is spawned on the first batch) loads it with
+model_store.load_model on first use, memory-mapping the large arrays.
+`warm_up` does that ahead of time; main.py runs it in a background thread at
+startup so the first requests don't pay for it within their timeout.
+
+The pending queue is bounded and the number of in-flight batches is capped, so
+under overload new texts get the fallback result ("other", keyword-based
+priority, no model_version) instead of piling up, and callers never wait longer
+than `timeout` seconds.
+"""
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from model_store import load_model
+
+CRITICAL_KEYWORDS = ["fire", "sparking", "danger", "broken", "injury", "accident"]
+HIGH_KEYWORDS = ["urgent", "asap", "soon", "today"]
+
+logger = logging.getLogger(__name__)
+
+WARMUP_TEXT = "warm-up: projector not working in the lab"
+
+_STOP = object()
+
+
+def priority_for(text: str, confidence: float) -> str:
+    """Heuristic priority from keywords, falling back to classifier confidence."""
+    text_low = text.lower()
+    if any(k in text_low for k in CRITICAL_KEYWORDS):
+        return "critical"
+    if any(k in text_low for k in HIGH_KEYWORDS):
+        return "high"
+    if confidence < 0.45:
+        return "medium"
+    return "low"
+
+
+def fallback_prediction(text: str) -> Dict:
+    """Result when the classifier can't run; keyword rules still decide the priority."""
+    return {"category": "other", "confidence": 0.0, "priority": priority_for(text, 0.0), "model_version": None}
+
+
+def classify_batch(model, texts: List[str], version: Optional[str] = None) -> List[Dict]:
+    """Run one predict_proba over `texts` and build {category, confidence, priority, model_version} dicts."""
+    proba = model.predict_proba(texts)
+    best = proba.argmax(axis=1)
+    labels = np.asarray(model.classes_)[best]
+    confidences = proba[np.arange(len(texts)), best]
+    return [
+        {"category": str(label), "confidence": float(conf), "priority": priority_for(text, float(conf)),
+         "model_version": version}
+        for text, label, conf in zip(texts, labels, confidences)
+    ]
+
+
+# Pipeline (and its version) loaded once per pool worker process by `_init_worker`.
+_worker_model = None
+_worker_version: Optional[str] = None
+
+
+def _init_worker(model_path: str, version: Optional[str] = None):
+    global _worker_model, _worker_version
+    try:
+        _worker_model = load_model(model_path)
+        _worker_version = version
+    except Exception:
+        _worker_model = None
+
+
+def _classify_in_worker(texts: List[str]) -> List[Dict]:
+    if _worker_model is None:
+        return [fallback_prediction(text) for text in texts]
+    return classify_batch(_worker_model, texts, _worker_version)
+
+
+class InferenceEngine:
+    """Collects texts from concurrent requests and classifies them in small batches."""
+
+    def __init__(
+        self,
+        model=None,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        model_path: Optional[str] = None,
+        workers: int = 0,
+        max_queue: int = 256,
+        timeout: float = 2.0,
+        version: Optional[str] = None,
+    ):
+        # (model, model_path, version), replaced as a whole by `swap`. Without a model,
+        # workers=0 loads model_path on first use.
+        self._active = (model, model_path, version)
+        self.workers = max(0, workers)
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.timeout = timeout
+        self._pending: "queue.Queue" = queue.Queue(maxsize=max(1, max_queue))
+        self._worker: Optional[threading.Thread] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Caps batches handed to the pool but not finished yet.
+        self._in_flight = threading.BoundedSemaphore(max(1, self.workers * 2))
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    @property
+    def model(self):
+        return self._active[0]
+
+    @property
+    def model_path(self) -> Optional[str]:
+        return self._active[1]
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._active[2]
+
+    @property
+    def available(self) -> bool:
+        if self.model is not None:
+            return True
+        return bool(self.model_path) and os.path.exists(self.model_path)
+
+    def _loaded(self):
+        """(model, version) for in-process inference, loading the model on first use."""
+        while True:
+            active = self._active
+            model, model_path, version = active
+            if model is not None:
+                return model, version
+            with self._load_lock:
+                if self._active is active:  # not swapped or loaded meanwhile
+                    self._active = (load_model(model_path), model_path, version)
+
+    def _new_executor(self, model_path: str, version: Optional[str]) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker, initargs=(model_path, version)
+        )
+
+    def start(self):
+        with self._lock:
+            if self.workers and self._executor is None and self.available:
+                self._executor = self._new_executor(self.model_path, self.version)
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="inference-batcher", daemon=True)
+                self._worker.start()
+
+    def close(self):
+        with self._lock:
+            worker, self._worker = self._worker, None
+            executor, self._executor = self._executor, None
+        if worker is not None:
+            self._pending.put(_STOP)
+            worker.join()
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def swap(self, model, model_path: Optional[str], version: Optional[str], warm: bool = True,
+             warmup_timeout: float = 60.0):
+        """
+        Switch to another model version without dropping requests. With a worker pool, a
+        new pool loading `model_path` is started and (if `warm`) warmed first; if its workers
+        fail to load the model, RuntimeError is raised and the current version stays active.
+        The old pool is shut down once its in-flight batches are done.
+        """
+        executor = None
+        if self.workers:
+            # Pool workers are spawned, and load the model, on the first batch sent to them.
+            executor = self._new_executor(model_path, version)
+            if warm:
+                try:
+                    warmups = [executor.submit(_classify_in_worker, [WARMUP_TEXT]) for _ in range(self.workers)]
+                    if any(f.result(timeout=warmup_timeout)[0]["model_version"] != version for f in warmups):
+                        raise RuntimeError(f"worker pool could not load {model_path}")
+                except Exception:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+        with self._lock:
+            old = self._executor if executor is not None else None
+            if executor is not None:
+                self._executor = executor
+            self._active = (model, model_path, version)
+        if old is not None:
+            old.shutdown(wait=False)
+
+    def warm_up(self, timeout: float = 60.0):
+        """Load the model now (in every pool worker) instead of on the first batch. Never raises."""
+        if not self.available:
+            return
+        try:
+            if self.workers:
+                self.start()
+                warmups = [self._pool_submit([WARMUP_TEXT])[1] for _ in range(self.workers)]
+                for f in warmups:
+                    f.result(timeout=timeout)
+            else:
+                self._loaded()
+        except Exception:
+            logger.exception("Classifier warm-up failed; the model will be loaded on first use")
+
+    def _replace_broken_pool(self, broken: ProcessPoolExecutor):
+        """Start a new pool in place of `broken` (unless another thread already did)."""
+        with self._lock:
+            if self._executor is not broken:
+                return
+            logger.warning("Classifier worker pool is broken (a worker died); starting a new one")
+            self._executor = self._new_executor(self.model_path, self.version)
+        broken.shutdown(wait=False)
+
+    def _pool_submit(self, texts: List[str]) -> Tuple[ProcessPoolExecutor, Future]:
+        """(pool, future) for `texts`; replaces a broken pool once."""
+        replaced = False
+        while True:
+            executor = self._executor
+            try:
+                return executor, executor.submit(_classify_in_worker, texts)
+            except BrokenProcessPool:
+                if replaced:
+                    raise
+                self._replace_broken_pool(executor)
+                replaced = True
+            except RuntimeError:
+                # A concurrent swap may shut the pool down between reading and using it.
+                if self._executor is executor:
+                    raise
+
+    def submit(self, text: str) -> Future:
+        fut: Future = Future()
+        if not self.available:
+            fut.set_result(fallback_prediction(text))
+            return fut
+        self.start()
+        try:
+            self._pending.put_nowait((text, fut))
+        except queue.Full:
+            # Backpressure: the classifier is saturated, don't make the caller wait.
+            fut.set_result(fallback_prediction(text))
+        return fut
+
+    def predict(self, text: str) -> Dict:
+        try:
+            return self.submit(text).result(timeout=self.timeout)
+        except FutureTimeoutError:
+            return fallback_prediction(text)
+
+    async def predict_async(self, text: str) -> Dict:
+        """Awaitable variant of `predict`; never blocks the event loop."""
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(self.submit(text)), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            return fallback_prediction(text)
+
+    def predict_many(self, texts: List[str], timeout: Optional[float] = None) -> List[Dict]:
+        """Classify an already-collected list of texts directly (no queueing)."""
+        if not texts:
+            return []
+        if not self.available:
+            return [fallback_prediction(text) for text in texts]
+        try:
+            if self.workers:
+                self.start()
+                executor, fut = self._pool_submit(list(texts))
+                try:
+                    return fut.result(timeout=timeout)
+                except BrokenProcessPool:
+                    self._replace_broken_pool(executor)
+                    return self._pool_submit(list(texts))[1].result(timeout=timeout)
+            model, version = self._loaded()
+            return classify_batch(model, list(texts), version)
+        except Exception:
+            logger.exception("Classification of %d texts failed; using the fallback", len(texts))
+            return [fallback_prediction(text) for text in texts]
+
+    def _dispatch(self, batch: List, retry: bool = True):
+        """Hand a batch to the process pool; results are delivered from the done callback."""
+        self._in_flight.acquire()
+        try:
+            executor, pool_fut = self._pool_submit([text for text, _ in batch])
+        except Exception:
+            logger.exception("Could not hand a batch to the classifier pool; using the fallback")
+            self._in_flight.release()
+            self._deliver(batch, None)
+            return
+
+        def done(f):
+            self._in_flight.release()
+            try:
+                results = f.result()
+            except BrokenProcessPool:
+                if retry:
+                    self._replace_broken_pool(executor)
+                    self._dispatch(batch, retry=False)
+                    return
+                logger.error("Classifier pool broke again; using the fallback for %d texts", len(batch))
+                results = None
+            except Exception:
+                logger.exception("Classifier batch failed; using the fallback")
+                results = None
+            self._deliver(batch, results)
+
+        pool_fut.add_done_callback(done)
+
+    @staticmethod
+    def _deliver(batch: List, results: Optional[List[Dict]]):
+        for i, (text, fut) in enumerate(batch):
+            try:
+                fut.set_result(results[i] if results else fallback_prediction(text))
+            except InvalidStateError:
+                pass  # caller timed out and cancelled
+
+    def _collect(self, first) -> List:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._pending.get(timeout=remaining) if remaining > 0 else self._pending.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._pending.put(_STOP)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._pending.get()
+            if first is _STOP:
+                return
+            batch = self._collect(first)
+            if self._executor is not None:
+                self._dispatch(batch)
+            else:
+                self._deliver(batch, self.predict_many([text for text, _ in batch]))
@@ -4,46 +4,147 @@ CampusMind FastAPI backend - consolidated, cleaned endpoints.
 Features:
 - Basic auth: POST /auth/login (email + password) -> user metadata
 - Issue creation: POST /issues (auto-classify + assign to student's manager if present)
+    - near-duplicates of an open issue in the same section are linked via duplicate_of and
+      reuse its classification (duplicates.py); GET /issues/{issue_id}/duplicates lists them
+    - POST /issues?classify_later=true stores the issue with category/priority "pending"
+      and classifies it in the background
+- Background classification: GET /classification/status, POST /classification/flush
 - Role-aware listing: GET /issues/for_user/{user_id}?show_resolved=false
+- Dashboard in one call: GET /dashboard/{user_id} (active / escalated-by-me / resolved issues
+  with student, assignee and verifier names, the user's team, counts; see dashboard.py)
+- Delta sync: GET /issues/for_user/{user_id}/changes?since=<watermark> (issues changed since
+  the previous call, plus closed and removed ids; see sync.py)
+- Live updates: GET /events/issues?user_id= (Server-Sent Events: created / updated /
+  forwarded / verified / removed / resync, filtered by the same visibility rules)
+- All issue lists accept ?cursor= (keyset pagination on created_at, id); the next page's
+  cursor comes back in the X-Next-Cursor response header
+- Issue lists and GET /issues/{issue_id} accept ?expand=student,assignee,forwarder,verifier
+  to embed those users' names (student_name, ...) instead of looking users up client-side
 - Generic issue list: GET /issues (with filters)
 - Active / Resolved shortcuts: GET /issues/active, GET /issues/resolved
 - Get single issue: GET /issues/{issue_id}
 - Re-classify: POST /issues/{issue_id}/classify
 - Forward / escalate: POST /issues/{issue_id}/forward?by_user_id=
+- Jump-escalate: POST /issues/{issue_id}/escalate?by_user_id=&to_role=proctor|hod|vc
+  (straight to that level of the escalation path); GET /users/{user_id}/escalation_path
 - Verify / resolve: POST /issues/{issue_id}/verify?verifier_id=&resolved=true
 - Manual assign: POST /users/{user_id}/assign_issue/{issue_id}?assigner_id=
-- Search issues by title: GET /issues/search?title=
-- User list & get: GET /users, GET /users/{user_id}
+- Bulk actions: POST /issues/bulk {issue_ids, action: resolve|forward|assign, by_user_id,
+  assignee_id} -> per-id results, applied in one transaction (see bulk_actions.py)
+- Full-text search: GET /issues/search?q=&department_id=&status=&category=&user_id=
+  (SQLite FTS5 over title + description, BM25-ranked, prefix matching, highlighted
+  title and snippet; see search.py)
+- User directory: GET /users?role=&department_id=&section_id=&reports_to=&fields=id,name
+  (keyset-paginated by id with ?cursor= / X-Next-Cursor), GET /users/{user_id}
+- User names: GET /users/names?ids=1,2 -> {id: name} from the org chart cache
+- Read endpoints (issue lists, single issue, dashboard, users, departments, sections,
+  /admin/stats) send weak ETags and Cache-Control; If-None-Match gets a 304 (see http_cache.py)
 - Admin endpoints:
     - GET /admin/issues (all issues, with optional filters)
-    - GET /admin/stats (counts overall + per-department breakdown)
+    - GET /admin/issues/export?format=ndjson|csv (streamed full export, same filters)
+    - GET /admin/stats (counts overall + per-department/section/category/priority breakdowns)
+    - POST /admin/stats/rebuild (reconcile the issue_counters table behind /admin/stats)
+    - POST /admin/reclassify (re-run the classifier over every issue, see reclassify_db.py)
+    - POST /admin/model/reload, POST /admin/model/activate?version= (load a new model now,
+      or roll back to a registered one)
+    - POST /admin/hotspots/rebuild (recluster recent open issues, see hotspots.py)
+- Hotspots: GET /hotspots?department_id=&min_recent= (clusters of similar open complaints,
+  precomputed offline by hotspots.py)
 Notes:
 - Uses your models.py and schemas.py (IssueOut expects created_at present).
-- Classifier is optional; if missing, falls back to "other"/low priority.
+- Classifier is optional; if missing, falls back to "other" with keyword-based priority.
+- Model versions: GET /model. A new category_pipe.pkl is picked up within MODEL_POLL_S,
+  loaded and warmed in the background, then swapped in without a restart; each issue
+  records the model_version that classified it (see model_registry.py).
+- The model is loaded in the background after startup rather than before it (MODEL_LAZY_LOAD=0
+  loads and warms it first), with its large arrays memory-mapped and shared by every process
+  (model_store.py, MODEL_MMAP).
+- Classification goes through a micro-batching engine (inference.py); tune it with
+  CLASSIFY_MAX_BATCH and CLASSIFY_MAX_WAIT_MS.
+- With CLASSIFY_WORKERS > 0 (default 1) batches run in a dedicated process pool, bounded by
+  CLASSIFY_MAX_QUEUE and CLASSIFY_TIMEOUT_S; overload falls back to "other".
+- Escalation and role lookups read the org chart from an in-memory cache (hierarchy.py).
+- Endpoints are async and use AsyncSession on an async engine (aiosqlite by default; set
+  DATABASE_URL, e.g. postgresql+asyncpg://..., to change). Background threads and admin
+  batch jobs use a sync engine on the same database.
 """
 
 import os
-from typing import Optional, List, Dict
+import csv
+import io
+import json
+import threading
+from typing import Optional, List, Dict, Tuple
 from datetime import datetime
 
-import joblib
-from fastapi import FastAPI, HTTPException, Depends, Query
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.staticfiles import StaticFiles
-from starlette.responses import FileResponse
+from starlette.responses import FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import create_engine, or_, func
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, Session
 
-from models import Base, User, Issue, Department, Section
-from schemas import IssueCreate, IssueOut
+from models import User, Issue, IssueCluster, Department, Section
+from schemas import IssueBulkAction, IssueBulkResult, IssueChanges, IssueCreate, IssueExpanded, IssueOut, IssueSearchHit
+from inference import InferenceEngine, priority_for
+from model_registry import ModelRegistry
+from pending_classification import PendingClassificationWorker, PENDING
+from reclassify_db import reclassify_issues
+from migrate_db import migrate
+from queries import (
+    EXPANSIONS, USER_FIELDS, after_cursor, duplicates_query, after_user_cursor, encode_cursor, encode_user_cursor, expand_options,
+    issues_for_user_query, issues_query, login_query, parse_expand, parse_fields, users_query,
+)
+from storage import create_storage_engine, create_async_storage_engine
+from hierarchy import OrgCache, OrgUser, install_invalidation
+from bulk_actions import BULK_MAX_ISSUES, apply_bulk_action
+from events import SSE_KEEPALIVE_S, IssueBroker, install_event_publishing, issue_payload
+from sync import collect_changes, install_tombstones, prune_tombstones
+from dashboard import DASHBOARD_RESOLVED_LIMIT, build_dashboard
+from http_cache import REFERENCE, check_not_modified, issues_version, weak_etag
+from search import marked_html, search_query
+from duplicates import DuplicateIndex, load_vectorizer
+from hotspots import compute_hotspots
+from stats import compute_stats, install_counter_tracking, rebuild_counters, counters_need_rebuild
 
 DB_DIR = "data"
 DB_FILE = "issue_manager.db"
-DB_URI = f"sqlite:///{os.path.join(os.getcwd(), DB_DIR, DB_FILE)}"
+DB_URI = os.getenv("DATABASE_URL", f"sqlite+aiosqlite:///{os.path.join(os.getcwd(), DB_DIR, DB_FILE)}")
 MODEL_PATH = os.path.join(os.getcwd(), "category_pipe.pkl")
-
-engine = create_engine(DB_URI, connect_args={"check_same_thread": False}, echo=False)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+CLASSIFY_MAX_BATCH = int(os.getenv("CLASSIFY_MAX_BATCH", "32"))
+CLASSIFY_MAX_WAIT_MS = float(os.getenv("CLASSIFY_MAX_WAIT_MS", "5"))
+CLASSIFY_WORKERS = int(os.getenv("CLASSIFY_WORKERS", "1"))
+CLASSIFY_MAX_QUEUE = int(os.getenv("CLASSIFY_MAX_QUEUE", "256"))
+CLASSIFY_TIMEOUT_S = float(os.getenv("CLASSIFY_TIMEOUT_S", "2"))
+MODEL_LAZY_LOAD = int(os.getenv("MODEL_LAZY_LOAD", "1"))
+PENDING_BATCH_SIZE = int(os.getenv("PENDING_BATCH_SIZE", "64"))
+PENDING_INTERVAL_S = float(os.getenv("PENDING_INTERVAL_S", "2"))
+PRIORITY_RANK = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+
+class TrackedSession(Session):
+    """Session class for both engines; issue_counters tracking hooks onto it."""
+
+install_counter_tracking(TrackedSession)
+install_tombstones(TrackedSession)
+
+# Org chart cache for escalation and visibility lookups; dropped on user/section/department writes.
+org_cache = OrgCache()
+install_invalidation(TrackedSession, org_cache)
+
+# Committed issue changes fan out to GET /events/issues subscribers (events.py).
+issue_broker = IssueBroker()
+install_event_publishing(TrackedSession, issue_broker)
+
+# WAL + tuned pragmas; see storage.py (DB_PROFILE etc.)
+async_engine = create_async_storage_engine(DB_URI, echo=False)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, sync_session_class=TrackedSession, autoflush=False, expire_on_commit=False
+)
+# Sync engine for the background classifier, migrations and batch admin jobs.
+engine = create_storage_engine(DB_URI, echo=False)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=TrackedSession)
 
 app = FastAPI(title="CampusMind Backend (main.py)")
 
@@ -57,79 +158,124 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
-classifier = None
-classifier_loaded = False
-if os.path.exists(MODEL_PATH):
-    try:
-        classifier = joblib.load(MODEL_PATH)
-        classifier_loaded = True
-    except Exception:
-        classifier = None
-        classifier_loaded = False
+# The registry picks the model version at startup and hot-swaps it when category_pipe.pkl
+# changes (model_registry.py); it is memory-mapped (model_store.py) and loaded in the
+# background at startup. With a worker pool it lives in the worker processes only.
+inference = InferenceEngine(
+    None,
+    max_batch_size=CLASSIFY_MAX_BATCH,
+    max_wait_ms=CLASSIFY_MAX_WAIT_MS,
+    model_path=MODEL_PATH,
+    workers=CLASSIFY_WORKERS,
+    max_queue=CLASSIFY_MAX_QUEUE,
+    timeout=CLASSIFY_TIMEOUT_S,
+)
+model_registry = ModelRegistry(MODEL_PATH, inference)
 
-def get_db():
-    db = SessionLocal()
-    try:
+# Near-duplicate check at submission, on the classifier's own TF-IDF vectorizer (duplicates.py).
+duplicate_index = DuplicateIndex(lambda: load_vectorizer(MODEL_PATH))
+model_registry.subscribe(lambda version, path: duplicate_index.reset(lambda: load_vectorizer(path)))
+
+pending_worker = PendingClassificationWorker(
+    SessionLocal,
+    lambda texts: inference.predict_many(texts, timeout=CLASSIFY_TIMEOUT_S * 10),
+    batch_size=PENDING_BATCH_SIZE,
+    interval=PENDING_INTERVAL_S,
+)
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 def predict_category_and_priority(text: str) -> Dict:
     """
     Returns dict: {category, confidence, priority}
     Heuristic-based priority + classifier confidence.
+    Concurrent calls are batched into a single predict_proba by the inference engine.
     """
-    if not classifier_loaded or classifier is None:
-        return {"category": "other", "confidence": 0.0, "priority": "low"}
-    try:
-        pred = classifier.predict([text])[0]
-        prob = float(classifier.predict_proba([text])[0].max())
-    except Exception:
-        pred = "other"
-        prob = 0.0
-
-    text_low = text.lower()
-    if any(k in text_low for k in ["fire", "sparking", "danger", "broken", "injury", "accident"]):
-        priority = "critical"
-    elif any(k in text_low for k in ["urgent", "asap", "soon", "today"]):
-        priority = "high"
-    elif prob < 0.45:
-        priority = "medium"
-    else:
-        priority = "low"
+    return inference.predict(text)
 
-    return {"category": pred, "confidence": prob, "priority": priority}
+async def predict_category_and_priority_async(text: str) -> Dict:
+    """Same as predict_category_and_priority, awaited without blocking the event loop."""
+    return await inference.predict_async(text)
 
-def find_next_assignee(db: Session, current_user_id: Optional[int]) -> Optional[User]:
-    """Return the manager of current_user (reports_to) or VC fallback."""
+async def issue_lists_fresh(response: Response, if_none_match: Optional[str] = Header(None), db: AsyncSession = Depends(get_db)):
+    """
+    Conditional GET for issue lists, dashboards and stats: 304 when no issue and nothing
+    in the org chart changed since the client's copy. Runs before the query, so a write
+    racing with it can only cost an extra 200, never a stale 304.
+    """
+    org = await org_cache.get(db)
+    etag = weak_etag(await issues_version(db), org.etag())
+    check_not_modified(response, if_none_match, etag)
+
+def expand_param(expand: Optional[str] = Query(None, description="Comma-separated: student,assignee,forwarder,verifier")) -> Tuple[str, ...]:
+    try:
+        return parse_expand(expand)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def expanded(issue: Issue, expand: Tuple[str, ...]):
+    """The issue with "<relation>_name" fields for each expanded relation (eager-loaded by expand_options)."""
+    if not expand:
+        return issue
+    out = issue_payload(issue)
+    for name in expand:
+        related = getattr(issue, EXPANSIONS[name].key)
+        out[f"{name}_name"] = related.name if related else None
+    return out
+
+async def paginate(db: AsyncSession, stmt, response: Response, cursor: Optional[str], skip: int, limit: int,
+                   expand: Tuple[str, ...] = ()) -> List:
+    """
+    Keyset pagination over a newest-first issue query, keyed on (created_at, id).
+    With a cursor, skip is ignored. When more rows exist the opaque token for the
+    next page is returned in the X-Next-Cursor header. Related users named in
+    `expand` are loaded per page with one query per relation.
+    """
+    if expand:
+        stmt = stmt.options(*expand_options(expand))
+    if cursor:
+        try:
+            stmt = after_cursor(stmt, cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    elif skip:
+        stmt = stmt.offset(skip)
+    rows = (await db.scalars(stmt.limit(limit + 1))).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1])
+    return [expanded(issue, expand) for issue in rows]
+
+async def save_and_refresh(db: AsyncSession, obj):
+    db.add(obj)
+    await db.commit()
+    await db.refresh(obj)
+    return obj
+
+async def find_next_assignee(db: AsyncSession, current_user_id: Optional[int]) -> Optional[OrgUser]:
+    """Return the manager of current_user (reports_to) or VC fallback, from the org cache."""
     if not current_user_id:
         return None
-    cur = db.query(User).filter(User.id == current_user_id).first()
-    if not cur:
-        return None
-    next_id = cur.reports_to
-    if not next_id:
-        vc = db.query(User).filter(User.role == "vc").first()
-        return vc
-    return db.query(User).filter(User.id == next_id).first()
+    org = await org_cache.get(db)
+    return org.next_assignee(current_user_id)
 
-def escalate_issue_to_next(db: Session, issue: Issue, by_user_id: int) -> Issue:
+async def escalate_issue_to_next(db: AsyncSession, issue: Issue, by_user_id: int) -> Issue:
     """
     Escalate an issue up the reports_to chain.
     If issue.assigned_to is None -> assign to student's reports_to (proctor) or VC fallback.
     """
     if issue.assigned_to is None:
-        student = db.query(User).filter(User.id == issue.student_id).first()
+        student = await org_cache.user(db, issue.student_id)
         if not student:
             raise HTTPException(status_code=400, detail="Issue has invalid student_id")
-        if not student.reports_to:
-            next_user = db.query(User).filter(User.role == "vc").first()
-        else:
-            next_user = db.query(User).filter(User.id == student.reports_to).first()
+        next_user = await find_next_assignee(db, student.id)
     else:
-        next_user = find_next_assignee(db, issue.assigned_to)
+        next_user = await find_next_assignee(db, issue.assigned_to)
 
     if not next_user:
         raise HTTPException(status_code=400, detail="No higher authority found to escalate to")
@@ -137,54 +283,133 @@ def escalate_issue_to_next(db: Session, issue: Issue, by_user_id: int) -> Issue:
     issue.forwarded_by = by_user_id
     issue.assigned_to = next_user.id
     issue.status = "forwarded"
-    db.add(issue)
-    db.commit()
-    db.refresh(issue)
-    return issue
+    return await save_and_refresh(db, issue)
+
+async def escalate_issue_to_role(db: AsyncSession, issue: Issue, by_user_id: int, to_role: str) -> Issue:
+    """
+    Escalate an issue straight to the nearest `to_role` above its current assignee
+    (above the student when unassigned), using the precomputed escalation paths. If the
+    assignee's own path has no such role, the student's path is used, but only the part
+    strictly above the assignee: escalation never moves an issue down. One commit,
+    however many levels are skipped.
+    """
+    org = await org_cache.get(db)
+    if not org.user(issue.student_id):
+        raise HTTPException(status_code=400, detail="Issue has invalid student_id")
+    assignee = org.user(issue.assigned_to)
+    if assignee is not None and assignee.role == to_role:
+        raise HTTPException(status_code=400, detail=f"Issue is already assigned to the {to_role}")
+    target = org.first_with_role(issue.assigned_to or issue.student_id, to_role)
+    if target is None and issue.assigned_to:
+        path = org.escalation_path(issue.student_id)
+        if issue.assigned_to in path:
+            above = path[path.index(issue.assigned_to) + 1:]
+            target = next((org.users[i] for i in above if org.users[i].role == to_role), None)
+    if target is None:
+        raise HTTPException(status_code=400, detail=f"No {to_role} above the current assignee to escalate to")
+
+    issue.forwarded_by = by_user_id
+    issue.assigned_to = target.id
+    issue.status = "forwarded"
+    return await save_and_refresh(db, issue)
+
+def user_out(u: User) -> Dict:
+    return {
+        "id": u.id,
+        "name": u.name,
+        "email": u.email,
+        "role": u.role,
+        "department_id": u.department_id,
+        "section_id": u.section_id,
+        "reports_to": u.reports_to,
+    }
 
 @app.get("/")
 async def read_index():
     return FileResponse('static/index.html')
 
+def _warm_up():
+    # Pool workers / the in-process model, then the duplicate index's vectorizer.
+    inference.warm_up()
+    duplicate_index.vectorizer
+
 @app.on_event("startup")
 def startup():
     # Ensure data directory exists
     if not os.path.exists(DB_DIR):
         os.makedirs(DB_DIR)
-    Base.metadata.create_all(bind=engine)
+    migrate(engine)
+    db = SessionLocal()
+    try:
+        if counters_need_rebuild(db):
+            rebuild_counters(db)
+        prune_tombstones(db)
+    finally:
+        db.close()
+    # Register the current model; unless MODEL_LAZY_LOAD=0 it is loaded in the background.
+    model_registry.check(warm=not MODEL_LAZY_LOAD)
+    inference.start()
+    if MODEL_LAZY_LOAD:
+        threading.Thread(target=_warm_up, name="model-warmup", daemon=True).start()
+    model_registry.start()
+    pending_worker.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    # Drain pending classifications before the worker pool goes away.
+    await run_in_threadpool(model_registry.stop)
+    await run_in_threadpool(pending_worker.stop, True)
+    await run_in_threadpool(inference.close)
+    await async_engine.dispose()
 
 @app.post("/auth/login")
-def login(email: str = Query(...), password: str = Query(...), db: Session = Depends(get_db)):
+async def login(email: str = Query(...), password: str = Query(...), db: AsyncSession = Depends(get_db)):
     """
     Basic login. Returns user metadata (no password).
     Uses query parameters for email and password.
     """
-    user = db.query(User).filter(User.email == email, User.password == password).first()
+    user = await db.scalar(login_query(email, password).limit(1))
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    return {
-        "id": user.id,
-        "name": user.name,
-        "email": user.email,
-        "role": user.role,
-        "department_id": user.department_id,
-        "section_id": user.section_id,
-        "reports_to": user.reports_to,
-    }
+    return user_out(user)
 
 @app.post("/issues", response_model=IssueOut, status_code=201)
-def create_issue(payload: IssueCreate, db: Session = Depends(get_db)):
+async def create_issue(payload: IssueCreate, classify_later: bool = Query(False), check_duplicates: bool = Query(True), db: AsyncSession = Depends(get_db)):
     """
     Create an issue. Auto-classify and set priority using ML if available.
     Assign to student's direct manager (reports_to) if present; otherwise unassigned.
+    Classification runs in the worker pool, so it never blocks the event loop.
+    With classify_later=true the issue is stored with category/priority "pending" right
+    away and the background worker fills them in.
+    A near-duplicate of an open issue in the same section is stored with duplicate_of
+    set and the original's category, skipping classification; its priority is the
+    original's unless the new text's keywords (e.g. "fire") call for a higher one.
     """
-    student = db.query(User).filter(User.id == payload.student_id, User.role == "student").first()
-    if not student:
+    student = await org_cache.user(db, payload.student_id)
+    if not student or student.role != "student":
         raise HTTPException(status_code=404, detail="Student not found")
 
-    pred = predict_category_and_priority(payload.description)
-    category = pred["category"]
-    priority = pred["priority"]
+    original = text_row = None
+    if check_duplicates:
+        original, text_row = await duplicate_index.find(
+            db, student.department_id, student.section_id, payload.title, payload.description
+        )
+
+    version = None
+    if original is not None:
+        category, version = original.category, original.model_version
+        # With full confidence priority_for only says more than "low" on a keyword match.
+        keyword_priority = priority_for(payload.description, 1.0)
+        priority = original.priority
+        if keyword_priority != "low" and PRIORITY_RANK[keyword_priority] > PRIORITY_RANK.get(priority, -1):
+            priority = keyword_priority
+    elif classify_later:
+        category = priority = PENDING
+    else:
+        pred = await predict_category_and_priority_async(payload.description)
+        category = pred["category"]
+        priority = pred["priority"]
+        version = pred["model_version"]
 
     assignee_id = student.reports_to if student.reports_to else None
 
@@ -198,80 +423,181 @@ def create_issue(payload: IssueCreate, db: Session = Depends(get_db)):
         priority=priority,
         status="open",
         assigned_to=assignee_id,
-        created_at=datetime.utcnow()
+        created_at=datetime.utcnow(),
+        duplicate_of=original.id if original is not None else None,
+        model_version=version,
     )
-    db.add(issue)
-    db.commit()
-    db.refresh(issue)
+    issue = await save_and_refresh(db, issue)
+    if original is None:
+        duplicate_index.add(issue, text_row)
+    if category == PENDING:
+        pending_worker.notify()
     return issue
 
-@app.get("/issues", response_model=List[IssueOut])
-def list_issues(skip: int = 0, limit: int = 500, show_resolved: bool = True, db: Session = Depends(get_db)):
+@app.get("/issues", response_model=List[IssueExpanded], response_model_exclude_unset=True,
+         dependencies=[Depends(issue_lists_fresh)])
+async def list_issues(response: Response, cursor: Optional[str] = None, skip: int = 0, limit: int = Query(500, ge=1, le=1000), show_resolved: bool = True, expand: Tuple[str, ...] = Depends(expand_param), db: AsyncSession = Depends(get_db)):
     """
     Generic list of issues. By default includes resolved unless show_resolved=False.
     """
-    q = db.query(Issue)
-    if not show_resolved:
-        q = q.filter(Issue.status != "closed")
-    issues = q.order_by(Issue.created_at.desc()).offset(skip).limit(limit).all()
-    return issues
-
-@app.get("/issues/active", response_model=List[IssueOut])
-def list_active_issues(skip: int = 0, limit: int = 500, db: Session = Depends(get_db)):
-    return db.query(Issue).filter(Issue.status != "closed").order_by(Issue.created_at.desc()).offset(skip).limit(limit).all()
-
-@app.get("/issues/resolved", response_model=List[IssueOut])
-def list_resolved_issues(skip: int = 0, limit: int = 500, db: Session = Depends(get_db)):
-    return db.query(Issue).filter(Issue.status == "closed").order_by(Issue.created_at.desc()).offset(skip).limit(limit).all()
-
-@app.get("/issues/{issue_id}", response_model=IssueOut)
-def get_issue(issue_id: int, db: Session = Depends(get_db)):
-    issue = db.query(Issue).filter(Issue.id == issue_id).first()
+    return await paginate(db, issues_query(show_resolved=show_resolved), response, cursor, skip, limit, expand)
+
+@app.get("/issues/active", response_model=List[IssueExpanded], response_model_exclude_unset=True,
+         dependencies=[Depends(issue_lists_fresh)])
+async def list_active_issues(response: Response, cursor: Optional[str] = None, skip: int = 0, limit: int = Query(500, ge=1, le=1000), expand: Tuple[str, ...] = Depends(expand_param), db: AsyncSession = Depends(get_db)):
+    return await paginate(db, issues_query(show_resolved=False), response, cursor, skip, limit, expand)
+
+@app.get("/issues/resolved", response_model=List[IssueExpanded], response_model_exclude_unset=True,
+         dependencies=[Depends(issue_lists_fresh)])
+async def list_resolved_issues(response: Response, cursor: Optional[str] = None, skip: int = 0, limit: int = Query(500, ge=1, le=1000), expand: Tuple[str, ...] = Depends(expand_param), db: AsyncSession = Depends(get_db)):
+    return await paginate(db, issues_query(status="closed"), response, cursor, skip, limit, expand)
+
+# Declared before /issues/{issue_id}, which would otherwise capture "search" as an id.
+@app.get("/issues/search", response_model=List[IssueSearchHit], response_model_exclude_unset=True,
+         dependencies=[Depends(issue_lists_fresh)])
+async def search_issues(
+    q: Optional[str] = Query(None, description="Free text over title and description"),
+    title: Optional[str] = Query(None, description="Deprecated alias of q"),
+    prefix: bool = Query(True, description="Match the last word as a prefix"),
+    department_id: Optional[int] = Query(None),
+    status: Optional[str] = Query(None),
+    category: Optional[str] = Query(None),
+    user_id: Optional[int] = Query(None, description="Only issues this user may see"),
+    skip: int = 0,
+    limit: int = Query(50, ge=1, le=500),
+    expand: Tuple[str, ...] = Depends(expand_param),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Ranked full-text search (see search.py). Hits come best first with score,
+    title_highlight and snippet (escaped HTML with <mark> around the matches); page with
+    skip/limit. Without search text this is a filtered newest-first listing; text with
+    no words in it is a 400.
+    """
+    user = None
+    if user_id is not None:
+        user = await org_cache.user(db, user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+    try:
+        stmt = search_query(async_engine.dialect.name, q or title, prefix=prefix, department_id=department_id,
+                            status=status, category=category, user=user)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if expand:
+        stmt = stmt.options(*expand_options(expand))
+    hits = []
+    for issue, score, title_highlight, snippet in (await db.execute(stmt.offset(skip).limit(limit))).all():
+        hit = expanded(issue, expand) if expand else issue_payload(issue)
+        hits.append({**hit, "score": score, "title_highlight": marked_html(title_highlight),
+                     "snippet": marked_html(snippet)})
+    return hits
+
+@app.get("/issues/{issue_id}", response_model=IssueExpanded, response_model_exclude_unset=True)
+async def get_issue(issue_id: int, response: Response, expand: Tuple[str, ...] = Depends(expand_param), if_none_match: Optional[str] = Header(None), db: AsyncSession = Depends(get_db)):
+    issue = await db.get(Issue, issue_id, options=expand_options(expand))
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
-    return issue
+    names = (await org_cache.get(db)).etag() if expand else None  # embedded names change with the org chart
+    check_not_modified(response, if_none_match, weak_etag(issue.id, issue.updated_at, expand, names))
+    return expanded(issue, expand)
+
+@app.get("/issues/{issue_id}/duplicates", response_model=List[IssueExpanded], response_model_exclude_unset=True,
+         dependencies=[Depends(issue_lists_fresh)])
+async def list_duplicates(issue_id: int, response: Response, cursor: Optional[str] = None, skip: int = 0, limit: int = Query(500, ge=1, le=1000), expand: Tuple[str, ...] = Depends(expand_param), db: AsyncSession = Depends(get_db)):
+    """Issues flagged at submission as near-duplicates of this one, newest first."""
+    if not await db.get(Issue, issue_id):
+        raise HTTPException(status_code=404, detail="Issue not found")
+    return await paginate(db, duplicates_query(issue_id), response, cursor, skip, limit, expand)
 
 @app.post("/issues/{issue_id}/classify", response_model=IssueOut)
-def classify_issue(issue_id: int, db: Session = Depends(get_db)):
+async def classify_issue(issue_id: int, db: AsyncSession = Depends(get_db)):
     """
-    Re-classify an existing issue using the ML model and update priority.
+    Re-classify an existing issue using the ML model and update priority. 503 (issue left
+    unchanged) if the classifier couldn't run, e.g. it timed out or is overloaded.
     """
-    issue = db.query(Issue).filter(Issue.id == issue_id).first()
+    issue = await db.get(Issue, issue_id)
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
-    pred = predict_category_and_priority(issue.description)
+    pred = await predict_category_and_priority_async(issue.description)
+    if pred["model_version"] is None:
+        raise HTTPException(status_code=503, detail="Classifier unavailable; issue left unchanged")
     issue.category = pred["category"]
     issue.priority = pred["priority"]
-    db.add(issue)
-    db.commit()
-    db.refresh(issue)
-    return issue
+    issue.model_version = pred["model_version"]
+    return await save_and_refresh(db, issue)
+
+@app.get("/model")
+async def model_status():
+    """
+    Active classifier version, when it was activated, the last failed load (if any) and
+    the registered versions, newest first (see model_registry.py).
+    """
+    return await run_in_threadpool(model_registry.status)
+
+@app.get("/classification/status")
+async def classification_status():
+    """Number of issues still waiting for background classification."""
+    return {
+        "pending": await run_in_threadpool(pending_worker.pending_count),
+        "processed": pending_worker.processed,
+        "classifier_loaded": inference.available,
+        "model_version": inference.version,
+    }
+
+@app.post("/classification/flush")
+async def classification_flush():
+    """
+    Classify every pending issue now (e.g. before a deploy). Returns {updated, unclassified,
+    error, pending}; issues the classifier couldn't handle stay pending.
+    """
+    result = await run_in_threadpool(pending_worker.flush)
+    return {**result, "pending": await run_in_threadpool(pending_worker.pending_count)}
 
 @app.post("/issues/{issue_id}/forward", response_model=IssueOut)
-def forward_issue(issue_id: int, by_user_id: int = Query(...), db: Session = Depends(get_db)):
+async def forward_issue(issue_id: int, by_user_id: int = Query(...), db: AsyncSession = Depends(get_db)):
     """
     Forward/escalate the issue. `by_user_id` is the id of the user performing the forward.
     """
-    issue = db.query(Issue).filter(Issue.id == issue_id).first()
+    issue = await db.get(Issue, issue_id)
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
-    user = db.query(User).filter(User.id == by_user_id).first()
+    user = await org_cache.user(db, by_user_id)
     if not user:
         raise HTTPException(status_code=404, detail="Forwarding user not found")
-    updated = escalate_issue_to_next(db, issue, by_user_id=by_user_id)
+    updated = await escalate_issue_to_next(db, issue, by_user_id=by_user_id)
     return updated
 
+@app.post("/issues/{issue_id}/escalate", response_model=IssueOut)
+async def jump_escalate_issue(
+    issue_id: int,
+    by_user_id: int = Query(...),
+    to_role: str = Query(..., regex="^(proctor|hod|vc)$"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Escalate the issue directly to the given level (e.g. to_role=vc pulls it up to the VC),
+    skipping the intermediate forwards.
+    """
+    issue = await db.get(Issue, issue_id)
+    if not issue:
+        raise HTTPException(status_code=404, detail="Issue not found")
+    user = await org_cache.user(db, by_user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="Escalating user not found")
+    return await escalate_issue_to_role(db, issue, by_user_id=by_user_id, to_role=to_role)
+
 @app.post("/issues/{issue_id}/verify", response_model=IssueOut)
-def verify_issue(issue_id: int, verifier_id: int = Query(...), resolved: bool = Query(True), db: Session = Depends(get_db)):
+async def verify_issue(issue_id: int, verifier_id: int = Query(...), resolved: bool = Query(True), db: AsyncSession = Depends(get_db)):
     """
     Mark issue as verified by verifier (proctor/HOD/VC).
     If resolved=True -> status becomes 'closed', set verified_by and verified_at.
     If resolved=False -> escalate automatically.
     """
-    issue = db.query(Issue).filter(Issue.id == issue_id).first()
+    issue = await db.get(Issue, issue_id)
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
-    verifier = db.query(User).filter(User.id == verifier_id).first()
+    verifier = await org_cache.user(db, verifier_id)
     if not verifier:
         raise HTTPException(status_code=404, detail="Verifier not found")
 
@@ -282,35 +608,59 @@ def verify_issue(issue_id: int, verifier_id: int = Query(...), resolved: bool =
         issue.status = "closed"
     else:
         try:
-            issue = escalate_issue_to_next(db, issue, by_user_id=verifier_id)
+            issue = await escalate_issue_to_next(db, issue, by_user_id=verifier_id)
             return issue
         except HTTPException:
             issue.status = "open"
 
-    db.add(issue)
-    db.commit()
-    db.refresh(issue)
-    return issue
+    return await save_and_refresh(db, issue)
+
+@app.post("/issues/bulk", response_model=List[IssueBulkResult])
+async def bulk_issue_action(payload: IssueBulkAction, db: AsyncSession = Depends(get_db)):
+    """
+    Resolve, forward or assign many issues at once. Issues the acting user cannot see,
+    already-closed issues and issues with nobody to escalate to are reported per id
+    with ok=false; the rest are updated together in one transaction.
+    """
+    if not payload.issue_ids:
+        return []
+    if len(payload.issue_ids) > BULK_MAX_ISSUES:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_MAX_ISSUES} issues per request")
+    actor = await org_cache.user(db, payload.by_user_id)
+    if not actor:
+        raise HTTPException(status_code=404, detail="Acting user not found")
+    if payload.action == "assign":
+        if not payload.assignee_id:
+            raise HTTPException(status_code=400, detail="assignee_id is required for action=assign")
+        if not await org_cache.user(db, payload.assignee_id):
+            raise HTTPException(status_code=404, detail="Assignee not found")
+    org = await org_cache.get(db)
+
+    results = await db.run_sync(
+        lambda session: apply_bulk_action(
+            session, org, actor, payload.action, payload.issue_ids, assignee_id=payload.assignee_id
+        )
+    )
+    await db.commit()
+    return results
 
 @app.post("/users/{user_id}/assign_issue/{issue_id}", response_model=IssueOut)
-def assign_issue_to_user(user_id: int, issue_id: int, assigner_id: Optional[int] = Query(None), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.id == user_id).first()
+async def assign_issue_to_user(user_id: int, issue_id: int, assigner_id: Optional[int] = Query(None), db: AsyncSession = Depends(get_db)):
+    user = await org_cache.user(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    issue = db.query(Issue).filter(Issue.id == issue_id).first()
+    issue = await db.get(Issue, issue_id)
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
     issue.assigned_to = user_id
     issue.status = "assigned"
     if assigner_id:
         issue.forwarded_by = assigner_id
-    db.add(issue)
-    db.commit()
-    db.refresh(issue)
-    return issue
+    return await save_and_refresh(db, issue)
 
-@app.get("/issues/for_user/{user_id}", response_model=List[IssueOut])
-def issues_for_user(user_id: int, show_resolved: bool = Query(False), skip: int = 0, limit: int = 500, db: Session = Depends(get_db)):
+@app.get("/issues/for_user/{user_id}", response_model=List[IssueExpanded], response_model_exclude_unset=True,
+         dependencies=[Depends(issue_lists_fresh)])
+async def issues_for_user(user_id: int, response: Response, show_resolved: bool = Query(False), cursor: Optional[str] = None, skip: int = 0, limit: int = Query(500, ge=1, le=1000), expand: Tuple[str, ...] = Depends(expand_param), db: AsyncSession = Depends(get_db)):
     """
     Returns issues visible to the user depending on role.
     Default: hide resolved issues (show_resolved=False).
@@ -320,136 +670,333 @@ def issues_for_user(user_id: int, show_resolved: bool = Query(False), skip: int
       - hod: sees issues in their department
       - vc: sees issues assigned to VC (escalated to VC)
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await org_cache.user(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    q = db.query(Issue)
-    if user.role == "student":
-        q = q.filter(Issue.student_id == user_id)
-    elif user.role == "proctor":
-        # proctor sees assigned to them OR issues from their section
-        if user.section_id:
-            q = q.filter(or_(Issue.assigned_to == user_id, Issue.section_id == user.section_id))
-        else:
-            q = q.filter(Issue.assigned_to == user_id)
-    elif user.role == "hod":
-        if user.department_id:
-            q = q.filter(Issue.department_id == user.department_id)
-        else:
-            q = q.filter(False)  # no dept -> nothing
-    elif user.role == "vc":
-        q = q.filter(Issue.assigned_to == user_id)
-    else:
-        q = q.filter(False)
+    return await paginate(db, issues_for_user_query(user, show_resolved=show_resolved), response, cursor, skip, limit, expand)
 
-    if not show_resolved:
-        q = q.filter(Issue.status != "closed")
+@app.get("/dashboard/{user_id}", dependencies=[Depends(issue_lists_fresh)])
+async def get_dashboard(user_id: int, resolved_limit: int = Query(DASHBOARD_RESOLVED_LIMIT, ge=0, le=1000), db: AsyncSession = Depends(get_db)):
+    """
+    Everything a role dashboard needs in one payload: active, escalated-by-me and resolved
+    issues (with names), the user's direct reports, counts and a delta-sync watermark.
+    `truncated` is true when a list was cut at its limit (the counts are still complete).
+    """
+    user = await org_cache.user(db, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return await build_dashboard(db, await org_cache.get(db), user, resolved_limit=resolved_limit)
 
-    issues = q.order_by(Issue.created_at.desc()).offset(skip).limit(limit).all()
-    return issues
+@app.get("/issues/for_user/{user_id}/changes", response_model=IssueChanges)
+async def issue_changes_for_user(user_id: int, since: Optional[str] = Query(None), db: AsyncSession = Depends(get_db)):
+    """
+    Issues visible to the user that changed after `since` (the watermark returned by the
+    previous call; omit it for a full listing). Call again with the new watermark while
+    has_more is true. reset=true means the watermark was too old: replace the local cache.
+    """
+    user = await org_cache.user(db, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    try:
+        return await collect_changes(db, user, since)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid watermark")
 
-@app.get("/issues/search", response_model=List[IssueOut])
-def search_issues(title: Optional[str] = Query(None), department_id: Optional[int] = Query(None), db: Session = Depends(get_db), skip: int = 0, limit: int = 500):
-    q = db.query(Issue)
-    if title:
-        # simple case-insensitive partial match
-        pattern = f"%{title}%"
-        q = q.filter(Issue.title.ilike(pattern))
-    if department_id:
-        q = q.filter(Issue.department_id == department_id)
-    return q.order_by(Issue.created_at.desc()).offset(skip).limit(limit).all()
+@app.get("/events/issues")
+async def issue_events(user_id: int = Query(...), db: AsyncSession = Depends(get_db)):
+    """
+    Server-Sent Events stream of changes to the issues `user_id` can see. Each event's
+    data is the issue as JSON (IssueOut fields); "removed" carries only the id and
+    "resync" means events were dropped and the client should reload its lists.
+    """
+    user = await org_cache.user(db, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    await db.close()  # the stream is long-lived; don't hold a pooled connection
+
+    async def stream():
+        sub = issue_broker.subscribe(user)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                message = await sub.next(timeout=SSE_KEEPALIVE_S)
+                yield message if message is not None else ": keepalive\n\n"
+        finally:
+            issue_broker.unsubscribe(sub)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @app.get("/users")
-def list_users(db: Session = Depends(get_db)):
-    users = db.query(User).all()
-    return [
-        {
-            "id": u.id,
-            "name": u.name,
-            "email": u.email,
-            "role": u.role,
-            "department_id": u.department_id,
-            "section_id": u.section_id,
-            "reports_to": u.reports_to,
-        }
-        for u in users
-    ]
+async def list_users(
+    response: Response,
+    role: Optional[str] = None,
+    department_id: Optional[int] = None,
+    section_id: Optional[int] = None,
+    reports_to: Optional[int] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated subset of: " + ",".join(USER_FIELDS)),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=5000),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    User directory in id order, filtered by role / department / section / manager and
+    projected to `fields` (id is always included). Without `limit` every matching user
+    is returned; with it the result is keyset-paginated and the next page's cursor
+    comes back in the X-Next-Cursor header.
+    """
+    try:
+        stmt = users_query(parse_fields(fields), role=role, department_id=department_id,
+                           section_id=section_id, reports_to=reports_to)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if cursor:
+        try:
+            stmt = after_user_cursor(stmt, cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    if limit is None:
+        return [dict(row._mapping) for row in (await db.execute(stmt)).all()]
+    rows = (await db.execute(stmt.limit(limit + 1))).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_user_cursor(rows[-1].id)
+    return [dict(row._mapping) for row in rows]
+
+@app.get("/users/names")
+async def user_names(
+    response: Response,
+    ids: Optional[str] = Query(None, description="Comma-separated user ids"),
+    role: Optional[str] = None,
+    department_id: Optional[int] = None,
+    section_id: Optional[int] = None,
+    reports_to: Optional[int] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Compact {id: name} map from the org chart cache, with the same filters as /users
+    plus ids=. The ETag only changes with the org chart; send it back in If-None-Match
+    to get an empty 304.
+    """
+    org = await org_cache.get(db)
+    check_not_modified(response, if_none_match, org.etag())
+    try:
+        wanted = {int(i) for i in ids.split(",") if i.strip()} if ids else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    names = {
+        u.id: u.name
+        for u in org.users.values()
+        if (wanted is None or u.id in wanted)
+        and (not role or u.role == role)
+        and (not department_id or u.department_id == department_id)
+        and (not section_id or u.section_id == section_id)
+        and (not reports_to or u.reports_to == reports_to)
+    }
+    return names
 
 @app.get("/users/{user_id}")
-def get_user(user_id: int, db: Session = Depends(get_db)):
-    u = db.query(User).filter(User.id == user_id).first()
+async def get_user(user_id: int, response: Response, if_none_match: Optional[str] = Header(None), db: AsyncSession = Depends(get_db)):
+    u = await db.get(User, user_id)
     if not u:
         raise HTTPException(status_code=404, detail="User not found")
-    return {
-        "id": u.id,
-        "name": u.name,
-        "email": u.email,
-        "role": u.role,
-        "department_id": u.department_id,
-        "section_id": u.section_id,
-        "reports_to": u.reports_to,
-    }
+    out = user_out(u)
+    check_not_modified(response, if_none_match, weak_etag(out))
+    return out
+
+@app.get("/users/{user_id}/escalation_path")
+async def get_escalation_path(user_id: int, db: AsyncSession = Depends(get_db)):
+    """Everyone an issue from this user escalates through, nearest first (ends at the VC)."""
+    if not await org_cache.user(db, user_id):
+        raise HTTPException(status_code=404, detail="User not found")
+    org = await org_cache.get(db)
+    return [
+        {"id": u.id, "name": u.name, "role": u.role, "level": level}
+        for level, u in enumerate((org.users[i] for i in org.escalation_path(user_id)), start=1)
+    ]
 
 @app.get("/departments/{dept_id}")
-def get_department(dept_id: int, db: Session = Depends(get_db)):
-    dept = db.query(Department).filter(Department.id == dept_id).first()
+async def get_department(dept_id: int, response: Response, if_none_match: Optional[str] = Header(None), db: AsyncSession = Depends(get_db)):
+    dept = await db.get(Department, dept_id)
     if not dept:
         raise HTTPException(status_code=404, detail="Department not found")
-    return {"id": dept.id, "name": dept.name}
+    out = {"id": dept.id, "name": dept.name}
+    check_not_modified(response, if_none_match, weak_etag(out), REFERENCE)
+    return out
 
 @app.get("/sections/{section_id}")
-def get_section(section_id: int, db: Session = Depends(get_db)):
-    section = db.query(Section).filter(Section.id == section_id).first()
+async def get_section(section_id: int, response: Response, if_none_match: Optional[str] = Header(None), db: AsyncSession = Depends(get_db)):
+    section = await db.get(Section, section_id)
     if not section:
         raise HTTPException(status_code=404, detail="Section not found")
-    return {"id": section.id, "name": section.name}
+    out = {"id": section.id, "name": section.name}
+    check_not_modified(response, if_none_match, weak_etag(out), REFERENCE)
+    return out
 
-@app.get("/admin/issues", response_model=List[IssueOut])
-def admin_list_issues(skip: int = 0, limit: int = 1000, status: Optional[str] = Query(None), department_id: Optional[int] = Query(None), db: Session = Depends(get_db)):
+@app.get("/admin/issues", response_model=List[IssueExpanded], response_model_exclude_unset=True,
+         dependencies=[Depends(issue_lists_fresh)])
+async def admin_list_issues(response: Response, cursor: Optional[str] = None, skip: int = 0, limit: int = Query(1000, ge=1, le=1000), status: Optional[str] = Query(None), department_id: Optional[int] = Query(None), expand: Tuple[str, ...] = Depends(expand_param), db: AsyncSession = Depends(get_db)):
     """
     Admin: list all issues with optional filters.
     """
-    q = db.query(Issue)
-    if status:
-        q = q.filter(Issue.status == status)
-    if department_id:
-        q = q.filter(Issue.department_id == department_id)
-    return q.order_by(Issue.created_at.desc()).offset(skip).limit(limit).all()
+    return await paginate(db, issues_query(status=status, department_id=department_id), response, cursor, skip, limit, expand)
+
+EXPORT_COLUMNS = list(IssueOut.__fields__)
+EXPORT_CHUNK = 1000
+
+def _export_value(v):
+    return v.isoformat() if isinstance(v, datetime) else v
 
-@app.get("/admin/stats")
-def admin_stats(db: Session = Depends(get_db)):
+async def stream_issue_rows(stmt, fmt: str):
+    """
+    Yield the export body chunk by chunk straight from a streaming DB cursor, so memory
+    stays flat and the first bytes go out before the query has finished.
+    """
+    async with async_engine.connect() as conn:
+        result = await conn.stream(stmt)
+        if fmt == "csv":
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            writer.writerow(EXPORT_COLUMNS)
+            yield buf.getvalue()
+        async for rows in result.mappings().partitions(EXPORT_CHUNK):
+            if fmt == "csv":
+                buf = io.StringIO()
+                writer = csv.writer(buf)
+                writer.writerows([_export_value(r[c]) for c in EXPORT_COLUMNS] for r in rows)
+                yield buf.getvalue()
+            else:
+                yield "".join(
+                    json.dumps({c: _export_value(r[c]) for c in EXPORT_COLUMNS}) + "\n" for r in rows
+                )
+
+@app.get("/admin/issues/export")
+async def admin_export_issues(format: str = Query("ndjson", regex="^(ndjson|csv)$"), status: Optional[str] = Query(None), department_id: Optional[int] = Query(None)):
     """
-    Return overall counts and per-department breakdown:
+    Admin: stream every issue matching the filters as NDJSON (one object per line) or CSV.
+    """
+    stmt = issues_query(status=status, department_id=department_id)
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"issues.{'csv' if format == 'csv' else 'ndjson'}"
+    return StreamingResponse(
+        stream_issue_rows(stmt, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@app.get("/admin/stats", dependencies=[Depends(issue_lists_fresh)])
+async def admin_stats(db: AsyncSession = Depends(get_db)):
+    """
+    Return overall counts and breakdowns, read from the issue_counters table (see stats.py):
     {
       total: n,
       active: n,
       resolved: n,
-      by_department: [{department_id, department_name, total, active, resolved}]
+      by_department: [{department_id, department_name, total, active, resolved}],
+      by_section: [{section_id, section_name, department_id, total, active, resolved}],
+      by_category: [{category, total, active, resolved}],
+      by_priority: [{priority, total, active, resolved}]
     }
     """
-    total = db.query(func.count(Issue.id)).scalar() or 0
-    active = db.query(func.count(Issue.id)).filter(Issue.status != "closed").scalar() or 0
-    resolved = db.query(func.count(Issue.id)).filter(Issue.status == "closed").scalar() or 0
-
-    # per-dept breakdown
-    depts = db.query(Department).all()
-    by_department = []
-    for d in depts:
-        dept_total = db.query(func.count(Issue.id)).filter(Issue.department_id == d.id).scalar() or 0
-        dept_active = db.query(func.count(Issue.id)).filter(Issue.department_id == d.id, Issue.status != "closed").scalar() or 0
-        dept_resolved = db.query(func.count(Issue.id)).filter(Issue.department_id == d.id, Issue.status == "closed").scalar() or 0
-        by_department.append({
-            "department_id": d.id,
-            "department_name": d.name,
-            "total": dept_total,
-            "active": dept_active,
-            "resolved": dept_resolved
-        })
+    return await db.run_sync(compute_stats)
+
+@app.post("/admin/stats/rebuild")
+async def admin_rebuild_stats(db: AsyncSession = Depends(get_db)):
+    """Admin: recompute the issue_counters table from the issues table."""
+    rows = await db.run_sync(rebuild_counters)
+    return {"counter_rows": rows}
+
+@app.get("/hotspots")
+async def list_hotspots(
+    response: Response,
+    department_id: Optional[int] = None,
+    min_recent: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Clusters of similar open complaints from the last hotspots run (see hotspots.py),
+    fastest-growing first: [{label, size, recent, department_id, section_id, category,
+    first_seen, last_seen, issue_ids, computed_at}]. Nothing is computed here.
+    """
+    computed_at = await db.scalar(select(func.max(IssueCluster.computed_at)))
+    check_not_modified(response, if_none_match, weak_etag(computed_at))
+    stmt = select(IssueCluster).where(IssueCluster.recent >= min_recent)
+    if department_id:
+        stmt = stmt.where(IssueCluster.department_id == department_id)
+    stmt = stmt.order_by(IssueCluster.recent.desc(), IssueCluster.size.desc()).limit(limit)
+    return [
+        {
+            "id": c.id,
+            "label": c.label,
+            "size": c.size,
+            "recent": c.recent,
+            "department_id": c.department_id,
+            "section_id": c.section_id,
+            "category": c.category,
+            "first_seen": c.first_seen,
+            "last_seen": c.last_seen,
+            "issue_ids": [int(i) for i in c.issue_ids.split(",") if i],
+            "computed_at": c.computed_at,
+        }
+        for c in (await db.scalars(stmt)).all()
+    ]
+
+def _compute_hotspots(vectorizer, window_hours: float) -> Dict:
+    db = SessionLocal()
+    try:
+        return compute_hotspots(db, vectorizer, window_hours=window_hours)
+    finally:
+        db.close()
+
+@app.post("/admin/hotspots/rebuild")
+async def admin_rebuild_hotspots(window_hours: float = Query(168, gt=0, le=24 * 365)):
+    """
+    Admin: recluster the open issues of the last window_hours into issue_clusters
+    (normally run offline: python hotspots.py). Returns {issues, clusters, seconds}.
+    """
+    vectorizer = await duplicate_index.load()
+    if vectorizer is None:
+        raise HTTPException(status_code=503, detail="Classifier not loaded")
+    return await run_in_threadpool(_compute_hotspots, vectorizer, window_hours)
+
+@app.post("/admin/model/reload")
+async def admin_reload_model():
+    """Admin: check category_pipe.pkl for a new version now instead of at the next poll."""
+    swapped = await run_in_threadpool(model_registry.check)
+    return {"swapped": swapped, **await run_in_threadpool(model_registry.status)}
+
+@app.post("/admin/model/activate")
+async def admin_activate_model(version: str = Query(...)):
+    """Admin: switch to a registered model version, e.g. roll back to the previous one."""
+    try:
+        return await run_in_threadpool(model_registry.activate, version)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Model version not found")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Could not load model {version}: {e}")
 
-    return {
-        "total": total,
-        "active": active,
-        "resolved": resolved,
-        "by_department": by_department
-    }
\ No newline at end of file
+def _reclassify_all(chunk_size: int) -> Dict:
+    db = SessionLocal()
+    try:
+        return reclassify_issues(db, inference.predict_many, chunk_size=chunk_size)
+    finally:
+        db.close()
+
+@app.post("/admin/reclassify")
+async def admin_reclassify(chunk_size: int = Query(1000, ge=1, le=10000)):
+    """
+    Admin: re-classify every issue with the currently loaded model, e.g. after shipping
+    a new category_pipe.pkl. Returns {processed, changed, skipped, error, seconds,
+    per_second}; texts the classifier couldn't handle are skipped, never overwritten.
+    Runs on the sync engine in the threadpool since it is a long batch job.
+    """
+    if not inference.available:
+        raise HTTPException(status_code=503, detail="Classifier not loaded")
+    return await run_in_threadpool(_reclassify_all, chunk_size)
@@ -0,0 +1,206 @@
+"""
+Bring an existing data/issue_manager.db (or DATABASE_URL) up to the current schema.
+
+Usage: python migrate_db.py [--explain]
+
+`create_all` only creates missing tables, so new columns and indexes on
+existing tables are applied here. main.py runs `migrate` on startup as well.
+
+Planner statistics are refreshed on every run (see refresh_stats) rather than
+frozen when the indexes are created.
+
+--explain runs EXPLAIN QUERY PLAN for every listing/login/search query shape and
+exits non-zero if any of them still scans the issues table.
+"""
+
+import os
+import sys
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict, List
+
+from sqlalchemy import inspect, text
+
+from models import Base, Issue, IssueTombstone, User
+from queries import issues_for_user_query, issues_query, login_query, users_query
+from search import ensure_search_index, fts_query, match_expression
+from storage import create_storage_engine
+from sync import changes_query, encode_watermark
+
+DB_DIR = "data"
+DB_FILE = "issue_manager.db"
+DB_PATH = os.getenv("DATABASE_URL", f"sqlite:///{os.path.join(os.getcwd(), DB_DIR, DB_FILE)}")
+
+
+# Fill a newly added column from existing data: {(table, column): UPDATE statement}
+BACKFILLS = {
+    ("issues", "updated_at"): "UPDATE issues SET updated_at = COALESCE(verified_at, created_at)",
+}
+
+
+def ensure_columns(engine) -> List[str]:
+    """Add any column declared on the models that an existing table lacks."""
+    added = []
+    insp = inspect(engine)
+    for table in (User.__table__, Issue.__table__, IssueTombstone.__table__):
+        existing = {col["name"] for col in insp.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            with engine.begin() as conn:
+                col_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}"))
+                backfill = BACKFILLS.get((table.name, column.name))
+                if backfill:
+                    conn.execute(text(backfill))
+            added.append(f"{table.name}.{column.name}")
+    return added
+
+
+# Below this many issues SQLite's default estimates already pick the right indexes.
+STATS_MIN_ROWS = 1000
+
+
+def ensure_indexes(engine) -> List[str]:
+    """
+    Create any index declared on the models that the database lacks, recreating one whose
+    columns changed. Planner statistics are left to refresh_stats.
+    """
+    created = []
+    insp = inspect(engine)
+    for table in (User.__table__, Issue.__table__, IssueTombstone.__table__):
+        existing = {ix["name"]: ix["column_names"] for ix in insp.get_indexes(table.name)}
+        for index in table.indexes:
+            columns = [col.name for col in index.columns]
+            if existing.get(index.name) == columns:
+                continue
+            if index.name in existing:
+                index.drop(bind=engine)
+            index.create(bind=engine)
+            created.append(index.name)
+    return created
+
+
+def refresh_stats(engine) -> List[str]:
+    """
+    Keep SQLite's planner statistics in step with the data instead of freezing them when
+    the indexes are created: an ANALYZE of a nearly empty issues table records 1-row
+    stats that make the planner walk the whole table once it holds real data. Below
+    STATS_MIN_ROWS issues the stats are dropped (the defaults plan well); above it they
+    are recomputed whenever the table has doubled or halved since the last ANALYZE.
+    PRAGMA optimize then covers the other tables. Runs on every startup.
+    """
+    if engine.dialect.name != "sqlite":
+        return []
+    with engine.begin() as conn:
+        rows = conn.execute(text("SELECT COUNT(*) FROM issues")).scalar() or 0
+        recorded = None
+        if conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")).first():
+            stat = conn.execute(text(
+                "SELECT stat FROM sqlite_stat1 WHERE tbl = 'issues' AND idx IS NOT NULL LIMIT 1"
+            )).scalar()
+            recorded = int(stat.split()[0]) if stat else None
+        changes = []
+        if rows < STATS_MIN_ROWS:
+            if recorded is not None:
+                conn.execute(text("DELETE FROM sqlite_stat1 WHERE tbl = 'issues'"))
+                changes.append("dropped issues planner stats")
+        elif recorded is None or not recorded / 2 <= rows <= recorded * 2:
+            conn.execute(text("ANALYZE issues"))
+            changes.append(f"analyzed issues ({rows} rows)")
+        if changes:
+            conn.execute(text("ANALYZE sqlite_master"))  # reload the stats into this connection
+        conn.execute(text("PRAGMA optimize"))
+    return changes
+
+
+def migrate(engine) -> List[str]:
+    """Apply all migration steps. Returns a description of each change made."""
+    Base.metadata.create_all(bind=engine)
+    changes = [f"added column {name}" for name in ensure_columns(engine)]
+    changes += [f"created index {name}" for name in ensure_indexes(engine)]
+    changes += [f"built search index {name}" for name in ensure_search_index(engine)]
+    return changes + refresh_stats(engine)
+
+
+def _query_shapes() -> Dict[str, object]:
+    student = SimpleNamespace(id=1, role="student", section_id=1, department_id=1)
+    proctor = SimpleNamespace(id=1, role="proctor", section_id=1, department_id=1)
+    hod = SimpleNamespace(id=1, role="hod", section_id=None, department_id=1)
+    vc = SimpleNamespace(id=1, role="vc", section_id=None, department_id=None)
+    shapes = {"login": login_query("a@univ.edu", "x")}
+    for user in (student, proctor, hod, vc):
+        shapes[f"for_user:{user.role}"] = issues_for_user_query(user, show_resolved=False)
+        shapes[f"for_user:{user.role}:all"] = issues_for_user_query(user, show_resolved=True)
+        shapes[f"changes:{user.role}"] = changes_query(user, encode_watermark(datetime(2024, 1, 1)))
+    shapes["issues"] = issues_query()
+    shapes["issues:active"] = issues_query(show_resolved=False)
+    shapes["issues:resolved"] = issues_query(status="closed")
+    shapes["admin:department"] = issues_query(department_id=1)
+    shapes["admin:status+department"] = issues_query(status="open", department_id=1)
+    shapes["search"] = fts_query(match_expression("wifi hostel"), status="open")
+    shapes["users:role"] = users_query(role="student")
+    shapes["users:reports_to"] = users_query(reports_to=1)
+    shapes["users:section"] = users_query(section_id=1)
+    shapes["users:department"] = users_query(department_id=1)
+    return shapes
+
+
+def explain(engine) -> Dict[str, List[str]]:
+    """EXPLAIN QUERY PLAN detail lines for every query shape."""
+    plans = {}
+    with engine.connect() as conn:
+        for name, stmt in _query_shapes().items():
+            sql = str(stmt.compile(engine, compile_kwargs={"literal_binds": True}))
+            rows = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()
+            plans[name] = [row[-1] for row in rows]
+    return plans
+
+
+# Shapes with no selective filter: the best plan walks ix_issues_created newest first
+# and stops after one page, so that walk (and only that one) is accepted for them.
+ORDERED_WALKS = {"issues", "issues:active"}
+
+
+def full_scans(plans: Dict[str, List[str]]) -> List[str]:
+    """
+    Query shapes whose plan scans a table: any SCAN of `issues` (with or without an index,
+    which is still a full index walk) except the newest-first walk of ORDERED_WALKS, and
+    any other table scanned without an index.
+    """
+    bad = []
+    for name, lines in plans.items():
+        for line in lines:
+            if line == "SCAN issues" or line.startswith("SCAN issues "):
+                ok = name in ORDERED_WALKS and line.startswith("SCAN issues USING INDEX ix_issues_created")
+            else:
+                # "SCAN issues_fts VIRTUAL TABLE INDEX ..." is an FTS index lookup, not a table scan.
+                ok = not line.startswith("SCAN") or "USING" in line or "VIRTUAL TABLE INDEX" in line
+            if not ok:
+                bad.append(name)
+                break
+    return bad
+
+
+if __name__ == "__main__":
+    if not os.path.exists(DB_DIR):
+        os.makedirs(DB_DIR)
+    engine = create_storage_engine(DB_PATH, echo=False)
+    changes = migrate(engine)
+    for change in changes:
+        print(f"  {change}")
+    print(f"✅ Migration complete ({len(changes)} changes)")
+
+    if "--explain" in sys.argv and engine.dialect.name != "sqlite":
+        print("--explain only supports SQLite")
+    elif "--explain" in sys.argv:
+        plans = explain(engine)
+        for name, lines in plans.items():
+            print(f"\n{name}")
+            for line in lines:
+                print(f"    {line}")
+        bad = full_scans(plans)
+        if bad:
+            print(f"\n❌ Full table scans: {', '.join(bad)}")
+            sys.exit(1)
+        print("\n✅ Every query shape uses an index")
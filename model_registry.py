@@ -0,0 +1,197 @@
+"""
+Versioned registry for the issue classifier, with hot reload.
+
+A model version is the first 12 hex digits of the SHA-1 of a category_pipe.pkl.
+Each version is exported once into MODEL_REGISTRY_DIR as
+category_pipe-<version>.pkl, in the memory-mappable layout of model_store.py,
+and restarts reuse that snapshot. The file a worker process loads therefore
+never changes under it, and earlier versions stay available for rollback. The
+newest MODEL_KEEP_VERSIONS snapshots are kept.
+
+A watcher thread stats MODEL_PATH every MODEL_POLL_S seconds. When the file's
+size or mtime changes and its content is a new version, the new model is
+snapshotted, loaded and warmed with one prediction in the background. That
+happens inside a fresh worker pool when CLASSIFY_WORKERS > 0. Only after that
+is it swapped into the inference engine, so requests keep using the previous
+version until the swap and nobody pays for a cold start. A file that fails to
+load or predict is ignored, and the failure is reported in
+`status()["last_error"]`.
+
+To deploy, write the new model next to MODEL_PATH and rename it into place.
+A half-written file fails to load, and it is retried when it changes again.
+
+At startup `check(warm=False)` only registers the current version, and main.py
+loads the model in the background (InferenceEngine.warm_up) while requests are
+already served (MODEL_LAZY_LOAD).
+
+Subscribers (the duplicate index) are called after every swap. Classified
+issues store the version that produced their category in issues.model_version.
+Activating an older snapshot (rollback) sticks until MODEL_PATH changes again.
+"""
+
+import glob
+import hashlib
+import os
+import shutil
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from inference import WARMUP_TEXT, InferenceEngine, classify_batch
+from model_store import export_model, load_model
+
+MODEL_POLL_S = float(os.getenv("MODEL_POLL_S", "10"))
+MODEL_REGISTRY_DIR = os.getenv("MODEL_REGISTRY_DIR", os.path.join("data", "models"))
+MODEL_KEEP_VERSIONS = int(os.getenv("MODEL_KEEP_VERSIONS", "5"))
+
+
+def model_version(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+class ModelRegistry:
+    def __init__(
+        self,
+        model_path: str,
+        engine: InferenceEngine,
+        registry_dir: str = MODEL_REGISTRY_DIR,
+        poll_interval: float = MODEL_POLL_S,
+        keep: int = MODEL_KEEP_VERSIONS,
+    ):
+        self.model_path = model_path
+        self.engine = engine
+        self.registry_dir = registry_dir
+        self.poll_interval = poll_interval
+        self.keep = max(1, keep)
+        self.activated_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self._stem, self._ext = os.path.splitext(os.path.basename(model_path))
+        self._seen: Optional[Tuple[int, int]] = None  # (mtime_ns, size) of model_path at the last check
+        self._listeners: List[Callable[[str, str], None]] = []
+        self._lock = threading.Lock()  # one load/swap at a time
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def version(self) -> Optional[str]:
+        return self.engine.version
+
+    def subscribe(self, callback: Callable[[str, str], None]):
+        """Call callback(version, snapshot path) after every swap."""
+        self._listeners.append(callback)
+
+    def snapshot_path(self, version: str) -> str:
+        return os.path.join(self.registry_dir, f"{self._stem}-{version}{self._ext}")
+
+    def versions(self) -> List[Dict]:
+        """Registered versions, newest first."""
+        paths = glob.glob(os.path.join(self.registry_dir, f"{self._stem}-*{self._ext}"))
+        out = []
+        for path in sorted(paths, key=os.path.getmtime, reverse=True):
+            version = os.path.basename(path)[len(self._stem) + 1:-len(self._ext) or None]
+            out.append({
+                "version": version,
+                "registered_at": datetime.utcfromtimestamp(os.path.getmtime(path)),
+                "active": version == self.version,
+            })
+        return out
+
+    def status(self) -> Dict:
+        return {
+            "version": self.version,
+            "activated_at": self.activated_at,
+            "available": self.engine.available,
+            "source": self.model_path,
+            "last_error": self.last_error,
+            "poll_interval_s": self.poll_interval,
+            "versions": self.versions(),
+        }
+
+    def check(self, warm: bool = True) -> bool:
+        """
+        Activate MODEL_PATH if it changed since the last check. True if a new version was
+        swapped in. With warm=False it is loaded on first use instead of before the swap.
+        """
+        try:
+            st = os.stat(self.model_path)
+        except OSError:
+            return False
+        seen = (st.st_mtime_ns, st.st_size)
+        if seen == self._seen:
+            return False
+        with self._lock:
+            self._seen = seen
+            try:
+                version, path = self._register()
+                if version == self.version:
+                    return False
+                self._activate(version, path, warm)
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                return False
+        return True
+
+    def activate(self, version: str) -> Dict:
+        """Switch to an already registered version (rollback). KeyError if it is unknown."""
+        path = self.snapshot_path(version)
+        if not os.path.exists(path):
+            raise KeyError(version)
+        with self._lock:
+            if version != self.version:
+                try:
+                    self._activate(version, path)
+                except Exception as e:
+                    self.last_error = f"{type(e).__name__}: {e}"
+                    raise
+        return self.status()
+
+    def _register(self) -> Tuple[str, str]:
+        """Export MODEL_PATH into the registry unless already there: (version, snapshot path)."""
+        os.makedirs(self.registry_dir, exist_ok=True)
+        # Hash a copy, not the source, so the version always matches the snapshot's content.
+        incoming = os.path.join(self.registry_dir, f".incoming-{os.getpid()}")
+        shutil.copyfile(self.model_path, incoming)
+        try:
+            version = model_version(incoming)
+            path = self.snapshot_path(version)
+            if not os.path.exists(path):
+                exported = f"{incoming}.export"
+                export_model(incoming, exported)
+                os.replace(exported, path)
+        finally:
+            os.remove(incoming)
+        return version, path
+
+    def _activate(self, version: str, path: str, warm: bool = True):
+        model = None
+        if warm and not self.engine.workers:
+            model = load_model(path)
+            classify_batch(model, [WARMUP_TEXT], version)  # fail here rather than on a request
+        self.engine.swap(model, path, version, warm=warm)
+        self.activated_at = datetime.utcnow()
+        self.last_error = None
+        for callback in self._listeners:
+            callback(version, path)
+        for old in self.versions()[self.keep:]:
+            if not old["active"]:
+                os.remove(self.snapshot_path(old["version"]))
+
+    def start(self):
+        if self.poll_interval > 0 and (self._thread is None or not self._thread.is_alive()):
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="model-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            self.check()
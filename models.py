@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import declarative_base, relationship
 from datetime import datetime
 
@@ -20,6 +20,14 @@ class Section(Base):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_email", "email"),  # login
+        Index("ix_users_role", "role"),  # VC fallback lookup, /users?role=
+        # /users directory filters; each keeps rows in id (rowid) order for the cursor.
+        Index("ix_users_reports_to", "reports_to"),
+        Index("ix_users_section", "section_id"),
+        Index("ix_users_department", "department_id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     email = Column(String, nullable=False)
@@ -34,6 +42,20 @@ class User(Base):
 
 class Issue(Base):
     __tablename__ = "issues"
+    # One composite index per listing shape (see queries.py); each ends in (created_at, id)
+    # so the newest-first ORDER BY is read straight off the index. status is not in the
+    # middle: listings filter on status != 'closed' or not at all, and an inequality there
+    # would break the ordering. Added to existing databases by migrate_db.py.
+    __table_args__ = (
+        Index("ix_issues_student_created", "student_id", "created_at", "id"),
+        Index("ix_issues_assigned_created", "assigned_to", "created_at", "id"),
+        Index("ix_issues_section_created", "section_id", "created_at", "id"),
+        Index("ix_issues_department_created", "department_id", "created_at", "id"),
+        Index("ix_issues_status_created", "status", "created_at", "id"),
+        Index("ix_issues_created", "created_at", "id"),
+        Index("ix_issues_updated", "updated_at", "id"),  # delta sync (sync.py)
+        Index("ix_issues_duplicate_of", "duplicate_of"),  # GET /issues/{id}/duplicates
+    )
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     description = Column(String, nullable=False)
@@ -45,13 +67,72 @@ class Issue(Base):
     status = Column(String, default="open") 
     assigned_to = Column(Integer, ForeignKey("users.id"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Bumped on every write (onupdate also covers core/bulk UPDATEs); the delta-sync watermark.
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     forwarded_by = Column(Integer, ForeignKey("users.id"), nullable=True) # This column existed
     verified_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     verified_at = Column(DateTime, nullable=True)
+    # Set at submission when the text near-duplicates an open issue in the same section (duplicates.py).
+    duplicate_of = Column(Integer, ForeignKey("issues.id"), nullable=True)
+    # Classifier version (model_registry.py) that set category/priority; null if never classified.
+    model_version = Column(String, nullable=True)
 
     student = relationship("User", foreign_keys=[student_id])
     assignee = relationship("User", foreign_keys=[assigned_to])
     verifier = relationship("User", foreign_keys=[verified_by])
     
-    forwarder = relationship("User", foreign_keys=[forwarded_by])
\ No newline at end of file
+    forwarder = relationship("User", foreign_keys=[forwarded_by])
+
+class IssueCounter(Base):
+    """
+    Materialized issue counts per (department, section, category, priority, status).
+    Missing department/section are stored as 0 and missing category/priority as ""
+    so the composite key never contains NULLs. Maintained by stats.py.
+    """
+    __tablename__ = "issue_counters"
+    department_id = Column(Integer, primary_key=True, default=0)
+    section_id = Column(Integer, primary_key=True, default=0)
+    category = Column(String, primary_key=True, default="")
+    priority = Column(String, primary_key=True, default="")
+    status = Column(String, primary_key=True, default="")
+    count = Column(Integer, nullable=False, default=0)
+
+class IssueVersion(Base):
+    """A single row whose version moves in every transaction that writes issues or their counters. See stats.py."""
+    __tablename__ = "issue_version"
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+class IssueCluster(Base):
+    """A hotspot: a group of similar open issues in one department, computed offline by hotspots.py."""
+    __tablename__ = "issue_clusters"
+    __table_args__ = (Index("ix_issue_clusters_department_size", "department_id", "size"),)
+    id = Column(Integer, primary_key=True)
+    computed_at = Column(DateTime, nullable=False)
+    window_start = Column(DateTime, nullable=False)
+    department_id = Column(Integer, ForeignKey("departments.id"), nullable=True)
+    section_id = Column(Integer, ForeignKey("sections.id"), nullable=True)  # most common section
+    category = Column(String, nullable=True)  # most common category
+    label = Column(String, nullable=False)  # top TF-IDF terms, comma-separated
+    size = Column(Integer, nullable=False)
+    recent = Column(Integer, nullable=False)  # issues from the last HOTSPOT_RECENT_H hours
+    first_seen = Column(DateTime, nullable=False)
+    last_seen = Column(DateTime, nullable=False)
+    issue_ids = Column(String, nullable=False)  # newest first, comma-separated sample
+
+class IssueTombstone(Base):
+    """
+    Issues that were deleted or moved to another student/assignee/section/department,
+    with the values they had before, so delta sync can tell the users who could see
+    them to drop them. See sync.py.
+    """
+    __tablename__ = "issue_tombstones"
+    __table_args__ = (Index("ix_issue_tombstones_deleted", "deleted_at"),)
+    id = Column(Integer, primary_key=True)
+    issue_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # when it was deleted or moved
+    student_id = Column(Integer)
+    assigned_to = Column(Integer)
+    section_id = Column(Integer)
+    department_id = Column(Integer)
@@ -0,0 +1,151 @@
+"""
+Background classification for issues created with POST /issues?classify_later=true.
+
+Such issues are stored immediately with category/priority set to PENDING. The
+worker wakes up when notified (or every `interval` seconds), pulls pending rows
+in id order, classifies each chunk with a single `predict_many` call and writes
+the results back in one transaction per chunk (plus the matching issue_counters
+deltas and issue events, since core updates skip the ORM flush hooks). Each
+UPDATE only applies while the issue is still pending, and the counter deltas
+use the status it returns, so an issue verified, forwarded or reclassified
+while the chunk was being predicted is left alone. The DB is the queue, so
+issues left pending by a restart are picked up on the next pass.
+A text the classifier couldn't handle (no model, pool failure, overload: the
+prediction has no model_version) stays pending and is retried on the next pass
+instead of being stored as the "other" fallback.
+"""
+
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import bindparam, func, update
+
+from events import issue_payload, record_issue_event
+from models import Issue
+from stats import apply_deltas, bump_issue_version, make_key
+
+PENDING = "pending"
+
+logger = logging.getLogger(__name__)
+
+_t = Issue.__table__
+# Classify one issue if it is still pending; returns the updated row (None if it no longer was).
+_CLASSIFY = (
+    update(_t)
+    .where(_t.c.id == bindparam("_id"), _t.c.category == PENDING)
+    .values(category=bindparam("_category"), priority=bindparam("_priority"),
+            model_version=bindparam("_model_version"), updated_at=bindparam("_updated_at"))
+    .returning(*_t.c)
+)
+
+
+class PendingClassificationWorker:
+    def __init__(
+        self,
+        session_factory,
+        predict_many: Callable[[List[str]], List[Dict]],
+        batch_size: int = 64,
+        interval: float = 2.0,
+    ):
+        self.session_factory = session_factory
+        self.predict_many = predict_many
+        self.batch_size = max(1, batch_size)
+        self.interval = interval
+        self.processed = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="pending-classifier", daemon=True)
+            self._thread.start()
+
+    def notify(self):
+        """Tell the worker a new pending issue is waiting."""
+        self._wake.set()
+
+    def stop(self, drain: bool = True):
+        """Stop the worker; with drain=True classify everything still pending first."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if drain:
+            self.flush()
+
+    def pending_count(self) -> int:
+        db = self.session_factory()
+        try:
+            return db.query(func.count(Issue.id)).filter(Issue.category == PENDING).scalar() or 0
+        finally:
+            db.close()
+
+    def flush(self) -> Dict:
+        """
+        Classify all currently pending issues. Returns {updated, unclassified, error}:
+        unclassified issues stay pending; error is set if the pass failed.
+        """
+        done = 0
+        unclassified = 0
+        error = None
+        with self._flush_lock:
+            db = self.session_factory()
+            try:
+                last_id = 0
+                while True:
+                    rows = (
+                        db.query(*Issue.__table__.c)
+                        .filter(Issue.category == PENDING, Issue.id > last_id)
+                        .order_by(Issue.id)
+                        .limit(self.batch_size)
+                        .all()
+                    )
+                    if not rows:
+                        break
+                    last_id = rows[-1].id
+                    db.rollback()  # end the read transaction; predicting can take a while
+                    preds = self.predict_many([r.description for r in rows])
+                    classified = [(r, p) for r, p in zip(rows, preds) if p["model_version"] is not None]
+                    unclassified += len(rows) - len(classified)
+                    if not classified:
+                        error = "classifier unavailable; issues left pending"
+                        break
+                    now = datetime.utcnow()
+                    deltas: Counter = Counter()
+                    for r, p in classified:
+                        row = db.execute(_CLASSIFY, {
+                            "_id": r.id, "_category": p["category"], "_priority": p["priority"],
+                            "_model_version": p["model_version"], "_updated_at": now,
+                        }).first()
+                        if row is None:
+                            continue  # changed since it was read; no longer pending
+                        deltas[make_key(row.department_id, row.section_id, PENDING, PENDING, row.status)] -= 1
+                        deltas[make_key(row.department_id, row.section_id, row.category, row.priority, row.status)] += 1
+                        record_issue_event(db, "updated", issue_payload(dict(row._mapping)))
+                        done += 1
+                    apply_deltas(db.connection(), deltas)
+                    bump_issue_version(db.connection())
+                    db.commit()
+            except Exception as e:
+                logger.exception("Background classification pass failed")
+                error = f"{type(e).__name__}: {e}"
+                db.rollback()
+            finally:
+                db.close()
+            self.processed += done
+        return {"updated": done, "unclassified": unclassified, "error": error}
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            self.flush()
@@ -0,0 +1,176 @@
+"""
+Issue query builders shared by the API endpoints and migrate_db.py's query plan check.
+
+Each role's visibility rule is expressed once here so the composite indexes in
+models.Issue can be checked against exactly the queries the endpoints run.
+Builders return 2.0-style `select()` statements, so the same SQL runs on the async
+request sessions and on the sync sessions used by scripts and background workers.
+"""
+
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import false, or_, select, tuple_
+from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import Select
+
+from models import Issue, User
+
+CLOSED = "closed"
+
+
+def visibility_filter(user, entity=Issue):
+    """
+    SQL condition for the issues `user` may see:
+      - student: their own issues
+      - proctor: issues assigned to them OR issues in their section
+      - hod: issues in their department
+      - vc: issues assigned to VC (escalated to VC)
+    `entity` may be any model with the same visibility columns (e.g. IssueTombstone).
+    """
+    if user.role == "student":
+        return entity.student_id == user.id
+    if user.role == "proctor":
+        if user.section_id:
+            return or_(entity.assigned_to == user.id, entity.section_id == user.section_id)
+        return entity.assigned_to == user.id
+    if user.role == "hod":
+        if user.department_id:
+            return entity.department_id == user.department_id
+        return false()  # no dept -> nothing
+    if user.role == "vc":
+        return entity.assigned_to == user.id
+    return false()
+
+
+def is_visible(user, issue) -> bool:
+    """`visibility_filter` evaluated in Python for one issue (a mapping of its columns)."""
+    if user.role == "student":
+        return issue.get("student_id") == user.id
+    if user.role == "proctor":
+        return issue.get("assigned_to") == user.id or bool(
+            user.section_id and issue.get("section_id") == user.section_id
+        )
+    if user.role == "hod":
+        return bool(user.department_id and issue.get("department_id") == user.department_id)
+    if user.role == "vc":
+        return issue.get("assigned_to") == user.id
+    return False
+
+
+def newest_first(stmt: Select) -> Select:
+    return stmt.order_by(Issue.created_at.desc(), Issue.id.desc())
+
+
+def encode_cursor(issue) -> str:
+    """Opaque keyset cursor pointing just past `issue` in newest-first order."""
+    raw = f"{issue.created_at.isoformat()}|{issue.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[datetime, int]:
+    """Inverse of encode_cursor. Raises ValueError for malformed tokens."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        created_at, issue_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(issue_id)
+    except Exception as e:
+        raise ValueError("invalid cursor") from e
+
+
+def after_cursor(stmt: Select, token: str) -> Select:
+    """Restrict a newest_first query to rows strictly after the cursor position."""
+    created_at, issue_id = decode_cursor(token)
+    return stmt.where(tuple_(Issue.created_at, Issue.id) < tuple_(created_at, issue_id))
+
+
+# expand= names -> Issue relationships; the embedded field is "<name>_name".
+EXPANSIONS = {
+    "student": Issue.student,
+    "assignee": Issue.assignee,
+    "forwarder": Issue.forwarder,
+    "verifier": Issue.verifier,
+}
+
+
+def parse_expand(expand: Optional[str]) -> Tuple[str, ...]:
+    """Split a comma-separated `expand` parameter. Raises ValueError for unknown names."""
+    names = tuple(dict.fromkeys(n.strip() for n in (expand or "").split(",") if n.strip()))
+    unknown = [n for n in names if n not in EXPANSIONS]
+    if unknown:
+        raise ValueError(f"unknown expand: {', '.join(unknown)}")
+    return names
+
+
+def expand_options(expand: Tuple[str, ...]) -> list:
+    """Loader options that fetch the related users' ids and names: one extra SELECT per relation, not per row."""
+    return [selectinload(EXPANSIONS[name]).load_only(User.id, User.name) for name in expand]
+
+
+def issues_for_user_query(user, show_resolved: bool = False) -> Select:
+    stmt = select(Issue).where(visibility_filter(user))
+    if not show_resolved:
+        stmt = stmt.where(Issue.status != CLOSED)
+    return newest_first(stmt)
+
+
+def duplicates_query(issue_id: int) -> Select:
+    return newest_first(select(Issue).where(Issue.duplicate_of == issue_id))
+
+
+def issues_query(status: Optional[str] = None, department_id: Optional[int] = None,
+                 show_resolved: bool = True) -> Select:
+    stmt = select(Issue)
+    if status:
+        stmt = stmt.where(Issue.status == status)
+    if department_id:
+        stmt = stmt.where(Issue.department_id == department_id)
+    if not show_resolved:
+        stmt = stmt.where(Issue.status != CLOSED)
+    return newest_first(stmt)
+
+
+USER_FIELDS = ("id", "name", "email", "role", "department_id", "section_id", "reports_to")
+
+
+def parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """Split a comma-separated `fields` projection (all USER_FIELDS when empty). Raises ValueError for unknown names."""
+    names = tuple(dict.fromkeys(n.strip() for n in (fields or "").split(",") if n.strip())) or USER_FIELDS
+    unknown = [n for n in names if n not in USER_FIELDS]
+    if unknown:
+        raise ValueError(f"unknown fields: {', '.join(unknown)}")
+    return names
+
+
+def users_query(fields: Tuple[str, ...] = USER_FIELDS, role: Optional[str] = None,
+                department_id: Optional[int] = None, section_id: Optional[int] = None,
+                reports_to: Optional[int] = None) -> Select:
+    """The user directory in id order, projected to `fields` (id is always selected: it is the cursor)."""
+    stmt = select(*(User.__table__.c[name] for name in dict.fromkeys(("id", *fields))))
+    if role:
+        stmt = stmt.where(User.role == role)
+    if department_id:
+        stmt = stmt.where(User.department_id == department_id)
+    if section_id:
+        stmt = stmt.where(User.section_id == section_id)
+    if reports_to:
+        stmt = stmt.where(User.reports_to == reports_to)
+    return stmt.order_by(User.id)
+
+
+def encode_user_cursor(user_id: int) -> str:
+    return base64.urlsafe_b64encode(str(user_id).encode()).decode().rstrip("=")
+
+
+def after_user_cursor(stmt: Select, token: str) -> Select:
+    """Restrict a users_query to ids after the cursor. Raises ValueError for malformed tokens."""
+    try:
+        user_id = int(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode())
+    except Exception as e:
+        raise ValueError("invalid cursor") from e
+    return stmt.where(User.id > user_id)
+
+
+def login_query(email: str, password: str) -> Select:
+    return select(User).where(User.email == email, User.password == password)
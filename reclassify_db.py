@@ -0,0 +1,173 @@
+"""
+Re-classify every stored issue with the current category_pipe.pkl.
+
+Usage: python reclassify_db.py [--chunk-size 1000]
+
+Issues are streamed in id order with keyset pagination (WHERE id > last_id),
+each chunk is classified with a single vectorized predict_proba, and only rows
+whose category/priority or model_version changed are written back with one
+executemany UPDATE, together with the matching issue_counters deltas and one
+issue event per row (bulk UPDATEs skip the ORM hooks; see events.py), so SSE
+subscribers and delta-sync clients see the new categories.
+
+Fallback predictions (no model_version: the model couldn't be loaded, the pool
+failed) are never written; they are counted as skipped, and the job stops if a
+whole chunk comes back unclassified. The same routine backs POST
+/admin/reclassify in main.py. The database is DATABASE_URL, as for main.py.
+"""
+
+import argparse
+import os
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+
+from events import issue_payload, record_issue_event
+from models import Issue
+from stats import apply_deltas, bump_issue_version, make_key
+
+DB_DIR = "data"
+DB_FILE = "issue_manager.db"
+DB_PATH = os.getenv("DATABASE_URL", f"sqlite:///{os.path.join(os.getcwd(), DB_DIR, DB_FILE)}")
+MODEL_PATH = os.path.join(os.getcwd(), "category_pipe.pkl")
+
+_bulk_update = (
+    update(Issue.__table__)
+    .where(Issue.__table__.c.id == bindparam("_id"))
+    .values(category=bindparam("_category"), priority=bindparam("_priority"),
+            model_version=bindparam("_model_version"), updated_at=bindparam("_updated_at"))
+)
+
+
+def reclassify_issues(
+    db: Session,
+    predict_many: Callable[[List[str]], List[Dict]],
+    chunk_size: int = 1000,
+    progress: Optional[Callable[[Dict], None]] = None,
+) -> Dict:
+    """
+    Re-classify all issues chunk by chunk. Returns
+    {processed, changed, skipped, error, seconds, per_second}.
+    """
+    chunk_size = max(1, chunk_size)
+    started = time.perf_counter()
+    last_id = 0
+    processed = 0
+    changed = 0
+    skipped = 0
+    error = None
+    while True:
+        rows = (
+            db.query(*Issue.__table__.c)
+            .filter(Issue.id > last_id)
+            .order_by(Issue.id)
+            .limit(chunk_size)
+            .all()
+        )
+        if not rows:
+            break
+        preds = predict_many([r.description for r in rows])
+        fallbacks = sum(1 for p in preds if p["model_version"] is None)
+        if fallbacks == len(rows):
+            error = "classifier unavailable; stopped without changing these issues"
+            skipped += fallbacks
+            break
+        now = datetime.utcnow()
+        params = []
+        events = []
+        deltas: Counter = Counter()
+        for r, p in zip(rows, preds):
+            if p["model_version"] is None:
+                continue
+            if (r.category, r.priority, r.model_version) == (p["category"], p["priority"], p["model_version"]):
+                continue
+            params.append({
+                "_id": r.id, "_category": p["category"], "_priority": p["priority"],
+                "_model_version": p["model_version"], "_updated_at": now,
+            })
+            events.append(issue_payload({
+                **r._mapping, "category": p["category"], "priority": p["priority"],
+                "model_version": p["model_version"], "updated_at": now,
+            }))
+            deltas[make_key(r.department_id, r.section_id, r.category, r.priority, r.status)] -= 1
+            deltas[make_key(r.department_id, r.section_id, p["category"], p["priority"], r.status)] += 1
+        if params:
+            db.execute(_bulk_update, params)
+            apply_deltas(db.connection(), deltas)
+            bump_issue_version(db.connection())
+            for payload in events:
+                record_issue_event(db, "updated", payload)
+            db.commit()
+        last_id = rows[-1].id
+        processed += len(rows)
+        changed += len(params)
+        skipped += fallbacks
+        if progress:
+            elapsed = time.perf_counter() - started
+            progress({
+                "processed": processed,
+                "changed": changed,
+                "seconds": elapsed,
+                "per_second": processed / elapsed if elapsed else 0.0,
+            })
+
+    elapsed = time.perf_counter() - started
+    return {
+        "processed": processed,
+        "changed": changed,
+        "skipped": skipped,
+        "error": error,
+        "seconds": round(elapsed, 3),
+        "per_second": round(processed / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def main():
+    import joblib
+    from sqlalchemy.orm import sessionmaker
+    from migrate_db import migrate
+    from inference import classify_batch
+    from model_registry import model_version
+    from storage import create_storage_engine
+
+    parser = argparse.ArgumentParser(description="Re-classify all issues with the current model")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    if not os.path.exists(MODEL_PATH):
+        print(f"Model not found at: {MODEL_PATH}")
+        return
+    model = joblib.load(MODEL_PATH)
+    version = model_version(MODEL_PATH)
+
+    engine = create_storage_engine(DB_PATH, echo=False)
+    migrate(engine)  # add the columns an older database lacks, as main.py does on startup
+    session = sessionmaker(bind=engine)()
+    try:
+        result = reclassify_issues(
+            session,
+            lambda texts: classify_batch(model, texts, version),
+            chunk_size=args.chunk_size,
+            progress=lambda p: print(
+                f"  {p['processed']} issues, {p['changed']} changed ({p['per_second']:.0f}/s)"
+            ),
+        )
+        if result["error"]:
+            print(f"❌ {result['error']}")
+        print(
+            f"✅ Re-classified {result['processed']} issues, {result['changed']} changed, "
+            f"{result['skipped']} skipped in {result['seconds']}s ({result['per_second']}/s)"
+        )
+    except Exception as e:
+        print(f"❌ Error during re-classification: {e}")
+        session.rollback()
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
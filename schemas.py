@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Literal, Optional
 from datetime import datetime
 
 class LoginRequest(BaseModel):
@@ -26,5 +26,41 @@ class IssueOut(BaseModel):
     priority: Optional[str]
     status: str
     created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    duplicate_of: Optional[int] = None
+    model_version: Optional[str] = None
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+class IssueExpanded(IssueOut):
+    # Filled only for the relations named in ?expand=; the others are left out of the response.
+    student_name: Optional[str] = None
+    assignee_name: Optional[str] = None
+    forwarder_name: Optional[str] = None
+    verifier_name: Optional[str] = None
+
+class IssueSearchHit(IssueExpanded):
+    score: Optional[float]  # BM25, lower is better; null for unranked (filter-only) results
+    title_highlight: str
+    snippet: Optional[str]
+
+class IssueBulkAction(BaseModel):
+    issue_ids: List[int]
+    action: Literal["resolve", "forward", "assign"]
+    by_user_id: int
+    assignee_id: Optional[int] = None
+
+class IssueBulkResult(BaseModel):
+    id: int
+    ok: bool
+    status: Optional[str]
+    assigned_to: Optional[int]
+    error: Optional[str]
+
+class IssueChanges(BaseModel):
+    watermark: str
+    has_more: bool
+    reset: bool
+    issues: List[IssueOut]
+    closed: List[int]
+    removed: List[int]
@@ -0,0 +1,150 @@
+"""
+Full-text issue search for GET /issues/search.
+
+On SQLite, title and description are indexed by an FTS5 table (`issues_fts`) that
+uses `issues` as its external content, so no text is stored twice. Triggers on
+`issues` keep it in sync for every write path: ORM sessions, bulk/core UPDATEs,
+reclassify_db.py, seed scripts. `ensure_search_index` creates the table and the
+triggers, and builds the index from existing rows. migrate_db.py runs it.
+
+Queries are free text. Every word must match, with porter stemming and
+diacritics folded. The last word is also matched as a prefix (search-as-you-type),
+as is any word written with a trailing `*`. Hits are ranked by BM25, with title
+matches weighted SEARCH_TITLE_WEIGHT times higher than description matches. Each
+hit carries the title with the matches marked and a snippet of the description,
+both HTML-escaped with only the <mark> tags left as markup (see `marked_html`).
+Department, status, category and visibility filters are applied on the joined
+`issues` row.
+
+Other databases fall back to a case-insensitive LIKE over title and description
+(no ranking). Search text without any word characters (e.g. "!!!") is rejected
+with ValueError rather than treated as no search text.
+"""
+
+import html
+import os
+import re
+from typing import List, Optional
+
+from sqlalchemy import column, func, literal, literal_column, or_, select, table, text
+from sqlalchemy.sql import Select
+
+from models import Issue
+from queries import newest_first, visibility_filter
+
+SEARCH_TITLE_WEIGHT = float(os.getenv("SEARCH_TITLE_WEIGHT", "5.0"))
+SEARCH_SNIPPET_TOKENS = int(os.getenv("SEARCH_SNIPPET_TOKENS", "16"))
+MARK_OPEN, MARK_CLOSE = "<mark>", "</mark>"
+# FTS marks matches with these private-use characters; marked_html swaps them for
+# MARK_OPEN/MARK_CLOSE after escaping the text around them.
+_OPEN, _CLOSE = "\ue000", "\ue001"
+
+issues_fts = table("issues_fts", column("rowid"))
+_FTS = literal_column("issues_fts")
+
+SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5("
+    "title, description, content='issues', content_rowid='id', "
+    "tokenize='porter unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS issues_fts_ai AFTER INSERT ON issues BEGIN "
+    "INSERT INTO issues_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS issues_fts_ad AFTER DELETE ON issues BEGIN "
+    "INSERT INTO issues_fts(issues_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS issues_fts_au AFTER UPDATE OF title, description ON issues BEGIN "
+    "INSERT INTO issues_fts(issues_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO issues_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+]
+
+_WORD = re.compile(r"(\w+)(\*?)")
+
+
+def fts_available(dialect_name: str) -> bool:
+    return dialect_name == "sqlite"
+
+
+def ensure_search_index(engine) -> List[str]:
+    """Create the FTS table and its triggers if missing (SQLite only); index existing issues."""
+    if not fts_available(engine.dialect.name):
+        return []
+    with engine.begin() as conn:
+        # Triggers go away with the issues table, so their absence also means a stale index.
+        if conn.execute(text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'issues_fts_ai'")).first():
+            return []
+        for ddl in SEARCH_DDL:
+            conn.execute(text(ddl))
+        conn.execute(text("INSERT INTO issues_fts(issues_fts) VALUES ('rebuild')"))
+    return ["issues_fts"]
+
+
+def match_expression(q: Optional[str], prefix: bool = True) -> Optional[str]:
+    """
+    FTS5 MATCH string for free text: each word quoted (so FTS operators in user input
+    are just words) and ANDed. None when `q` contains no words.
+    """
+    words = _WORD.findall((q or "").lower())
+    if not words:
+        return None
+    terms = [f'"{word}"*' if star else f'"{word}"' for word, star in words]
+    if prefix and not terms[-1].endswith("*"):
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _filtered(stmt: Select, department_id: Optional[int], status: Optional[str],
+              category: Optional[str], user) -> Select:
+    if department_id:
+        stmt = stmt.where(Issue.department_id == department_id)
+    if status:
+        stmt = stmt.where(Issue.status == status)
+    if category:
+        stmt = stmt.where(Issue.category == category)
+    if user is not None:
+        stmt = stmt.where(visibility_filter(user))
+    return stmt
+
+
+def fts_query(match: str, department_id: Optional[int] = None, status: Optional[str] = None,
+              category: Optional[str] = None, user=None) -> Select:
+    """(Issue, score, title_highlight, snippet) rows for `match`, best first (lower BM25 score is better)."""
+    score = func.bm25(_FTS, SEARCH_TITLE_WEIGHT, 1.0).label("score")
+    stmt = (
+        select(
+            Issue,
+            score,
+            func.highlight(_FTS, 0, _OPEN, _CLOSE).label("title_highlight"),
+            func.snippet(_FTS, 1, _OPEN, _CLOSE, "…", SEARCH_SNIPPET_TOKENS).label("snippet"),
+        )
+        .select_from(issues_fts)
+        .join(Issue, Issue.id == issues_fts.c.rowid)
+        .where(_FTS.op("MATCH")(match))
+    )
+    return _filtered(stmt, department_id, status, category, user).order_by(score, Issue.created_at.desc())
+
+
+def like_query(q: Optional[str] = None, department_id: Optional[int] = None, status: Optional[str] = None,
+               category: Optional[str] = None, user=None) -> Select:
+    """Same row shape as fts_query without an FTS index (or without search text), newest first."""
+    stmt = select(Issue, literal(None).label("score"), Issue.title.label("title_highlight"),
+                  func.substr(Issue.description, 1, 200).label("snippet"))
+    if q and q.strip():
+        pattern = f"%{q.strip()}%"
+        stmt = stmt.where(or_(Issue.title.ilike(pattern), Issue.description.ilike(pattern)))
+    return newest_first(_filtered(stmt, department_id, status, category, user))
+
+
+def marked_html(value: Optional[str]) -> Optional[str]:
+    """A title_highlight/snippet value as HTML: the text escaped, the matches in <mark> tags."""
+    if value is None:
+        return None
+    return html.escape(value).replace(_OPEN, MARK_OPEN).replace(_CLOSE, MARK_CLOSE)
+
+
+def search_query(dialect_name: str, q: Optional[str], prefix: bool = True, **filters) -> Select:
+    """Search rows for `q` (a filtered listing when `q` is blank). ValueError if `q` has no words."""
+    if q and q.strip() and not _WORD.search(q):
+        raise ValueError("Search text must contain at least one letter or digit")
+    match = match_expression(q, prefix) if fts_available(dialect_name) else None
+    if match is None:
+        # No FTS index, or nothing to match (filters only): plain filtered listing.
+        return like_query(q if not fts_available(dialect_name) else None, **filters)
+    return fts_query(match, **filters)
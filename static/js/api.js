@@ -4,6 +4,8 @@ class APIService {
     }
 
     async request(url, options = {}) {
+        const { includeCursor, ...fetchOptions } = options;
+        options = fetchOptions;
         const headers = {};
         if (options.body) {
             headers['Content-Type'] = 'application/json';
@@ -18,7 +20,7 @@ class APIService {
         };
 
         try {
-            console.log('API Request:', `${this.baseURL}${url}`, config);
+            if (API_CONFIG.DEBUG) console.log('API Request:', `${this.baseURL}${url}`, config);
             const response = await fetch(`${this.baseURL}${url}`, config);
             
             if (!response.ok) {
@@ -41,7 +43,10 @@ class APIService {
             }
             
             const data = await response.json();
-            console.log('API Response:', data);
+            if (API_CONFIG.DEBUG) console.log('API Response:', data);
+            if (includeCursor) {
+                return { items: data, nextCursor: response.headers.get('X-Next-Cursor') };
+            }
             return data;
         } catch (error) {
             console.error('API Error:', error);
@@ -58,6 +63,17 @@ class APIService {
         return this.request(fullUrl, { method: 'GET' });
     }
 
+    // Keyset-paginated GET: resolves to { items, nextCursor }; nextCursor is null on the last page.
+    async getPage(url, params = {}, cursor = null) {
+        const query = { ...params };
+        if (cursor) {
+            query.cursor = cursor;
+        }
+        const queryString = new URLSearchParams(query).toString();
+        const fullUrl = queryString ? `${url}?${queryString}` : url;
+        return this.request(fullUrl, { method: 'GET', includeCursor: true });
+    }
+
     async post(url, data = {}, params = {}) {
         const queryString = new URLSearchParams(params).toString();
         const fullUrl = queryString ? `${url}?${queryString}` : url;
@@ -76,8 +92,13 @@ class APIService {
         return this.post(API_CONFIG.ENDPOINTS.LOGIN, {}, { email, password });
     }
 
-    async getUsers() {
-        return this.get(API_CONFIG.ENDPOINTS.USERS);
+    async getUsers(params = {}) {
+        return this.get(API_CONFIG.ENDPOINTS.USERS, params);
+    }
+
+    // { id: name }; the response carries an ETag, so the browser cache revalidates it with a 304.
+    async getUserNames(params = {}) {
+        return this.get(API_CONFIG.ENDPOINTS.USER_NAMES, params);
     }
 
     async getUser(id) {
@@ -99,6 +120,25 @@ class APIService {
         );
     }
 
+    // One-call dashboard: { user, counts, active, escalated, resolved, team, watermark }.
+    async getDashboard(userId) {
+        return this.get(API_CONFIG.ENDPOINTS.DASHBOARD.replace('{id}', userId));
+    }
+
+    // Delta sync: resolves to { watermark, has_more, reset, issues, closed, removed }.
+    async getIssueChanges(userId, since = null) {
+        const params = since ? { since: since } : {};
+        return this.get(API_CONFIG.ENDPOINTS.ISSUE_CHANGES.replace('{id}', userId), params);
+    }
+
+    async getIssuesForUserPage(userId, showResolved = false, cursor = null, limit = 100) {
+        return this.getPage(
+            API_CONFIG.ENDPOINTS.ISSUES_FOR_USER.replace('{id}', userId),
+            { show_resolved: showResolved, limit: limit },
+            cursor
+        );
+    }
+
     async createIssue(data) {
         return this.post(API_CONFIG.ENDPOINTS.CREATE_ISSUE, data);
     }
@@ -111,6 +151,21 @@ class APIService {
         );
     }
 
+    async escalateIssue(issueId, byUserId, toRole) {
+        return this.post(
+            API_CONFIG.ENDPOINTS.ESCALATE_ISSUE.replace('{id}', issueId),
+            {},
+            { by_user_id: byUserId, to_role: toRole }
+        );
+    }
+
+    // action: 'resolve' | 'forward' | 'assign'; returns [{id, ok, status, assigned_to, error}]
+    async bulkIssueAction(issueIds, action, byUserId, assigneeId = null) {
+        const payload = { issue_ids: issueIds, action: action, by_user_id: byUserId };
+        if (assigneeId) payload.assignee_id = assigneeId;
+        return this.post(API_CONFIG.ENDPOINTS.BULK_ISSUES, payload);
+    }
+
     async verifyIssue(issueId, verifierId, resolved = true) {
         return this.post(
             API_CONFIG.ENDPOINTS.VERIFY_ISSUE.replace('{id}', issueId),
@@ -131,6 +186,15 @@ class APIService {
         return this.get(API_CONFIG.ENDPOINTS.ADMIN_ISSUES, params);
     }
 
+    async getAdminIssuesPage(params = {}, cursor = null) {
+        return this.getPage(API_CONFIG.ENDPOINTS.ADMIN_ISSUES, params, cursor);
+    }
+
+    exportIssuesURL(format = 'csv', params = {}) {
+        const queryString = new URLSearchParams({ ...params, format: format }).toString();
+        return `${this.baseURL}${API_CONFIG.ENDPOINTS.ADMIN_EXPORT}?${queryString}`;
+    }
+
     async getDepartment(id) {
         return this.get(API_CONFIG.ENDPOINTS.DEPARTMENT.replace('{id}', id));
     }
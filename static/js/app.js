@@ -125,6 +125,7 @@ class App {
     }
 
     handleLogout() {
+        liveIssues.close();
         auth.clearUser();
         this.showLogin();
         document.getElementById('login-form').reset();
@@ -189,6 +190,7 @@ class App {
 
         const page = router.getCurrentPage();
         const role = user.role.toLowerCase();
+        liveIssues.setListener(null);
 
         switch (page) {
             case 'dashboard':
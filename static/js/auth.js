@@ -32,9 +32,10 @@ class AuthService {
         return this.currentUser;
     }
 
+    // Only names are needed client-side (issue rows, team lists), so load the compact map.
     async loadUsersCache() {
         try {
-            this.usersCache = await api.getUsers();
+            this.usersCache = await api.getUserNames();
             return this.usersCache;
         } catch (error) {
             console.error('Failed to load users cache:', error);
@@ -43,8 +44,8 @@ class AuthService {
     }
 
     getUserById(id) {
-        if (!this.usersCache) return null;
-        return this.usersCache.find(u => u.id === id) || null;
+        if (!this.usersCache || !(id in this.usersCache)) return null;
+        return { id, name: this.usersCache[id] };
     }
 
     async getDepartmentName(id) {
@@ -4,21 +4,30 @@ const API_CONFIG = {
         LOGIN: '/auth/login',
         USERS: '/users',
         USER: '/users/{id}',
+        USER_NAMES: '/users/names',
         ISSUES: '/issues',
         ISSUE: '/issues/{id}',
         ISSUES_FOR_USER: '/issues/for_user/{id}',
+        DASHBOARD: '/dashboard/{id}',
+        ISSUE_EVENTS: '/events/issues',
+        ISSUE_CHANGES: '/issues/for_user/{id}/changes',
         CREATE_ISSUE: '/issues',
         FORWARD_ISSUE: '/issues/{id}/forward',
+        ESCALATE_ISSUE: '/issues/{id}/escalate',
+        BULK_ISSUES: '/issues/bulk',
         VERIFY_ISSUE: '/issues/{id}/verify',
         CLASSIFY_ISSUE: '/issues/{id}/classify',
         ADMIN_STATS: '/admin/stats',
         ADMIN_ISSUES: '/admin/issues',
+        ADMIN_EXPORT: '/admin/issues/export',
         DEPARTMENT: '/departments/{id}',
         SECTION: '/sections/{id}'
     },
     TIMEOUT: 10000,
     MAX_RETRIES: 3,
-    RETRY_DELAY: 1000
+    RETRY_DELAY: 1000,
+    // Log every request and response to the console.
+    DEBUG: false
 };
 
 (function() {
@@ -1,9 +1,11 @@
 class AdminDashboard {
+    static PAGE_SIZE = 200;
+
     static async render(container) {
         try {
-            const [stats, issues] = await Promise.all([
+            const [stats, page] = await Promise.all([
                 api.getAdminStats(),
-                api.getAdminIssues()
+                api.getAdminIssuesPage({ limit: this.PAGE_SIZE, expand: 'student' })
             ]);
 
             container.innerHTML = `
@@ -31,13 +33,39 @@ class AdminDashboard {
                 </div>
                 ` : ''}
 
+                ${stats.by_category && stats.by_category.length > 0 ? `
+                <div class="card">
+                    <div class="card-header">
+                        <h2 class="card-title">Category Breakdown</h2>
+                    </div>
+                    ${this.renderBreakdown(stats.by_category, 'category', 'Category')}
+                </div>
+                ` : ''}
+
+                ${stats.by_priority && stats.by_priority.length > 0 ? `
+                <div class="card">
+                    <div class="card-header">
+                        <h2 class="card-title">Priority Breakdown</h2>
+                    </div>
+                    ${this.renderBreakdown(stats.by_priority, 'priority', 'Priority')}
+                </div>
+                ` : ''}
+
                 <div class="card">
                     <div class="card-header">
                         <h2 class="card-title">All Issues</h2>
+                        <div>
+                            <a class="btn btn-secondary btn-sm" href="${api.exportIssuesURL('csv')}">Export CSV</a>
+                            <a class="btn btn-secondary btn-sm" href="${api.exportIssuesURL('ndjson')}">Export NDJSON</a>
+                        </div>
+                    </div>
+                    ${this.renderIssuesTable(page.items)}
+                    <div class="load-more" id="admin-load-more" style="display: ${page.nextCursor ? 'block' : 'none'}; text-align: center; margin-top: 1rem;">
+                        <button class="btn btn-secondary" id="admin-load-more-btn">Load more</button>
                     </div>
-                    ${this.renderIssuesTable(issues)}
                 </div>
             `;
+            this.setupLoadMore(container, page.nextCursor);
         } catch (error) {
             console.error('Error loading admin dashboard:', error);
             container.innerHTML = '<div class="error-message show">Failed to load dashboard</div>';
@@ -73,14 +101,64 @@ class AdminDashboard {
         `;
     }
 
-    static renderIssuesTable(issues) {
-        if (!issues || issues.length === 0) {
-            return '<div class="empty-state"><div class="empty-state-icon">📊</div><h3>No Issues</h3><p>No issues found in the system.</p></div>';
-        }
+    static renderBreakdown(items, key, label) {
+        const rows = items.map(item => `
+            <tr>
+                <td><strong>${item[key] || 'N/A'}</strong></td>
+                <td>${item.total}</td>
+                <td>${item.active}</td>
+                <td>${item.resolved}</td>
+            </tr>
+        `).join('');
+
+        return `
+            <div class="table-wrapper">
+                <table>
+                    <thead>
+                        <tr>
+                            <th>${label}</th>
+                            <th>Total</th>
+                            <th>Active</th>
+                            <th>Resolved</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                        ${rows}
+                    </tbody>
+                </table>
+            </div>
+        `;
+    }
+
+    static setupLoadMore(container, nextCursor) {
+        const wrapper = container.querySelector('#admin-load-more');
+        const button = container.querySelector('#admin-load-more-btn');
+        if (!wrapper || !button) return;
+
+        let cursor = nextCursor;
+        button.addEventListener('click', async () => {
+            button.disabled = true;
+            try {
+                const page = await api.getAdminIssuesPage({ limit: this.PAGE_SIZE, expand: 'student' }, cursor);
+                const tbody = container.querySelector('#admin-issues-body');
+                if (tbody) {
+                    tbody.insertAdjacentHTML('beforeend', this.renderIssueRows(page.items));
+                }
+                cursor = page.nextCursor;
+                wrapper.style.display = cursor ? 'block' : 'none';
+            } catch (error) {
+                console.error('Error loading more issues:', error);
+                showToast('Failed to load more issues', 'error');
+            } finally {
+                button.disabled = false;
+            }
+        });
+    }
 
-        const rows = issues.map(issue => {
+    static renderIssueRows(issues) {
+        return issues.map(issue => {
             const status = issue.status || 'open';
-            const raisedBy = auth.getUserById(issue.student_id)?.name || 'Unknown';
+            const raisedBy = issue.student_name || 'Unknown';
             
             return `
                 <tr>
@@ -92,6 +170,14 @@ class AdminDashboard {
                 </tr>
             `;
         }).join('');
+    }
+
+    static renderIssuesTable(issues) {
+        if (!issues || issues.length === 0) {
+            return '<div class="empty-state"><div class="empty-state-icon">📊</div><h3>No Issues</h3><p>No issues found in the system.</p></div>';
+        }
+
+        const rows = this.renderIssueRows(issues);
 
         return `
             <div class="table-wrapper">
@@ -105,7 +191,7 @@ class AdminDashboard {
                             <th>Created At</th>
                         </tr>
                     </thead>
-                    <tbody>
+                    <tbody id="admin-issues-body">
                         ${rows}
                     </tbody>
                 </table>
@@ -4,64 +4,70 @@ class HODDashboard {
         if (!user) return;
 
         try {
-            const issues = await api.getIssuesForUser(user.id, false);
-            const activeIssues = (issues || []).filter(i => i.status !== 'closed' && i.forwarded_by !== user.id);
-            const escalatedIssues = (issues || []).filter(i => i.forwarded_by === user.id);
-            const allResolved = await api.getIssuesForUser(user.id, true);
-            const resolvedIssues = (allResolved || []).filter(i => i.status === 'closed');
+            await liveIssues.load(user.id);
+            liveIssues.setListener(() => this.draw(container, user));
+            this.draw(container, user);
+        } catch (error) {
+            console.error('Error loading HOD dashboard:', error);
+            container.innerHTML = '<div class="error-message show">Failed to load dashboard</div>';
+        }
+    }
 
-            container.innerHTML = `
-                <div class="stats-grid">
-                    <div class="stat-card active">
-                        <div class="stat-label">Active Complaints</div>
-                        <div class="stat-value">${activeIssues.length}</div>
-                    </div>
-                    <div class="stat-card escalated">
-                        <div class="stat-label">Escalated</div>
-                        <div class="stat-value">${escalatedIssues.length}</div>
-                    </div>
-                    <div class="stat-card resolved">
-                        <div class="stat-label">Resolved</div>
-                        <div class="stat-value">${resolvedIssues.length}</div>
-                    </div>
+    static draw(container, user) {
+        const issues = liveIssues.active();
+        const activeIssues = issues.filter(i => i.forwarded_by !== user.id);
+        const escalatedIssues = issues.filter(i => i.forwarded_by === user.id);
+        const resolvedIssues = liveIssues.resolved();
+        const selected = ProctorDashboard.selectedIssueIds('hod');
+
+        container.innerHTML = `
+            <div class="stats-grid">
+                <div class="stat-card active">
+                    <div class="stat-label">Active Complaints</div>
+                    <div class="stat-value">${activeIssues.length}</div>
                 </div>
+                <div class="stat-card escalated">
+                    <div class="stat-label">Escalated</div>
+                    <div class="stat-value">${escalatedIssues.length}</div>
+                </div>
+                <div class="stat-card resolved">
+                    <div class="stat-label">Resolved</div>
+                    <div class="stat-value">${resolvedIssues.length}</div>
+                </div>
+            </div>
 
-                <div class="card">
-                    <div class="card-header">
-                        <h2 class="card-title">Active Complaints</h2>
-                    </div>
-                    ${ProctorDashboard.renderIssuesTable(activeIssues, 'active')}
-                    ${activeIssues.length > 0 ? this.renderActions(activeIssues) : ''}
+            <div class="card">
+                <div class="card-header">
+                    <h2 class="card-title">Active Complaints</h2>
                 </div>
+                ${ProctorDashboard.renderIssuesTable(activeIssues, 'active')}
+                ${activeIssues.length > 0 ? this.renderActions(activeIssues, selected) : ''}
+            </div>
 
-                ${escalatedIssues.length > 0 ? `
-                <div class="card">
-                    <div class="card-header">
-                        <h2 class="card-title">Escalated Complaints</h2>
-                    </div>
-                    ${ProctorDashboard.renderIssuesTable(escalatedIssues, 'escalated')}
+            ${escalatedIssues.length > 0 ? `
+            <div class="card">
+                <div class="card-header">
+                    <h2 class="card-title">Escalated Complaints</h2>
                 </div>
-                ` : ''}
+                ${ProctorDashboard.renderIssuesTable(escalatedIssues, 'escalated')}
+            </div>
+            ` : ''}
 
-                ${resolvedIssues.length > 0 ? `
-                <div class="card">
-                    <div class="card-header">
-                        <h2 class="card-title">Resolved Complaints</h2>
-                    </div>
-                    ${ProctorDashboard.renderIssuesTable(resolvedIssues, 'resolved')}
+            ${resolvedIssues.length > 0 ? `
+            <div class="card">
+                <div class="card-header">
+                    <h2 class="card-title">Resolved Complaints</h2>
                 </div>
-                ` : ''}
-            `;
+                ${ProctorDashboard.renderIssuesTable(resolvedIssues, 'resolved')}
+            </div>
+            ` : ''}
+        `;
 
-            // Setup action handlers
-            this.setupActionHandlers();
-        } catch (error) {
-            console.error('Error loading HOD dashboard:', error);
-            container.innerHTML = '<div class="error-message show">Failed to load dashboard</div>';
-        }
+        // Setup action handlers
+        this.setupActionHandlers();
     }
 
-    static renderActions(issues) {
+    static renderActions(issues, selected = []) {
         const issueIds = issues.map(i => i.id);
         
         return `
@@ -69,9 +75,9 @@ class HODDashboard {
                 <h3 style="margin-bottom: 16px;">Actions</h3>
                 <div class="form-row">
                     <div class="form-group-full">
-                        <label>Select Issue ID</label>
-                        <select id="hod-issue-select" class="form-group-full">
-                            ${issueIds.map(id => `<option value="${id}">Issue #${id}</option>`).join('')}
+                        <label>Select Issue IDs (Ctrl/Shift-click for several)</label>
+                        <select id="hod-issue-select" class="form-group-full" multiple size="${Math.min(issueIds.length, 8)}">
+                            ${issueIds.map(id => `<option value="${id}" ${selected.includes(id) ? 'selected' : ''}>Issue #${id}</option>`).join('')}
                         </select>
                     </div>
                 </div>
@@ -95,50 +101,25 @@ class HODDashboard {
     }
 
     static async handleResolve() {
-        const user = auth.getUser();
-        const select = document.getElementById('hod-issue-select');
-        if (!select) return;
-
-        const issueId = parseInt(select.value);
-        try {
-            await api.verifyIssue(issueId, user.id, true);
-            showToast('Issue resolved successfully!', 'success');
-            setTimeout(() => {
-                HODDashboard.render(document.getElementById('dashboard-content'));
-            }, 1000);
-        } catch (error) {
-            showToast('Failed to resolve issue', 'error');
-        }
+        await ProctorDashboard.runBulkAction(ProctorDashboard.selectedIssueIds('hod'), 'resolve', 'resolved', () => {
+            HODDashboard.render(document.getElementById('dashboard-content'));
+        });
     }
 
     static async handleEscalate() {
-        const user = auth.getUser();
-        const select = document.getElementById('hod-issue-select');
-        if (!select) return;
-
-        const issueId = parseInt(select.value);
-        try {
-            await api.forwardIssue(issueId, user.id);
-            showToast('Issue escalated successfully!', 'success');
-            setTimeout(() => {
-                HODDashboard.render(document.getElementById('dashboard-content'));
-            }, 1000);
-        } catch (error) {
-            showToast('Failed to escalate issue', 'error');
-        }
+        await ProctorDashboard.runBulkAction(ProctorDashboard.selectedIssueIds('hod'), 'forward', 'escalated', () => {
+            HODDashboard.render(document.getElementById('dashboard-content'));
+        });
     }
 
     static async handleReclassify() {
-        const select = document.getElementById('hod-issue-select');
-        if (!select) return;
+        const issueIds = ProctorDashboard.selectedIssueIds('hod');
+        if (issueIds.length === 0) return;
 
-        const issueId = parseInt(select.value);
         try {
-            await api.classifyIssue(issueId);
+            await Promise.all(issueIds.map(id => api.classifyIssue(id)));
             showToast('Issue re-classified successfully!', 'success');
-            setTimeout(() => {
-                HODDashboard.render(document.getElementById('dashboard-content'));
-            }, 1000);
+            await liveIssues.afterWrite(() => HODDashboard.render(document.getElementById('dashboard-content')));
         } catch (error) {
             showToast('Failed to re-classify issue', 'error');
         }
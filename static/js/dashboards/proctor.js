@@ -4,70 +4,73 @@ class ProctorDashboard {
         if (!user) return;
 
         try {
-            const [issues, allUsers] = await Promise.all([
-                api.getIssuesForUser(user.id, false),
-                auth.loadUsersCache()
-            ]);
-
-            const students = (allUsers || []).filter(u => u.reports_to === user.id && u.role === 'student');
-            const activeIssues = (issues || []).filter(i => i.status !== 'closed' && i.forwarded_by !== user.id);
-            const escalatedIssues = (issues || []).filter(i => i.forwarded_by === user.id);
-            const allResolved = await api.getIssuesForUser(user.id, true);
-            const resolvedIssues = (allResolved || []).filter(i => i.status === 'closed');
-
-            container.innerHTML = `
-                <div class="stats-grid">
-                    <div class="stat-card active">
-                        <div class="stat-label">Active Complaints</div>
-                        <div class="stat-value">${activeIssues.length}</div>
-                    </div>
-                    <div class="stat-card escalated">
-                        <div class="stat-label">Escalated</div>
-                        <div class="stat-value">${escalatedIssues.length}</div>
-                    </div>
-                    <div class="stat-card resolved">
-                        <div class="stat-label">Resolved</div>
-                        <div class="stat-value">${resolvedIssues.length}</div>
-                    </div>
-                    <div class="stat-card">
-                        <div class="stat-label">Students</div>
-                        <div class="stat-value">${students.length}</div>
-                    </div>
+            await liveIssues.load(user.id);
+            const students = liveIssues.team().filter(u => u.role === 'student');
+            liveIssues.setListener(() => this.draw(container, user, students));
+            this.draw(container, user, students);
+        } catch (error) {
+            console.error('Error loading proctor dashboard:', error);
+            container.innerHTML = '<div class="error-message show">Failed to load dashboard</div>';
+        }
+    }
+
+    // Renders from the live issue cache, keeping the current multi-select selection.
+    static draw(container, user, students) {
+        const issues = liveIssues.active();
+        const activeIssues = issues.filter(i => i.forwarded_by !== user.id);
+        const escalatedIssues = issues.filter(i => i.forwarded_by === user.id);
+        const resolvedIssues = liveIssues.resolved();
+        const selected = ProctorDashboard.selectedIssueIds('proctor');
+
+        container.innerHTML = `
+            <div class="stats-grid">
+                <div class="stat-card active">
+                    <div class="stat-label">Active Complaints</div>
+                    <div class="stat-value">${activeIssues.length}</div>
+                </div>
+                <div class="stat-card escalated">
+                    <div class="stat-label">Escalated</div>
+                    <div class="stat-value">${escalatedIssues.length}</div>
                 </div>
+                <div class="stat-card resolved">
+                    <div class="stat-label">Resolved</div>
+                    <div class="stat-value">${resolvedIssues.length}</div>
+                </div>
+                <div class="stat-card">
+                    <div class="stat-label">Students</div>
+                    <div class="stat-value">${students.length}</div>
+                </div>
+            </div>
 
-                <div class="card">
-                    <div class="card-header">
-                        <h2 class="card-title">Active Complaints</h2>
-                    </div>
-                    ${this.renderIssuesTable(activeIssues, 'active')}
-                    ${activeIssues.length > 0 ? this.renderActions(activeIssues, 'proctor') : ''}
+            <div class="card">
+                <div class="card-header">
+                    <h2 class="card-title">Active Complaints</h2>
                 </div>
+                ${this.renderIssuesTable(activeIssues, 'active')}
+                ${activeIssues.length > 0 ? this.renderActions(activeIssues, 'proctor', selected) : ''}
+            </div>
 
-                ${escalatedIssues.length > 0 ? `
-                <div class="card">
-                    <div class="card-header">
-                        <h2 class="card-title">Escalated Complaints</h2>
-                    </div>
-                    ${this.renderIssuesTable(escalatedIssues, 'escalated')}
+            ${escalatedIssues.length > 0 ? `
+            <div class="card">
+                <div class="card-header">
+                    <h2 class="card-title">Escalated Complaints</h2>
                 </div>
-                ` : ''}
+                ${this.renderIssuesTable(escalatedIssues, 'escalated')}
+            </div>
+            ` : ''}
 
-                ${resolvedIssues.length > 0 ? `
-                <div class="card">
-                    <div class="card-header">
-                        <h2 class="card-title">Resolved Complaints</h2>
-                    </div>
-                    ${this.renderIssuesTable(resolvedIssues, 'resolved')}
+            ${resolvedIssues.length > 0 ? `
+            <div class="card">
+                <div class="card-header">
+                    <h2 class="card-title">Resolved Complaints</h2>
                 </div>
-                ` : ''}
-            `;
+                ${this.renderIssuesTable(resolvedIssues, 'resolved')}
+            </div>
+            ` : ''}
+        `;
 
-            // Setup action handlers
-            this.setupActionHandlers('proctor');
-        } catch (error) {
-            console.error('Error loading proctor dashboard:', error);
-            container.innerHTML = '<div class="error-message show">Failed to load dashboard</div>';
-        }
+        // Setup action handlers
+        this.setupActionHandlers('proctor');
     }
 
     static renderIssuesTable(issues, type) {
@@ -78,10 +81,10 @@ class ProctorDashboard {
         const rows = issues.map(issue => {
             const priority = issue.priority || 'N/A';
             const status = issue.status || 'open';
-            const raisedBy = auth.getUserById(issue.student_id)?.name || 'Unknown';
-            const assignedTo = issue.assigned_to ? (auth.getUserById(issue.assigned_to)?.name || 'Unassigned') : 'Unassigned';
-            const forwardedTo = issue.assigned_to ? (auth.getUserById(issue.assigned_to)?.name || 'Unassigned') : 'Unassigned';
-            const verifiedBy = issue.verified_by ? (auth.getUserById(issue.verified_by)?.name || '-') : '-';
+            const raisedBy = issue.student_name || auth.getUserById(issue.student_id)?.name || 'Unknown';
+            const assignedTo = issue.assigned_to ? (issue.assignee_name || auth.getUserById(issue.assigned_to)?.name || 'Unassigned') : 'Unassigned';
+            const forwardedTo = issue.assigned_to ? (issue.assignee_name || auth.getUserById(issue.assigned_to)?.name || 'Unassigned') : 'Unassigned';
+            const verifiedBy = issue.verified_by ? (issue.verifier_name || auth.getUserById(issue.verified_by)?.name || '-') : '-';
             const verifiedAt = issue.verified_at ? new Date(issue.verified_at).toLocaleString() : '-';
 
             if (type === 'resolved') {
@@ -149,7 +152,7 @@ class ProctorDashboard {
         `;
     }
 
-    static renderActions(issues, prefix) {
+    static renderActions(issues, prefix, selected = []) {
         const issueIds = issues.map(i => i.id);
         
         return `
@@ -157,9 +160,9 @@ class ProctorDashboard {
                 <h3 style="margin-bottom: 16px;">Actions</h3>
                 <div class="form-row">
                     <div class="form-group-full">
-                        <label>Select Issue ID</label>
-                        <select id="${prefix}-issue-select" class="form-group-full">
-                            ${issueIds.map(id => `<option value="${id}">Issue #${id}</option>`).join('')}
+                        <label>Select Issue IDs (Ctrl/Shift-click for several)</label>
+                        <select id="${prefix}-issue-select" class="form-group-full" multiple size="${Math.min(issueIds.length, 8)}">
+                            ${issueIds.map(id => `<option value="${id}" ${selected.includes(id) ? 'selected' : ''}>Issue #${id}</option>`).join('')}
                         </select>
                     </div>
                 </div>
@@ -182,51 +185,55 @@ class ProctorDashboard {
         // Handlers are set up via onclick in renderActions
     }
 
-    static async handleResolve(prefix) {
-        const user = auth.getUser();
+    static selectedIssueIds(prefix) {
         const select = document.getElementById(`${prefix}-issue-select`);
-        if (!select) return;
+        if (!select) return [];
+        return Array.from(select.selectedOptions).map(o => parseInt(o.value));
+    }
 
-        const issueId = parseInt(select.value);
+    // Runs one bulk action over the selected issues and reports per-issue failures.
+    static async runBulkAction(issueIds, action, verb, onDone) {
+        const user = auth.getUser();
+        if (issueIds.length === 0) {
+            showToast('Select at least one issue', 'error');
+            return;
+        }
         try {
-            await api.verifyIssue(issueId, user.id, true);
-            showToast('Issue resolved successfully!', 'success');
-            setTimeout(() => {
-                ProctorDashboard.render(document.getElementById('dashboard-content'));
-            }, 1000);
+            const results = await api.bulkIssueAction(issueIds, action, user.id);
+            const failed = (results || []).filter(r => !r.ok);
+            const done = (results || []).length - failed.length;
+            if (failed.length === 0) {
+                showToast(`${done} issue${done === 1 ? '' : 's'} ${verb} successfully!`, 'success');
+            } else {
+                const reasons = failed.map(r => `#${r.id}: ${r.error}`).join(', ');
+                showToast(`${done} ${verb}, ${failed.length} failed (${reasons})`, done > 0 ? 'warning' : 'error');
+            }
+            await liveIssues.afterWrite(onDone);
         } catch (error) {
-            showToast('Failed to resolve issue', 'error');
+            showToast('Failed to update issues', 'error');
         }
     }
 
-    static async handleEscalate(prefix) {
-        const user = auth.getUser();
-        const select = document.getElementById(`${prefix}-issue-select`);
-        if (!select) return;
+    static async handleResolve(prefix) {
+        await ProctorDashboard.runBulkAction(ProctorDashboard.selectedIssueIds(prefix), 'resolve', 'resolved', () => {
+            ProctorDashboard.render(document.getElementById('dashboard-content'));
+        });
+    }
 
-        const issueId = parseInt(select.value);
-        try {
-            await api.forwardIssue(issueId, user.id);
-            showToast('Issue escalated successfully!', 'success');
-            setTimeout(() => {
-                ProctorDashboard.render(document.getElementById('dashboard-content'));
-            }, 1000);
-        } catch (error) {
-            showToast('Failed to escalate issue', 'error');
-        }
+    static async handleEscalate(prefix) {
+        await ProctorDashboard.runBulkAction(ProctorDashboard.selectedIssueIds(prefix), 'forward', 'escalated', () => {
+            ProctorDashboard.render(document.getElementById('dashboard-content'));
+        });
     }
 
     static async handleReclassify(prefix) {
-        const select = document.getElementById(`${prefix}-issue-select`);
-        if (!select) return;
+        const issueIds = ProctorDashboard.selectedIssueIds(prefix);
+        if (issueIds.length === 0) return;
 
-        const issueId = parseInt(select.value);
         try {
-            await api.classifyIssue(issueId);
+            await Promise.all(issueIds.map(id => api.classifyIssue(id)));
             showToast('Issue re-classified successfully!', 'success');
-            setTimeout(() => {
-                ProctorDashboard.render(document.getElementById('dashboard-content'));
-            }, 1000);
+            await liveIssues.afterWrite(() => ProctorDashboard.render(document.getElementById('dashboard-content')));
         } catch (error) {
             showToast('Failed to re-classify issue', 'error');
         }
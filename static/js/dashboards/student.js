@@ -4,73 +4,82 @@ class StudentDashboard {
         if (!user) return;
 
         try {
-            const [activeIssues, resolvedIssues, proctor] = await Promise.all([
-                api.getIssuesForUser(user.id, false),
-                api.getIssuesForUser(user.id, true),
-                user.reports_to ? api.getUser(user.reports_to) : null
-            ]);
-
-            const resolvedOnly = (resolvedIssues || []).filter(i => i.status === 'closed');
-
-            container.innerHTML = `
-                <div class="stats-grid">
-                    <div class="stat-card">
-                        <div class="stat-label">Active Complaints</div>
-                        <div class="stat-value">${(activeIssues || []).length}</div>
-                    </div>
-                    <div class="stat-card resolved">
-                        <div class="stat-label">Resolved</div>
-                        <div class="stat-value">${resolvedOnly.length}</div>
-                    </div>
-                </div>
+            await liveIssues.load(user.id);
+            liveIssues.setListener(() => this.draw(container));
+            this.draw(container);
+        } catch (error) {
+            console.error('Error loading student dashboard:', error);
+            container.innerHTML = '<div class="error-message show">Failed to load dashboard</div>';
+        }
+    }
 
-                <div class="card">
-                    <div class="card-header">
-                        <h2 class="card-title">Raise a Complaint</h2>
-                    </div>
-                    <form id="raise-complaint-form" class="form-card">
-                        <div class="form-group-full">
-                            <label for="complaint-title">Title</label>
-                            <input type="text" id="complaint-title" placeholder="Brief title of your complaint" required>
-                        </div>
-                        <div class="form-group-full">
-                            <label for="complaint-description">Description</label>
-                            <textarea id="complaint-description" placeholder="Describe your complaint in detail..." required></textarea>
-                        </div>
-                        <button type="submit" class="btn btn-primary">
-                            <i class="fas fa-paper-plane"></i> Submit Complaint
-                        </button>
-                    </form>
+    // Renders from the live issue cache; keeps whatever was typed into the form.
+    static draw(container) {
+        const activeIssues = liveIssues.active();
+        const resolvedOnly = liveIssues.resolved();
+        const draft = {
+            title: document.getElementById('complaint-title')?.value || '',
+            description: document.getElementById('complaint-description')?.value || ''
+        };
+
+        container.innerHTML = `
+            <div class="stats-grid">
+                <div class="stat-card">
+                    <div class="stat-label">Active Complaints</div>
+                    <div class="stat-value">${(activeIssues || []).length}</div>
                 </div>
+                <div class="stat-card resolved">
+                    <div class="stat-label">Resolved</div>
+                    <div class="stat-value">${resolvedOnly.length}</div>
+                </div>
+            </div>
 
-                <div class="card">
-                    <div class="card-header">
-                        <h2 class="card-title">Your Complaints</h2>
+            <div class="card">
+                <div class="card-header">
+                    <h2 class="card-title">Raise a Complaint</h2>
+                </div>
+                <form id="raise-complaint-form" class="form-card">
+                    <div class="form-group-full">
+                        <label for="complaint-title">Title</label>
+                        <input type="text" id="complaint-title" placeholder="Brief title of your complaint" required>
+                    </div>
+                    <div class="form-group-full">
+                        <label for="complaint-description">Description</label>
+                        <textarea id="complaint-description" placeholder="Describe your complaint in detail..." required></textarea>
                     </div>
-                    ${this.renderIssuesTable(activeIssues, 'active')}
+                    <button type="submit" class="btn btn-primary">
+                        <i class="fas fa-paper-plane"></i> Submit Complaint
+                    </button>
+                </form>
+            </div>
+
+            <div class="card">
+                <div class="card-header">
+                    <h2 class="card-title">Your Complaints</h2>
                 </div>
+                ${this.renderIssuesTable(activeIssues, 'active')}
+            </div>
 
-                ${resolvedOnly.length > 0 ? `
-                <div class="card">
-                    <div class="card-header">
-                        <h2 class="card-title">Resolved Complaints</h2>
-                    </div>
-                    ${this.renderIssuesTable(resolvedOnly, 'resolved')}
+            ${resolvedOnly.length > 0 ? `
+            <div class="card">
+                <div class="card-header">
+                    <h2 class="card-title">Resolved Complaints</h2>
                 </div>
-                ` : ''}
-            `;
+                ${this.renderIssuesTable(resolvedOnly, 'resolved')}
+            </div>
+            ` : ''}
+        `;
 
-            // Setup form handler
-            const form = document.getElementById('raise-complaint-form');
-            if (form) {
-                form.addEventListener('submit', async (e) => {
-                    e.preventDefault();
-                    await this.handleSubmitComplaint();
-                });
-            }
-        } catch (error) {
-            console.error('Error loading student dashboard:', error);
-            container.innerHTML = '<div class="error-message show">Failed to load dashboard</div>';
+        document.getElementById('complaint-title').value = draft.title;
+        document.getElementById('complaint-description').value = draft.description;
+
+        // Setup form handler
+        const form = document.getElementById('raise-complaint-form');
+        if (form) {
+            form.addEventListener('submit', async (e) => {
+                e.preventDefault();
+                await this.handleSubmitComplaint();
+            });
         }
     }
 
@@ -85,19 +94,21 @@ class StudentDashboard {
         }
 
         try {
-            await api.createIssue({
+            const issue = await api.createIssue({
                 student_id: user.id,
                 title: title,
                 description: description
             });
 
-            showToast('Complaint submitted successfully!', 'success');
+            if (issue && issue.duplicate_of) {
+                showToast(`Complaint submitted and linked to a similar open complaint (#${issue.duplicate_of})`, 'success');
+            } else {
+                showToast('Complaint submitted successfully!', 'success');
+            }
             document.getElementById('raise-complaint-form').reset();
             
-            // Reload dashboard
-            setTimeout(() => {
-                StudentDashboard.render(document.getElementById('dashboard-content'));
-            }, 1000);
+            // The new complaint arrives over the live stream; reload only without it
+            await liveIssues.afterWrite(() => StudentDashboard.render(document.getElementById('dashboard-content')));
         } catch (error) {
             showToast('Failed to submit complaint', 'error');
         }
@@ -111,9 +122,9 @@ class StudentDashboard {
         const rows = issues.map(issue => {
             const priority = issue.priority || 'N/A';
             const status = issue.status || 'open';
-            const raisedBy = auth.getUserById(issue.student_id)?.name || 'Unknown';
-            const assignedTo = issue.assigned_to ? (auth.getUserById(issue.assigned_to)?.name || 'Unassigned') : 'Unassigned';
-            const verifiedBy = issue.verified_by ? (auth.getUserById(issue.verified_by)?.name || '-') : '-';
+            const raisedBy = issue.student_name || auth.getUserById(issue.student_id)?.name || 'Unknown';
+            const assignedTo = issue.assigned_to ? (issue.assignee_name || auth.getUserById(issue.assigned_to)?.name || 'Unassigned') : 'Unassigned';
+            const verifiedBy = issue.verified_by ? (issue.verifier_name || auth.getUserById(issue.verified_by)?.name || '-') : '-';
             const verifiedAt = issue.verified_at ? new Date(issue.verified_at).toLocaleString() : '-';
 
             let row = `
@@ -4,48 +4,53 @@ class VCDashboard {
         if (!user) return;
 
         try {
-            const issues = await api.getIssuesForUser(user.id, false);
-            const allResolved = await api.getIssuesForUser(user.id, true);
-            const resolvedIssues = (allResolved || []).filter(i => i.status === 'closed');
+            await liveIssues.load(user.id);
+            liveIssues.setListener(() => this.draw(container));
+            this.draw(container);
+        } catch (error) {
+            console.error('Error loading VC dashboard:', error);
+            container.innerHTML = '<div class="error-message show">Failed to load dashboard</div>';
+        }
+    }
 
-            container.innerHTML = `
-                <div class="stats-grid">
-                    <div class="stat-card active">
-                        <div class="stat-label">Escalated Complaints</div>
-                        <div class="stat-value">${(issues || []).length}</div>
-                    </div>
-                    <div class="stat-card resolved">
-                        <div class="stat-label">Resolved</div>
-                        <div class="stat-value">${resolvedIssues.length}</div>
-                    </div>
+    static draw(container) {
+        const issues = liveIssues.active();
+        const resolvedIssues = liveIssues.resolved();
+
+        container.innerHTML = `
+            <div class="stats-grid">
+                <div class="stat-card active">
+                    <div class="stat-label">Escalated Complaints</div>
+                    <div class="stat-value">${(issues || []).length}</div>
                 </div>
+                <div class="stat-card resolved">
+                    <div class="stat-label">Resolved</div>
+                    <div class="stat-value">${resolvedIssues.length}</div>
+                </div>
+            </div>
 
-                <div class="card">
-                    <div class="card-header">
-                        <h2 class="card-title">Escalated Complaints</h2>
-                    </div>
-                    ${this.renderIssuesTable(issues)}
-                    ${issues && issues.length > 0 ? this.renderActions(issues) : ''}
+            <div class="card">
+                <div class="card-header">
+                    <h2 class="card-title">Escalated Complaints</h2>
                 </div>
+                ${this.renderIssuesTable(issues)}
+                ${issues && issues.length > 0 ? this.renderActions(issues) : ''}
+            </div>
 
-                ${resolvedIssues.length > 0 ? `
-                <div class="card">
-                    <div class="card-header">
-                        <h2 class="card-title">Resolved Complaints</h2>
-                    </div>
-                    ${this.renderResolvedTable(resolvedIssues)}
+            ${resolvedIssues.length > 0 ? `
+            <div class="card">
+                <div class="card-header">
+                    <h2 class="card-title">Resolved Complaints</h2>
                 </div>
-                ` : ''}
-            `;
+                ${this.renderResolvedTable(resolvedIssues)}
+            </div>
+            ` : ''}
+        `;
 
-            // Setup action handler
-            const resolveBtn = document.getElementById('vc-resolve-btn');
-            if (resolveBtn) {
-                resolveBtn.addEventListener('click', () => this.handleResolve());
-            }
-        } catch (error) {
-            console.error('Error loading VC dashboard:', error);
-            container.innerHTML = '<div class="error-message show">Failed to load dashboard</div>';
+        // Setup action handler
+        const resolveBtn = document.getElementById('vc-resolve-btn');
+        if (resolveBtn) {
+            resolveBtn.addEventListener('click', () => this.handleResolve());
         }
     }
 
@@ -56,7 +61,7 @@ class VCDashboard {
 
         const rows = issues.map(issue => {
             const priority = issue.priority || 'N/A';
-            const raisedBy = auth.getUserById(issue.student_id)?.name || 'Unknown';
+            const raisedBy = issue.student_name || auth.getUserById(issue.student_id)?.name || 'Unknown';
             
             return `
                 <tr>
@@ -94,8 +99,8 @@ class VCDashboard {
     static renderResolvedTable(issues) {
         const rows = issues.map(issue => {
             const priority = issue.priority || 'N/A';
-            const raisedBy = auth.getUserById(issue.student_id)?.name || 'Unknown';
-            const verifiedBy = issue.verified_by ? (auth.getUserById(issue.verified_by)?.name || '-') : '-';
+            const raisedBy = issue.student_name || auth.getUserById(issue.student_id)?.name || 'Unknown';
+            const verifiedBy = issue.verified_by ? (issue.verifier_name || auth.getUserById(issue.verified_by)?.name || '-') : '-';
             const verifiedAt = issue.verified_at ? new Date(issue.verified_at).toLocaleString() : '-';
 
             return `
@@ -161,9 +166,7 @@ class VCDashboard {
         try {
             await api.verifyIssue(issueId, user.id, true);
             showToast('Issue resolved successfully!', 'success');
-            setTimeout(() => {
-                VCDashboard.render(document.getElementById('dashboard-content'));
-            }, 1000);
+            await liveIssues.afterWrite(() => VCDashboard.render(document.getElementById('dashboard-content')));
         } catch (error) {
             showToast('Failed to resolve issue', 'error');
         }
@@ -0,0 +1,172 @@
+// Keeps the signed-in user's issues in memory and patches them from the
+// GET /events/issues Server-Sent Events stream, so dashboards redraw from this
+// cache instead of re-downloading their issue lists after every action.
+// Whenever events may have been missed (reconnect, resync, no stream) the cache
+// catches up through the delta-sync endpoint from the last watermark.
+class LiveIssues {
+    constructor() {
+        this.userId = null;
+        this.issues = new Map();
+        this.watermark = null;
+        this.dashboard = null;
+        this.loaded = false;
+        this.source = null;
+        this.listener = null;
+        this.reconnecting = false;
+    }
+
+    get connected() {
+        return this.source !== null && this.source.readyState === EventSource.OPEN;
+    }
+
+    // Loads the user's dashboard once (issues, team, watermark) and opens the stream.
+    async load(userId) {
+        if (this.userId !== userId) {
+            this.close();
+            this.userId = userId;
+        }
+        if (!this.loaded) {
+            await this.seed(await api.getDashboard(userId));
+        }
+        if (!this.source) {
+            this.connect();
+        }
+        return this.all();
+    }
+
+    // A truncated dashboard only has the newest issues: fill the cache through delta sync instead.
+    async seed(dashboard) {
+        this.dashboard = dashboard;
+        if (dashboard.truncated) {
+            this.issues = new Map();
+            this.watermark = null;
+            await this.reload();
+            return;
+        }
+        const issues = [...dashboard.active, ...dashboard.escalated, ...dashboard.resolved];
+        this.issues = new Map(issues.map(i => [i.id, i]));
+        this.watermark = dashboard.watermark;
+        this.loaded = true;
+    }
+
+    // Events and deltas carry ids only; keep the names the dashboard payload resolved.
+    put(issue) {
+        const prev = this.issues.get(issue.id);
+        if (prev) {
+            if (prev.student_id === issue.student_id) issue.student_name = prev.student_name;
+            if (prev.assigned_to === issue.assigned_to) issue.assignee_name = prev.assignee_name;
+            if (prev.verified_by === issue.verified_by) issue.verifier_name = prev.verifier_name;
+        }
+        this.issues.set(issue.id, issue);
+    }
+
+    team() {
+        return this.dashboard ? this.dashboard.team : [];
+    }
+
+    // Fetches what changed since the last watermark (everything on the first call).
+    async reload() {
+        let more = true;
+        while (more) {
+            const delta = await api.getIssueChanges(this.userId, this.watermark);
+            if (delta.reset) {
+                this.issues = new Map();
+            }
+            // Removals first: a deleted issue's id can come back as a new issue.
+            (delta.removed || []).forEach(id => this.issues.delete(id));
+            (delta.issues || []).forEach(i => this.put(i));
+            this.watermark = delta.watermark;
+            more = delta.has_more;
+        }
+        this.loaded = true;
+    }
+
+    connect() {
+        if (typeof EventSource === 'undefined') return;
+        const url = `${API_CONFIG.BASE_URL}${API_CONFIG.ENDPOINTS.ISSUE_EVENTS}?user_id=${this.userId}`;
+        this.source = new EventSource(url);
+
+        ['created', 'updated', 'forwarded', 'verified'].forEach(kind => {
+            this.source.addEventListener(kind, (e) => {
+                const issue = JSON.parse(e.data);
+                this.put(issue);
+                this.notify(kind, issue);
+            });
+        });
+        this.source.addEventListener('removed', (e) => {
+            const { id } = JSON.parse(e.data);
+            this.issues.delete(id);
+            this.notify('removed', { id });
+        });
+        this.source.addEventListener('resync', () => this.catchUp());
+        // EventSource reconnects by itself; anything missed while it was down needs a reload.
+        this.source.addEventListener('open', () => {
+            if (this.reconnecting) {
+                this.reconnecting = false;
+                this.catchUp();
+            }
+        });
+        this.source.addEventListener('error', () => {
+            this.reconnecting = true;
+        });
+    }
+
+    // Reloads from the watermark; on failure the next (re)connect tries again.
+    async catchUp() {
+        try {
+            await this.reload();
+            this.notify('resync', null);
+        } catch (error) {
+            console.error('Live issues reload failed:', error);
+            this.reconnecting = true;
+        }
+    }
+
+    close() {
+        if (this.source) {
+            this.source.close();
+        }
+        this.source = null;
+        this.reconnecting = false;
+        this.issues = new Map();
+        this.watermark = null;
+        this.dashboard = null;
+        this.loaded = false;
+        this.userId = null;
+        this.listener = null;
+    }
+
+    // Only the dashboard on screen redraws; pass null when leaving it.
+    setListener(fn) {
+        this.listener = fn;
+    }
+
+    notify(kind, issue) {
+        if (this.listener) {
+            this.listener(kind, issue);
+        }
+    }
+
+    // After a write: the stream will deliver the change; without it, reload and redraw.
+    async afterWrite(redraw) {
+        if (this.connected) return;
+        await this.reload();
+        redraw();
+    }
+
+    all() {
+        return Array.from(this.issues.values()).sort((a, b) =>
+            new Date(b.created_at) - new Date(a.created_at) || b.id - a.id
+        );
+    }
+
+    active() {
+        return this.all().filter(i => i.status !== 'closed');
+    }
+
+    resolved() {
+        return this.all().filter(i => i.status === 'closed');
+    }
+}
+
+const liveIssues = new LiveIssues();
@@ -0,0 +1,246 @@
+"""
+Issue statistics for GET /admin/stats.
+
+Counts live in the `issue_counters` table (models.IssueCounter), one row per
+(department, section, category, priority, status). A `before_flush` hook keeps
+it in step with every ORM write to `issues` inside the same transaction, and
+bulk writers that bypass the ORM (pending classification, reclassify_db.py)
+call `apply_deltas` themselves. /admin/stats therefore reads a table whose size
+depends on the org chart, not on the issue history. `rebuild_counters`
+reconciles the table from scratch with one grouped query over `issues`.
+
+The same hook, those writers and `rebuild_counters` also call
+`bump_issue_version`, which increments the single `issue_version` row in the
+same transaction. http_cache.py builds issue list ETags from it.
+"""
+
+from collections import Counter
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from models import Department, Issue, IssueCounter, IssueVersion, Section
+
+CLOSED = "closed"
+KEY_COLUMNS = ["department_id", "section_id", "category", "priority", "status"]
+
+CounterKey = Tuple[int, int, str, str, str]
+
+
+def make_key(department_id, section_id, category, priority, status) -> CounterKey:
+    return (department_id or 0, section_id or 0, category or "", priority or "", status or "open")
+
+
+def counter_key(issue: Issue) -> CounterKey:
+    return make_key(issue.department_id, issue.section_id, issue.category, issue.priority, issue.status)
+
+
+def _insert(dialect_name: str):
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+def _upsert(dialect_name: str):
+    insert = _insert(dialect_name)
+    table = IssueCounter.__table__
+    stmt = insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=KEY_COLUMNS,
+        set_={"count": table.c["count"] + stmt.excluded["count"]},
+    )
+
+
+def apply_deltas(conn, deltas: Dict[CounterKey, int]):
+    """Add `deltas` to the counters with one executemany upsert on `conn`."""
+    params = [dict(zip(KEY_COLUMNS, key), count=delta) for key, delta in deltas.items() if delta]
+    if params:
+        conn.execute(_upsert(conn.dialect.name), params)
+
+
+def bump_issue_version(conn):
+    """Increment issue_version.version on `conn`, creating the row on first use."""
+    table = IssueVersion.__table__
+    stmt = _insert(conn.dialect.name)(table).values(id=1, version=1)
+    conn.execute(stmt.on_conflict_do_update(index_elements=["id"], set_={"version": table.c.version + 1}))
+
+
+def _stored_key(conn, issue_id: int) -> Optional[CounterKey]:
+    t = Issue.__table__
+    row = conn.execute(
+        select(t.c.department_id, t.c.section_id, t.c.category, t.c.priority, t.c.status).where(t.c.id == issue_id)
+    ).first()
+    return make_key(*row) if row else None
+
+
+def _track_issue_changes(session: Session, flush_context, instances):
+    deltas: Counter = Counter()
+    touched = False
+    with session.no_autoflush:
+        conn = session.connection()
+        for obj in session.new:
+            if isinstance(obj, Issue):
+                deltas[counter_key(obj)] += 1
+                touched = True
+        for obj in session.deleted:
+            if isinstance(obj, Issue) and obj.id is not None:
+                touched = True
+                old = _stored_key(conn, obj.id)
+                if old:
+                    deltas[old] -= 1
+        for obj in session.dirty:
+            if not isinstance(obj, Issue) or obj.id is None or not session.is_modified(obj):
+                continue
+            touched = True
+            attrs = inspect(obj).attrs
+            if not any(attrs[c].history.has_changes() for c in KEY_COLUMNS):
+                continue
+            # Read the old key from the row itself: the in-memory history may not
+            # know the previous value if the attribute was expired before the change.
+            old = _stored_key(conn, obj.id)
+            new = counter_key(obj)
+            if old and old != new:
+                deltas[old] -= 1
+                deltas[new] += 1
+        apply_deltas(conn, deltas)
+        if touched:
+            bump_issue_version(conn)
+
+
+def install_counter_tracking(session_factory):
+    """Keep issue_counters in step with ORM writes on sessions from `session_factory`."""
+    if not event.contains(session_factory, "before_flush", _track_issue_changes):
+        event.listen(session_factory, "before_flush", _track_issue_changes)
+
+
+def rebuild_counters(db: Session) -> int:
+    """Recompute issue_counters from the issues table. Returns the number of counter rows."""
+    counters = IssueCounter.__table__
+    rows = (
+        db.query(
+            func.coalesce(Issue.department_id, 0),
+            func.coalesce(Issue.section_id, 0),
+            func.coalesce(Issue.category, ""),
+            func.coalesce(Issue.priority, ""),
+            func.coalesce(Issue.status, "open"),
+            func.count(Issue.id),
+        )
+        .group_by(Issue.department_id, Issue.section_id, Issue.category, Issue.priority, Issue.status)
+        .all()
+    )
+    # NULL and "" (or "open") collapse to the same key, so merge before inserting.
+    merged: Counter = Counter()
+    for *key, n in rows:
+        merged[tuple(key)] += n
+    db.execute(counters.delete())
+    if merged:
+        db.execute(counters.insert(), [dict(zip(KEY_COLUMNS, key), count=n) for key, n in merged.items()])
+    bump_issue_version(db.connection())
+    db.commit()
+    return len(merged)
+
+
+def counters_need_rebuild(db: Session) -> bool:
+    """True when the counters disagree with the issue total (e.g. a pre-existing database)."""
+    counted = db.query(func.coalesce(func.sum(IssueCounter.count), 0)).scalar() or 0
+    actual = db.query(func.count(Issue.id)).scalar() or 0
+    return counted != actual
+
+
+def _bucket() -> Dict:
+    return {"total": 0, "active": 0, "resolved": 0}
+
+
+def _add(bucket: Dict, total: int, resolved: int):
+    bucket["total"] += total
+    bucket["resolved"] += resolved
+    bucket["active"] += total - resolved
+
+
+def rollup(rows: Iterable, departments: List) -> Dict:
+    """
+    Build the /admin/stats payload from aggregated rows with attributes
+    department_id, department_name, section_id, section_name, category, priority,
+    total, resolved.
+    """
+    overall = _bucket()
+    by_department: Dict[int, Dict] = {
+        d.id: {"department_id": d.id, "department_name": d.name, **_bucket()} for d in departments
+    }
+    by_section: Dict = {}
+    by_category: Dict = {}
+    by_priority: Dict = {}
+
+    for r in rows:
+        total = int(r.total or 0)
+        resolved = int(r.resolved or 0)
+        _add(overall, total, resolved)
+        if r.department_id is not None:
+            dept = by_department.setdefault(
+                r.department_id,
+                {"department_id": r.department_id, "department_name": r.department_name, **_bucket()},
+            )
+            _add(dept, total, resolved)
+        if r.section_id is not None:
+            sect = by_section.setdefault(r.section_id, {
+                "section_id": r.section_id,
+                "section_name": r.section_name,
+                "department_id": r.department_id,
+                **_bucket(),
+            })
+            _add(sect, total, resolved)
+        _add(by_category.setdefault(r.category, {"category": r.category, **_bucket()}), total, resolved)
+        _add(by_priority.setdefault(r.priority, {"priority": r.priority, **_bucket()}), total, resolved)
+
+    def ranked(items):
+        return sorted(items, key=lambda x: x["total"], reverse=True)
+
+    return {
+        **overall,
+        "by_department": list(by_department.values()),
+        "by_section": sorted(by_section.values(), key=lambda x: x["section_id"]),
+        "by_category": ranked(by_category.values()),
+        "by_priority": ranked(by_priority.values()),
+    }
+
+
+def compute_stats(db: Session) -> Dict:
+    rows = (
+        db.query(
+            IssueCounter.department_id,
+            Department.name,
+            IssueCounter.section_id,
+            Section.name,
+            IssueCounter.category,
+            IssueCounter.priority,
+            func.sum(IssueCounter.count),
+            func.sum(case((IssueCounter.status == CLOSED, IssueCounter.count), else_=0)),
+        )
+        .outerjoin(Department, Department.id == IssueCounter.department_id)
+        .outerjoin(Section, Section.id == IssueCounter.section_id)
+        .filter(IssueCounter.count != 0)
+        .group_by(
+            IssueCounter.department_id, Department.name, IssueCounter.section_id, Section.name,
+            IssueCounter.category, IssueCounter.priority,
+        )
+        .all()
+    )
+    aggregated = [
+        SimpleNamespace(
+            department_id=dept_id or None,
+            department_name=dept_name,
+            section_id=sect_id or None,
+            section_name=sect_name,
+            category=category or None,
+            priority=priority or None,
+            total=total,
+            resolved=resolved,
+        )
+        for dept_id, dept_name, sect_id, sect_name, category, priority, total, resolved in rows
+    ]
+    departments = db.query(Department.id, Department.name).order_by(Department.id).all()
+    return rollup(aggregated, departments)
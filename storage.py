@@ -0,0 +1,110 @@
+"""
+Engine construction with a tunable SQLite storage profile.
+
+DB_PROFILE=performance (default) applies these pragmas to every pooled connection:
+  - journal_mode=WAL      readers no longer block on the writer (and vice versa)
+  - synchronous=NORMAL    fsync at checkpoints instead of every commit (safe with WAL)
+  - cache_size            per-connection page cache, SQLITE_CACHE_MB (default 64)
+  - mmap_size             memory-mapped reads, SQLITE_MMAP_MB (default 256)
+  - busy_timeout          wait for locks instead of failing, SQLITE_BUSY_TIMEOUT_MS (default 5000)
+  - temp_store=MEMORY
+DB_PROFILE=default keeps SQLite's stock settings.
+
+The pool is sized to the request threadpool (DB_POOL_SIZE, default 40 = Starlette's
+default worker-thread count) so a busy threadpool never queues on the pool.
+
+Request handlers use the async engine (`create_async_storage_engine`, aiosqlite
+locally, asyncpg for postgresql+asyncpg:// URLs); scripts and background threads
+use the sync engine for the same database, derived with `sync_url`.
+"""
+
+import os
+from typing import Dict, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import QueuePool
+
+DB_PROFILE = os.getenv("DB_PROFILE", "performance")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "40"))
+DB_POOL_OVERFLOW = int(os.getenv("DB_POOL_OVERFLOW", "10"))
+SQLITE_CACHE_MB = int(os.getenv("SQLITE_CACHE_MB", "64"))
+SQLITE_MMAP_MB = int(os.getenv("SQLITE_MMAP_MB", "256"))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+
+def sqlite_pragmas(profile: str) -> Dict[str, object]:
+    if profile != "performance":
+        return {}
+    return {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -SQLITE_CACHE_MB * 1024,  # negative = KiB
+        "mmap_size": SQLITE_MMAP_MB * 1024 * 1024,
+        "busy_timeout": SQLITE_BUSY_TIMEOUT_MS,
+        "temp_store": "MEMORY",
+    }
+
+
+ASYNC_DRIVERS = {"sqlite+aiosqlite": "sqlite", "postgresql+asyncpg": "postgresql+psycopg2"}
+
+
+def sync_url(db_uri: str) -> str:
+    """The sync-driver URL for an async database URL (unchanged if already sync)."""
+    scheme, sep, rest = db_uri.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def async_url(db_uri: str) -> str:
+    """The async-driver URL for a database URL (unchanged if already async)."""
+    scheme, sep, rest = db_uri.partition("://")
+    for async_scheme, sync_scheme in ASYNC_DRIVERS.items():
+        if scheme in (sync_scheme, sync_scheme.split("+")[0]):
+            return f"{async_scheme}{sep}{rest}"
+    return db_uri
+
+
+def _install_pragmas(sync_engine, profile: str):
+    pragmas = sqlite_pragmas(profile)
+    if not pragmas:
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def _apply_pragmas(dbapi_conn, connection_record):
+        cur = dbapi_conn.cursor()
+        try:
+            for name, value in pragmas.items():
+                cur.execute(f"PRAGMA {name}={value}")
+        finally:
+            cur.close()
+
+
+def create_storage_engine(db_uri: str, profile: Optional[str] = None, pool_size: Optional[int] = None, **kwargs):
+    """create_engine for `db_uri` with the storage profile applied to each new connection."""
+    profile = profile or DB_PROFILE
+    db_uri = sync_url(db_uri)
+    if not db_uri.startswith("sqlite"):
+        return create_engine(db_uri, pool_size=pool_size or DB_POOL_SIZE, max_overflow=DB_POOL_OVERFLOW, **kwargs)
+
+    engine = create_engine(
+        db_uri,
+        connect_args={"check_same_thread": False},
+        poolclass=QueuePool,
+        pool_size=pool_size or DB_POOL_SIZE,
+        max_overflow=DB_POOL_OVERFLOW,
+        **kwargs,
+    )
+    _install_pragmas(engine, profile)
+    return engine
+
+
+def create_async_storage_engine(db_uri: str, profile: Optional[str] = None, pool_size: Optional[int] = None, **kwargs):
+    """create_async_engine for `db_uri` with the same storage profile as the sync engine."""
+    profile = profile or DB_PROFILE
+    db_uri = async_url(db_uri)
+    engine = create_async_engine(
+        db_uri, pool_size=pool_size or DB_POOL_SIZE, max_overflow=DB_POOL_OVERFLOW, **kwargs
+    )
+    if db_uri.startswith("sqlite"):
+        _install_pragmas(engine.sync_engine, profile)
+    return engine
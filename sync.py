@@ -0,0 +1,163 @@
+"""
+Delta sync for GET /issues/for_user/{user_id}/changes.
+
+Every write to `issues` bumps `Issue.updated_at` (a column `onupdate`, so it
+also covers the bulk/core UPDATEs in bulk_actions.py, pending classification
+and reclassify_db.py). Clients keep the issues they already have and send back
+the opaque watermark from their previous call; the response lists:
+  - issues: visible issues inserted or modified since then (closures included)
+  - closed: ids among those that are now closed
+  - removed: ids the user could see that were deleted or moved out of their
+    view since then (apply these before merging `issues`: SQLite may reuse the
+    id of a deleted issue)
+Pages of SYNC_MAX_ROWS follow (updated_at, id) keyset order; keep calling while
+has_more is true. The final watermark is rewound by SYNC_OVERLAP_S so rows from
+transactions that commit late are sent again rather than missed; merging by id
+makes the repeats harmless.
+
+Deleted issues, and issues whose student/assignee/section/department changes,
+leave a row in `issue_tombstones` with the values they had before (see
+`install_tombstones` and `record_tombstones`). `removed` only lists tombstones
+the user could see under those old values, so nobody learns the ids of issues
+outside their view. Tombstones are kept for SYNC_TOMBSTONE_DAYS. A watermark
+older than that, or one with more than SYNC_MAX_ROWS removals behind it, comes
+back with reset=true and a full listing; the client should drop its cache first.
+"""
+
+import base64
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Mapping, Optional
+
+from sqlalchemy import delete, event, insert, inspect, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from events import VISIBILITY_FIELDS
+from models import Issue, IssueTombstone
+from queries import CLOSED, decode_cursor, visibility_filter
+
+SYNC_MAX_ROWS = int(os.getenv("SYNC_MAX_ROWS", "1000"))
+SYNC_OVERLAP_S = float(os.getenv("SYNC_OVERLAP_S", "5"))
+SYNC_TOMBSTONE_DAYS = int(os.getenv("SYNC_TOMBSTONE_DAYS", "30"))
+
+
+def encode_watermark(updated_at: datetime, issue_id: int = 0) -> str:
+    """Opaque watermark: everything after (updated_at, issue_id). Same encoding as list cursors."""
+    raw = f"{updated_at.isoformat()}|{issue_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _after(watermark: Optional[str]):
+    if not watermark:
+        return None
+    updated_at, issue_id = decode_cursor(watermark)
+    return tuple_(Issue.updated_at, Issue.id) > tuple_(updated_at, issue_id)
+
+
+def changes_query(user, watermark: Optional[str] = None) -> Select:
+    """Visible issues changed after `watermark` (all visible issues when None), oldest change first."""
+    stmt = select(Issue).where(visibility_filter(user))
+    after = _after(watermark)
+    if after is not None:
+        stmt = stmt.where(after)
+    return stmt.order_by(Issue.updated_at, Issue.id).limit(SYNC_MAX_ROWS)
+
+
+def removed_query(user, since: datetime) -> Select:
+    """
+    Ids of issues deleted or moved since `since` that `user` could see before and can't
+    see now, at most SYNC_MAX_ROWS + 1 (one more tells the caller the list is cut short).
+    """
+    still_visible = select(Issue.id).where(Issue.id == IssueTombstone.issue_id, visibility_filter(user)).exists()
+    return (
+        select(IssueTombstone.issue_id)
+        .where(IssueTombstone.deleted_at >= since, visibility_filter(user, IssueTombstone), ~still_visible)
+        .distinct()
+        .limit(SYNC_MAX_ROWS + 1)
+    )
+
+
+async def collect_changes(db: AsyncSession, user, watermark: Optional[str] = None) -> Dict:
+    """Build the /changes payload. Raises ValueError for a malformed watermark."""
+    now = datetime.utcnow()
+    reset = False
+    if watermark and decode_cursor(watermark)[0] < now - timedelta(days=SYNC_TOMBSTONE_DAYS):
+        watermark, reset = None, True
+
+    removed = []
+    if watermark:
+        removed = list((await db.scalars(removed_query(user, decode_cursor(watermark)[0]))).all())
+        if len(removed) > SYNC_MAX_ROWS:
+            watermark, reset, removed = None, True, []
+
+    issues = (await db.scalars(changes_query(user, watermark))).all()
+    has_more = len(issues) == SYNC_MAX_ROWS
+
+    floor = now - timedelta(seconds=SYNC_OVERLAP_S)
+    if issues and (has_more or issues[-1].updated_at <= floor):
+        next_watermark = encode_watermark(issues[-1].updated_at, issues[-1].id)
+    elif issues or not watermark:
+        next_watermark = encode_watermark(floor)  # newest changes are still inside the overlap window
+    else:
+        next_watermark = watermark
+
+    return {
+        "watermark": next_watermark,
+        "has_more": has_more,
+        "reset": reset,
+        "issues": issues,
+        "closed": [i.id for i in issues if i.status == CLOSED],
+        "removed": removed,
+    }
+
+
+def record_tombstones(connection, issues: List[Mapping]):
+    """
+    Insert a tombstone per issue mapping (its id and its visibility columns as they were
+    before the delete or move). For writers that bypass the ORM flush, e.g. bulk_actions.py.
+    """
+    if issues:
+        now = datetime.utcnow()
+        connection.execute(
+            insert(IssueTombstone.__table__),
+            [{"issue_id": i["id"], "deleted_at": now, **{name: i[name] for name in VISIBILITY_FIELDS}}
+             for i in issues],
+        )
+
+
+def _moved_from(state) -> Optional[Dict]:
+    """Visibility columns before this flush, or None if none of them changed."""
+    previous, moved = {"id": state.obj().id}, False
+    for name in VISIBILITY_FIELDS:
+        history = state.attrs[name].history
+        previous[name] = history.deleted[0] if history.deleted else state.attrs[name].value
+        moved = moved or previous[name] != state.attrs[name].value
+    return previous if moved else None
+
+
+def install_tombstones(session_class):
+    """Record tombstones for issues deleted or moved through the ORM on sessions of `session_class`."""
+
+    def _after_flush(session, flush_context):
+        gone = [
+            {"id": obj.id, **{name: getattr(obj, name) for name in VISIBILITY_FIELDS}}
+            for obj in session.deleted if isinstance(obj, Issue) and obj.id is not None
+        ]
+        for obj in session.dirty:
+            if isinstance(obj, Issue):
+                previous = _moved_from(inspect(obj))
+                if previous:
+                    gone.append(previous)
+        record_tombstones(session.connection(), gone)
+
+    event.listen(session_class, "after_flush", _after_flush)
+
+
+def prune_tombstones(db: Session) -> int:
+    """Drop tombstones older than SYNC_TOMBSTONE_DAYS. Returns how many were removed."""
+    cutoff = datetime.utcnow() - timedelta(days=SYNC_TOMBSTONE_DAYS)
+    result = db.execute(delete(IssueTombstone).where(IssueTombstone.deleted_at < cutoff))
+    db.commit()
+    return result.rowcount or 0